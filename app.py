@@ -1,16 +1,52 @@
 # app.py
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from src.runner import run_debate
+import argparse
+# src/ modules import each other by bare name; importing them as src.* too would load them twice
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from runner import run_debate, run_debate_ndjson
+from warmup import start_warmup, start_local_workers
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
-from rich.progress import Progress
 from rich.rule import Rule
 
+def debate_directory(topic):
+    """records/<sanitized topic>/, created if needed"""
+    # Sanitize topic for folder name
+    sanitized_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '_')).rstrip()
+    debate_dir = os.path.join("records", sanitized_topic)
+    if not os.path.exists(debate_dir):
+        os.makedirs(debate_dir)
+    return debate_dir
+
 def main():
+    parser = argparse.ArgumentParser(description="Multi-agent debate simulation")
+    parser.add_argument("--panel", help="comma-separated personas for a panel debate, e.g. 'Scientist,Engineer,Economist'")
+    parser.add_argument("--judges", help="comma-separated judge profiles for a parallel judge panel, e.g. 'keyword,evidence,rebuttal'")
+    parser.add_argument("--early-stop", action="store_true", default=None,
+                        help="end the debate early once recent turns stop adding new arguments")
+    parser.add_argument("--deadline", type=float, help="finish the whole debate within this many seconds")
+    parser.add_argument("--topic", help="debate topic (skips the prompt)")
+    parser.add_argument("--persona-a", help="persona for Agent A (skips the prompt)")
+    parser.add_argument("--persona-b", help="persona for Agent B (skips the prompt)")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="no prompts or rendering: write each debate event to stdout as one JSON line")
+    args = parser.parse_args()
+    judges = [j.strip() for j in args.judges.split(",") if j.strip()] if args.judges else None
+    participants = [p.strip() for p in args.panel.split(",") if p.strip()] if args.panel else None
+    # Fork the local inference workers while this is still the only thread
+    start_local_workers()
+
+    if args.ndjson:
+        start_warmup()
+        topic = args.topic or "Should AI be regulated like medicine?"
+        final_state = run_debate_ndjson(topic, args.persona_a or "Scientist", args.persona_b or "Philosopher",
+                                        debate_directory(topic), participants=participants, judges=judges,
+                                        convergence=args.early_stop, deadline_s=args.deadline)
+        sys.exit(1 if final_state.get("error") else 0)
+
     console = Console()
     # Create a big, centered title with decorative elements
     console.print(Rule("🎭", style="blue"), justify="center")
@@ -19,18 +55,25 @@ def main():
     console.print(Rule("🎭", style="blue"), justify="center")
     console.print()  
 
+    # Compile the graph and set up the backend while the user types
+    start_warmup()
+
     # Get debate parameters
-    topic = console.input("Enter topic for debate (default: 'Should AI be regulated like medicine?'): ")
+    topic = args.topic or console.input("Enter topic for debate (default: 'Should AI be regulated like medicine?'): ")
     if not topic:
         topic = "Should AI be regulated like medicine?"
 
-    persona_a = console.input("Enter persona for Agent A (default: 'Scientist'): ")
-    if not persona_a:
-        persona_a = "Scientist"
+    if participants and len(participants) > 2:
+        persona_a, persona_b = participants[0], participants[1]
+    else:
+        participants = None
+        persona_a = args.persona_a or console.input("Enter persona for Agent A (default: 'Scientist'): ")
+        if not persona_a:
+            persona_a = "Scientist"
 
-    persona_b = console.input("Enter persona for Agent B (default: 'Philosopher'): ")
-    if not persona_b:
-        persona_b = "Philosopher"
+        persona_b = args.persona_b or console.input("Enter persona for Agent B (default: 'Philosopher'): ")
+        if not persona_b:
+            persona_b = "Philosopher"
 
     # Clear screen and show agents matchup title
     console.clear()
@@ -41,23 +84,13 @@ def main():
     # console.print(Rule("🎭", style="blue"), justify="center")
     
     # Show agents matchup
-    matchup_title = Text(f"{persona_a} Vs {persona_b}", style="bold cyan", justify="center")
+    matchup_title = Text(" Vs ".join(participants or [persona_a, persona_b]), style="bold cyan", justify="center")
     console.print(matchup_title, justify="center")
     console.print(Rule("", style="cyan"), justify="center")
     console.print()
 
-    # Create records folder
-    records_dir = "records"
-    if not os.path.exists(records_dir):
-        os.makedirs(records_dir)
-
-    # Sanitize topic for folder name
-    sanitized_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '_')).rstrip()
-    debate_dir = os.path.join(records_dir, sanitized_topic)
-    if not os.path.exists(debate_dir):
-        os.makedirs(debate_dir)
-
-    summary = run_debate(topic, persona_a, persona_b, debate_dir)
+    summary = run_debate(topic, persona_a, persona_b, debate_directory(topic), participants=participants, judges=judges,
+                         convergence=args.early_stop, deadline_s=args.deadline)
 
     if summary and "winner" in summary:
         table = Table(show_header=True, header_style="bold magenta", border_style="magenta")
@@ -76,6 +109,8 @@ def main():
             winner_display = f"[bold green]{summary['persona_a']} (AgentA)[/bold green]"
         elif winner_agent == "AgentB":
             winner_display = f"[bold yellow]{summary['persona_b']} (AgentB)[/bold yellow]"
+        elif winner_agent:
+            winner_display = f"[bold cyan]{winner}[/bold cyan]"
         else:
             winner_display = "[bold blue]Tie[/bold blue]"
 
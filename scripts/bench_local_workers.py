@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for local flan-t5 inference across 1..N worker processes.
+
+For each worker count, starts the pool, warms every worker, then fires
+--requests concurrent generation requests and reports requests/second.
+Requires transformers and torch.
+
+Usage:
+    python scripts/bench_local_workers.py [--max-workers 4] [--requests 32]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from local_workers import start_pool, shutdown_pool, threads_per_worker, _worker_generate
+
+PROMPT = ("You are Scientist engaged in a structured debate. TOPIC: Should AI be regulated like medicine? "
+          "Write a compelling argument (3-6 sentences).")
+
+
+def run(workers, requests, max_new_tokens):
+    pool = start_pool(workers)
+    kwargs = {"max_new_tokens": max_new_tokens}
+    # Warm every worker so model loading is not part of the measurement
+    list(pool.map(_worker_generate, [PROMPT] * workers, [kwargs] * workers))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=requests) as callers:
+        futures = [callers.submit(lambda: pool.submit(_worker_generate, PROMPT, kwargs).result())
+                   for _ in range(requests)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    shutdown_pool()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local inference throughput across worker counts")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'threads/worker':>14} {'seconds':>8} {'req/s':>8} {'speedup':>8}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        elapsed = run(workers, args.requests, args.max_new_tokens)
+        throughput = args.requests / elapsed
+        baseline = baseline or throughput
+        print(f"{workers:>7} {threads_per_worker(workers):>14} {elapsed:>8.2f} {throughput:>8.2f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
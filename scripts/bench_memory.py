@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: RSS over many sequential debates in one process.
+
+Runs --debates debates through run_langgraph_debate, each on its own thread id
+as the server does, and samples resident memory as it goes. The LLM backend is
+replaced by a canned generator so that only the graph, state and checkpointer
+are measured (and 1,000 debates finish in minutes). Event logs are discarded.
+
+With the bounded checkpointer, RSS should be flat after the first few hundred
+debates. --unbounded uses LangGraph's plain MemorySaver for comparison. Exits
+non-zero if RSS grew by more than --max-growth-mb between the first sample
+and the last.
+
+Usage:
+    python scripts/bench_memory.py [--debates 1000] [--sample-every 100] [--unbounded]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+WORDS = ("evidence safety autonomy ethics risk data values rights testing policy progress "
+         "dignity verification innovation consequence precedent").split()
+
+
+def rss_mb():
+    """Current resident set size (falls back to the peak where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def canned_generate(prompt, kind="default", **kwargs):
+    """Deterministic, varied 30-word argument so turns pass validation without retries"""
+    seed = abs(hash(prompt))
+    words = [WORDS[(seed >> (i % 40)) % len(WORDS)] + str(i) for i in range(30)]
+    return "I argue that " + " ".join(words) + "."
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS over sequential debates")
+    parser.add_argument("--debates", type=int, default=1000)
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--max-growth-mb", type=float, default=20.0)
+    parser.add_argument("--unbounded", action="store_true", help="use the plain MemorySaver instead")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="debator-bench-"))
+    from pathlib import Path
+    import logger_util
+    logger_util.GLOBAL_LOG_FILE = Path(os.devnull)
+    import nodes
+    import langgraph_debate
+    nodes.gemini_generate = canned_generate
+    if args.unbounded:
+        from langgraph.checkpoint.memory import MemorySaver
+
+        class UnboundedSaver(MemorySaver):
+            def mark_finished(self, thread_id):
+                pass
+        langgraph_debate.BoundedMemorySaver = UnboundedSaver
+
+    app = langgraph_debate.create_debate_graph()
+    samples = []
+    print(f"{'debates':>8} {'rss_mb':>8} {'checkpoints':>12}")
+    for i in range(1, args.debates + 1):
+        state = langgraph_debate.run_langgraph_debate(
+            f"Topic number {i}: should AI be regulated?", "Scientist", "Philosopher", thread_id=f"bench-{i}")
+        if state.get("error"):
+            print(f"debate {i} failed: {state['error']}")
+            return 1
+        if i % args.sample_every == 0:
+            held = sum(len(c) for ns in app.checkpointer.storage.values() for c in ns.values())
+            samples.append(rss_mb())
+            print(f"{i:>8} {samples[-1]:>8.1f} {held:>12}")
+
+    growth = samples[-1] - samples[0]
+    print(f"RSS growth from debate {args.sample_every} to {args.debates}: {growth:+.1f} MB")
+    if growth > args.max_growth_mb:
+        print(f"FAIL: RSS grew more than {args.max_growth_mb} MB")
+        return 1
+    print("OK: RSS is flat")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
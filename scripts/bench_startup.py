@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the debate CLI.
+
+Measures two things against the budget in scripts/startup_budget.json:
+  * the cumulative `python -X importtime` cost of `import app`
+  * wall-clock time from process launch until the topic prompt is printed
+
+Also fails if any heavy backend module is imported before the first prompt.
+Exits non-zero when a budget is exceeded.
+
+Usage:
+    python scripts/bench_startup.py [--runs 5] [--budget scripts/startup_budget.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+PROMPT_MARKER = b"Enter topic for debate"
+
+# Modules that must only load once a debate actually starts
+HEAVY_MODULES = [
+    "langgraph",
+    "transformers",
+    "torch",
+    "google.generativeai",
+    "mermaid_cli",
+    "playwright",
+    "IPython",
+]
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_import(python=sys.executable):
+    """Return (cumulative import ms for `app`, {module: timings}) from one fresh interpreter"""
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"`import app` failed:\n{proc.stderr[-2000:]}")
+    modules = parse_importtime(proc.stderr)
+    app_ms = modules.get("app", (0, 0))[1] / 1000.0
+    return app_ms, modules
+
+
+def heavy_imports(modules):
+    """Names of heavy modules present in an importtime listing"""
+    loaded = []
+    for heavy in HEAVY_MODULES:
+        if any(name == heavy or name.startswith(heavy + ".") for name in modules):
+            loaded.append(heavy)
+    return loaded
+
+
+def measure_first_prompt(python=sys.executable, timeout=60):
+    """Launch app.py and return milliseconds until the topic prompt appears on stdout"""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [python, "app.py"], cwd=ROOT, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    buffer = b""
+    try:
+        while PROMPT_MARKER not in buffer:
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError("timed out waiting for the topic prompt")
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError("app.py exited before printing the topic prompt")
+            buffer += chunk
+        return (time.perf_counter() - start) * 1000.0
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI time-to-first-prompt against a budget")
+    parser.add_argument("--runs", type=int, default=5, help="number of launches to measure")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET, help="path to the budget JSON file")
+    args = parser.parse_args()
+
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+
+    import_ms = []
+    prompt_ms = []
+    loaded_heavy = set()
+    for _ in range(args.runs):
+        app_ms, modules = measure_import()
+        import_ms.append(app_ms)
+        loaded_heavy.update(heavy_imports(modules))
+        prompt_ms.append(measure_first_prompt())
+
+    import_median = statistics.median(import_ms)
+    prompt_median = statistics.median(prompt_ms)
+    slowest = sorted(
+        measure_import()[1].items(), key=lambda kv: kv[1][1], reverse=True
+    )[:10]
+
+    print(f"import app (cumulative):  median {import_median:8.1f} ms  budget {budget['import_app_ms']} ms")
+    print(f"time to first prompt:     median {prompt_median:8.1f} ms  budget {budget['time_to_first_prompt_ms']} ms")
+    print("slowest imports (cumulative ms):")
+    for name, (_, cumulative_us) in slowest:
+        print(f"  {cumulative_us / 1000.0:8.1f}  {name}")
+
+    failures = []
+    if import_median > budget["import_app_ms"]:
+        failures.append(f"import app took {import_median:.1f} ms (budget {budget['import_app_ms']} ms)")
+    if prompt_median > budget["time_to_first_prompt_ms"]:
+        failures.append(f"first prompt took {prompt_median:.1f} ms (budget {budget['time_to_first_prompt_ms']} ms)")
+    if loaded_heavy:
+        failures.append(f"heavy modules imported before the prompt: {', '.join(sorted(loaded_heavy))}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# server.py
+import sys
+import os
+import argparse
+import asyncio
+# src/ modules import each other by bare name; importing them as src.* too would load them twice.
+# First on the path, so "server" is src/server.py rather than this script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from server import DebateServer
+from rich.console import Console
+
+def main():
+    parser = argparse.ArgumentParser(description="Run debates over HTTP with Server-Sent Events streaming")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-concurrent", type=int, default=4, help="debates running at the same time")
+    parser.add_argument("--max-queue", type=int, default=32, help="queued debates before new jobs get 503")
+    args = parser.parse_args()
+
+    console = Console()
+    console.print(f"[bold blue]Debate server[/bold blue] listening on http://{args.host}:{args.port} "
+                  f"([dim]{args.max_concurrent} concurrent, queue {args.max_queue}[/dim])")
+    server = DebateServer(max_concurrent=args.max_concurrent, max_queue=args.max_queue)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        console.print("[dim]Server stopped.[/dim]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# argument_cache.py
+"""
+Opt-in semantic cache of accepted opening arguments.
+
+Accepted arguments from the first rounds are stored with an embedding of their
+topic, keyed by persona and round. When a new debate's topic is close to a past
+one, Agent.speak either reuses the past argument outright (similarity at or
+above the reuse threshold) or passes it to the model as a seed to adapt.
+
+Enable with DEBATOR_ARGUMENT_CACHE=1 (or run_langgraph_debate(argument_cache=True)).
+Topics are embedded with Gemini when it is configured, otherwise with a local
+hashed bag-of-words vector; rows are only compared with the same embedder.
+
+A lookup compares the topic with every row for its persona, round and
+embedder, so the store is bounded: a topic keeps only its latest argument per
+persona and round, and each persona/round/embedder keeps the newest
+DEBATOR_ARGUMENT_CACHE_MAX_ROWS (500) topics.
+"""
+import os
+import math
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+
+try:
+    from .logger_util import log_event
+except ImportError:
+    from logger_util import log_event
+
+DEFAULT_CACHE_PATH = os.getenv("DEBATOR_ARGUMENT_CACHE_DB", os.path.join("records", "argument_cache.db"))
+REUSE_THRESHOLD = float(os.getenv("DEBATOR_CACHE_REUSE_THRESHOLD", "0.95"))
+SEED_THRESHOLD = float(os.getenv("DEBATOR_CACHE_SEED_THRESHOLD", "0.80"))
+MAX_CACHED_ROUND = 2
+MAX_ROWS = int(os.getenv("DEBATOR_ARGUMENT_CACHE_MAX_ROWS", "500"))
+HASH_DIMS = 512
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cached_arguments (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic      TEXT NOT NULL,
+    embedder   TEXT NOT NULL,
+    vector     BLOB NOT NULL,
+    persona    TEXT NOT NULL,
+    round      INTEGER NOT NULL,
+    text       TEXT NOT NULL,
+    created_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_cached_lookup ON cached_arguments(persona, round, embedder);
+"""
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def cache_enabled():
+    return os.getenv("DEBATOR_ARGUMENT_CACHE", "").lower() in ("1", "true", "yes")
+
+
+def hashed_embedding(text):
+    """Feature-hashed unigram+bigram vector, L2-normalised"""
+    words = WORD_RE.findall(text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    vector = [0.0] * HASH_DIMS
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % HASH_DIMS] += 1.0 if (h >> 16) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a)) or 1.0
+    nb = math.sqrt(sum(y * y for y in b)) or 1.0
+    return dot / (na * nb)
+
+
+class CacheHit:
+    """Result of a cache lookup: kind is 'reuse', 'seed' or 'miss'"""
+
+    __slots__ = ("kind", "text", "similarity", "topic")
+
+    def __init__(self, kind, text=None, similarity=0.0, topic=None):
+        self.kind = kind
+        self.text = text
+        self.similarity = similarity
+        self.topic = topic
+
+
+class ArgumentCache:
+    """SQLite-backed store of past opening arguments indexed by topic embedding"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, reuse_threshold=REUSE_THRESHOLD,
+                 seed_threshold=SEED_THRESHOLD, max_round=MAX_CACHED_ROUND, max_rows=MAX_ROWS):
+        self.path = path
+        self.reuse_threshold = reuse_threshold
+        self.seed_threshold = seed_threshold
+        self.max_round = max_round
+        self.max_rows = max_rows
+        self._embeddings = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def embed(self, topic):
+        """(embedder name, vector) for a topic, memoised per process"""
+        with self._lock:
+            if topic in self._embeddings:
+                return self._embeddings[topic]
+        from nodes import gemini_embed
+        vector = gemini_embed(topic)
+        result = ("gemini", vector) if vector else ("hashed", hashed_embedding(topic))
+        with self._lock:
+            self._embeddings[topic] = result
+        return result
+
+    def lookup(self, topic, persona, round_num):
+        """Find the most similar past argument for this persona and round"""
+        if round_num > self.max_round:
+            return CacheHit("miss")
+        embedder, vector = self.embed(topic)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT topic, vector, text FROM cached_arguments WHERE persona = ? AND round = ? AND embedder = ?",
+                (persona, round_num, embedder),
+            ).fetchall()
+        finally:
+            conn.close()
+        best = CacheHit("miss")
+        for past_topic, blob, text in rows:
+            similarity = cosine(vector, array("f", blob))
+            if similarity > best.similarity:
+                best = CacheHit("miss", text, similarity, past_topic)
+        if best.similarity >= self.reuse_threshold:
+            best.kind = "reuse"
+        elif best.similarity >= self.seed_threshold:
+            best.kind = "seed"
+        else:
+            best.text = None
+        log_event("argument_cache_lookup", {"persona": persona, "round": round_num, "kind": best.kind,
+                                            "similarity": round(best.similarity, 4), "matched_topic": best.topic})
+        return best
+
+    def store(self, topic, persona, round_num, text):
+        """Remember an accepted argument from one of the cached rounds
+
+        It replaces any earlier argument for the same topic, persona and round,
+        and the oldest topics beyond max_rows are dropped.
+        """
+        if round_num > self.max_round:
+            return
+        embedder, vector = self.embed(topic)
+        key = (persona, round_num, embedder)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM cached_arguments WHERE persona = ? AND round = ? AND embedder = ? "
+                             "AND topic = ?", key + (topic,))
+                conn.execute(
+                    "INSERT INTO cached_arguments (topic, embedder, vector, persona, round, text, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (topic, embedder, array("f", vector).tobytes(), persona, round_num, text, time.time()),
+                )
+                evicted = conn.execute(
+                    "DELETE FROM cached_arguments WHERE persona = ? AND round = ? AND embedder = ? AND id NOT IN "
+                    "(SELECT id FROM cached_arguments WHERE persona = ? AND round = ? AND embedder = ? "
+                    "ORDER BY id DESC LIMIT ?)", key + key + (self.max_rows,)).rowcount
+        finally:
+            conn.close()
+        if evicted:
+            log_event("argument_cache_evicted", {"persona": persona, "round": round_num, "rows": evicted})
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_argument_cache():
+    """Process-wide cache instance"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ArgumentCache()
+        return _cache
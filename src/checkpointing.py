@@ -0,0 +1,101 @@
+# checkpointing.py
+"""
+In-memory checkpointer with bounded retention.
+
+LangGraph's MemorySaver keeps every super-step of every thread for the life of
+the process, and the compiled graphs (and their checkpointers) are cached
+forever. A long-running process therefore grows with rounds² × debates.
+BoundedMemorySaver keeps only the last DEBATOR_CHECKPOINT_KEEP checkpoints per
+thread (and the channel blobs they reference). Once a debate is marked finished
+its thread stays available for inspection until DEBATOR_CHECKPOINT_FINISHED_THREADS
+newer debates have finished.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+KEEP_LAST = int(os.getenv("DEBATOR_CHECKPOINT_KEEP", "4"))
+MAX_FINISHED_THREADS = int(os.getenv("DEBATOR_CHECKPOINT_FINISHED_THREADS", "8"))
+# Transcript turns are stored as state.Turn
+CHECKPOINT_TYPES = [("state", "Turn")]
+
+
+class BoundedMemorySaver(MemorySaver):
+    """MemorySaver that prunes old checkpoints and evicts finished threads"""
+
+    def __init__(self, keep_last=KEEP_LAST, max_finished_threads=MAX_FINISHED_THREADS, **kwargs):
+        kwargs.setdefault("serde", JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES))
+        super().__init__(**kwargs)
+        self.keep_last = max(2, keep_last)
+        self.max_finished_threads = max(0, max_finished_threads)
+        # (thread_id, ns) -> OrderedDict(checkpoint_id -> channel_versions), oldest first
+        self._history = {}
+        # (thread_id, ns) -> blob keys written for that namespace
+        self._blob_keys = {}
+        self._finished = OrderedDict()
+        self._retention_lock = threading.Lock()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"]["checkpoint_ns"]
+        key = (thread_id, ns)
+        with self._retention_lock:
+            # A finished thread id that is reused is live again
+            self._finished.pop(thread_id, None)
+            history = self._history.setdefault(key, OrderedDict())
+            history[checkpoint["id"]] = dict(checkpoint["channel_versions"])
+            blob_keys = self._blob_keys.setdefault(key, set())
+            blob_keys.update((thread_id, ns, channel, version) for channel, version in new_versions.items())
+            if len(history) > self.keep_last:
+                self._prune(key, history, blob_keys)
+        return result
+
+    def get_tuple(self, config):
+        # storage is a defaultdict: reading an unknown thread (forking probes both graphs) would
+        # add an empty entry that no debate ever finishes, so it would never be evicted
+        if config["configurable"]["thread_id"] not in self.storage:
+            return None
+        return super().get_tuple(config)
+
+    def _prune(self, key, history, blob_keys):
+        thread_id, ns = key
+        while len(history) > self.keep_last:
+            old_id, _ = history.popitem(last=False)
+            self.storage[thread_id][ns].pop(old_id, None)
+            self.writes.pop((thread_id, ns, old_id), None)
+        live = {(thread_id, ns, channel, version)
+                for versions in history.values() for channel, version in versions.items()}
+        for blob_key in blob_keys - live:
+            self.blobs.pop(blob_key, None)
+        blob_keys &= live
+
+    def mark_finished(self, thread_id):
+        """Record that a debate is over; the oldest finished threads beyond the limit are deleted"""
+        with self._retention_lock:
+            self._finished[thread_id] = True
+            self._finished.move_to_end(thread_id)
+            evicted = []
+            while len(self._finished) > self.max_finished_threads:
+                evicted.append(self._finished.popitem(last=False)[0])
+        for old in evicted:
+            self.delete_thread(old)
+
+    def delete_thread(self, thread_id):
+        with self._retention_lock:
+            for key in [k for k in self._history if k[0] == thread_id]:
+                del self._history[key]
+                self._blob_keys.pop(key, None)
+        super().delete_thread(thread_id)
+
+    def retained(self):
+        """Counts of what is currently held, for benchmarks and metrics"""
+        return {
+            "threads": len(self.storage),
+            "checkpoints": sum(len(c) for namespaces in self.storage.values() for c in namespaces.values()),
+            "blobs": len(self.blobs),
+            "writes": len(self.writes),
+        }
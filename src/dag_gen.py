@@ -1,7 +1,11 @@
 # dag_gen.py
-from src.state import DebateState
+try:
+    from .state import DebateState
+    from .rebuttal_graph import extract_rebuttals
+except ImportError:
+    from state import DebateState
+    from rebuttal_graph import extract_rebuttals
 import asyncio
-from mermaid_cli import render_mermaid
 
 def generate_debate_artifacts(final_state: DebateState, output_path="debate_dag"):
     # Handle case where final_state might be incomplete or empty
@@ -16,17 +20,22 @@ def generate_debate_artifacts(final_state: DebateState, output_path="debate_dag"
     rationale = final_state.get("rationale", "No rationale provided.")
     topic = final_state.get("topic", "Unknown Topic")
 
+    # Panel debates have speakers beyond AgentA/AgentB
+    agent_personas = {"AgentA": persona_a, "AgentB": persona_b}
+    for turn in memory_transcript:
+        agent_personas.setdefault(turn['agent'], turn['persona'])
+
     mermaid_code = "graph LR\n"
     mermaid_code += f'    Topic["Topic: {topic}"]\n'
-    mermaid_code += f'    AgentA["{persona_a} (AgentA)"]\n'
-    mermaid_code += f'    AgentB["{persona_b} (AgentB)"]\n'
+    for agent_id, persona in agent_personas.items():
+        mermaid_code += f'    {agent_id}["{persona} ({agent_id})"]\n'
     mermaid_code += f'    Judge["Judge"]\n'
 
     # Extract agent identifier from winner string (e.g., "Scientist (AgentA)" -> "AgentA")
     winner_agent = None
     if winner and '(' in winner and ')' in winner:
         winner_agent = winner.split('(')[1].split(')')[0]
-    elif winner in ['AgentA', 'AgentB']:
+    elif winner in agent_personas:
         winner_agent = winner
     else:
         winner_agent = 'Tie'
@@ -35,8 +44,10 @@ def generate_debate_artifacts(final_state: DebateState, output_path="debate_dag"
         mermaid_code += '    style AgentA fill:#8fbc8f,stroke:#333,stroke-width:4px\n'
     elif winner_agent == 'AgentB':
         mermaid_code += '    style AgentB fill:#f0e68c,stroke:#333,stroke-width:4px\n'
+    elif winner_agent in agent_personas:
+        mermaid_code += f'    style {winner_agent} fill:#add8e6,stroke:#333,stroke-width:4px\n'
 
-    for i, turn in enumerate(memory_transcript):
+    for turn in memory_transcript:
         round_num = turn['round']
         agent_id = turn['agent']
         text = turn['text']
@@ -50,15 +61,21 @@ def generate_debate_artifacts(final_state: DebateState, output_path="debate_dag"
         arg_node_id = f'Arg_{round_num}_{agent_id}'
         mermaid_code += f'    {arg_node_id}["R{round_num} ({persona}): {sanitized_text}"]\n'
         mermaid_code += f'    {agent_id} --> {arg_node_id}\n'
-        if i > 0:
-            prev_turn = memory_transcript[i-1]
-            prev_arg_node_id = f'Arg_{prev_turn["round"]}_{prev_turn["agent"]}'
-            mermaid_code += f'    {prev_arg_node_id} --> {arg_node_id}\n'
+
+    # Link each argument to the earlier opposing arguments it responds to, not just the previous turn
+    responds_to = {}
+    for edge in extract_rebuttals(memory_transcript, topic):
+        responds_to.setdefault((edge["round"], edge["agent"]), []).append(edge)
+        mermaid_code += (f'    Arg_{edge["target_round"]}_{edge["target_agent"]} -->|{edge["similarity"]:.2f}| '
+                         f'Arg_{edge["round"]}_{edge["agent"]}\n')
 
     last_turn = memory_transcript[-1]
     mermaid_code += f'    Arg_{last_turn["round"]}_{last_turn["agent"]} --> Judge\n'
 
     try:
+        # mermaid_cli pulls in playwright, so only import it when rendering
+        from mermaid_cli import render_mermaid
+
         # Render the Mermaid diagram
         async def render():
             _, _, png_data = await render_mermaid(
@@ -83,9 +100,11 @@ def generate_debate_artifacts(final_state: DebateState, output_path="debate_dag"
             for turn in memory_transcript:
                 f.write(f"[Round {turn['round']}] -> {turn['persona']} ({turn['agent']})\n")
                 f.write(f"  '{turn['text']}'\n")
+                for edge in responds_to.get((turn["round"], turn["agent"]), []):
+                    f.write(f"  responds to round {edge['target_round']} ({edge['target_agent']}), "
+                            f"similarity {edge['similarity']:.2f}{', declared' if edge.get('declared') else ''}\n")
             f.write("\n--- Judgment ---\n")
             f.write(f"Winner: {winner}\n")
             f.write(f"Rationale: {rationale}\n")
     except Exception as e:
         print(f"[Warning] Debate flow saving failed: {e}")
-
@@ -0,0 +1,119 @@
+# deadline.py
+"""
+End-to-end deadline budget for a debate.
+
+run_langgraph_debate(deadline_s=...) (or DEBATOR_DEADLINE_S) stores an absolute
+deadline in the graph state. Part of it is held back for the judge. Each turn
+or memory node gets an equal slice of the rest per remaining round, and runs
+inside node_budget(). Backend calls ask request_timeout() for their
+per-request timeout.
+
+Once less than MIN_TURN_S remains before the judge's reserve, the graph
+degrades instead of overrunning. Turns use the fallback text without calling a
+model, memory summaries are skipped, and the routers go straight to the judge.
+
+If the deadline passes anyway, the caller stops waiting and cancels the
+debate. Its graph stops after the node that is running, and the nodes and
+backends check is_cancelled() so that node makes no further model requests.
+
+Times are measured with time.monotonic(), so a wall-clock step cannot stretch
+or cut short a budget.
+"""
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+JUDGE_RESERVE_FRACTION = float(os.getenv("DEBATOR_JUDGE_RESERVE_FRACTION", "0.15"))
+MIN_TURN_S = float(os.getenv("DEBATOR_MIN_TURN_S", "1.0"))
+# Time left for run_langgraph_debate to return after the judge finishes
+FINISH_GRACE_S = 0.5
+
+# Absolute time by which the current node's backend calls must have returned
+_request_deadline = contextvars.ContextVar("request_deadline", default=None)
+# threading.Event set once the caller has given up on the debate (see bind_cancellation)
+_cancelled = contextvars.ContextVar("debate_cancelled", default=None)
+
+
+def configured_deadline(seconds=None):
+    """Deadline budget from the argument or DEBATOR_DEADLINE_S; None means unbounded"""
+    if seconds is None:
+        raw = os.getenv("DEBATOR_DEADLINE_S", "")
+        seconds = float(raw) if raw else None
+    if not seconds or seconds <= 0:
+        return None
+    return {
+        "at": time.monotonic() + seconds,
+        "budget_s": seconds,
+        "judge_reserve_s": seconds * JUDGE_RESERVE_FRACTION
+    }
+
+
+def remaining(deadline):
+    """Seconds until the whole debate must be finished (None when unbounded)"""
+    if not deadline:
+        return None
+    return deadline["at"] - time.monotonic()
+
+
+def available_for_rounds(deadline):
+    """Seconds left for turns and summaries once the judge's reserve is held back"""
+    return remaining(deadline) - deadline["judge_reserve_s"]
+
+
+def is_tight(deadline):
+    """True when there is no longer time for another model-backed turn"""
+    return bool(deadline) and available_for_rounds(deadline) < MIN_TURN_S
+
+
+def round_slice(deadline, rounds_left):
+    """Budget for one node: an equal share of what is left per remaining round"""
+    if not deadline:
+        return None
+    return max(0.0, available_for_rounds(deadline) / max(1, rounds_left))
+
+
+def judge_slice(deadline):
+    """Budget for the judge: everything left except the finishing grace"""
+    if not deadline:
+        return None
+    return max(0.0, remaining(deadline) - FINISH_GRACE_S)
+
+
+@contextmanager
+def node_budget(seconds):
+    """Bound every backend call made inside the block to `seconds` in total"""
+    if seconds is None:
+        yield
+        return
+    token = _request_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def request_timeout():
+    """Seconds the next backend request may take, or None outside a node budget"""
+    at = _request_deadline.get()
+    if at is None:
+        return None
+    return max(0.0, at - time.monotonic())
+
+
+def bind_cancellation():
+    """Give the current context a fresh cancellation event and return it
+
+    Call inside the context that will run the debate's graph; threads started
+    from it (LangGraph's node threads) see the same event.
+    """
+    event = threading.Event()
+    _cancelled.set(event)
+    return event
+
+
+def is_cancelled():
+    """True once the debate running in this context has been abandoned by its caller"""
+    event = _cancelled.get()
+    return event is not None and event.is_set()
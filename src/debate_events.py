@@ -0,0 +1,90 @@
+# debate_events.py
+"""
+Typed events yielded by langgraph_debate.stream_debate / astream_debate.
+
+A debate yields, in order:
+    debate_started
+    round_started, turn_accepted, standings (once per round)
+    memory_updated (after each memory summary)
+    verdict
+    debate_finished (always last, also after an error; carries the final state)
+
+to_dict() gives the JSON form, with the event name under "type", as written by
+`python app.py --ndjson`.
+"""
+from dataclasses import dataclass, field, asdict
+from typing import Any, ClassVar, Dict, List, Optional
+
+
+@dataclass
+class DebateEvent:
+    type: ClassVar[str] = "event"
+
+    def to_dict(self) -> dict:
+        return {"type": self.type, **asdict(self)}
+
+
+@dataclass
+class DebateStarted(DebateEvent):
+    type: ClassVar[str] = "debate_started"
+    topic: str
+    participants: List[str]
+    thread_id: str
+
+
+@dataclass
+class RoundStarted(DebateEvent):
+    """A turn node has been scheduled; its argument follows as turn_accepted"""
+    type: ClassVar[str] = "round_started"
+    round: int
+    agent: str
+    persona: str
+
+
+@dataclass
+class TurnAccepted(DebateEvent):
+    """An argument entered the transcript (fields as in Turn.to_dict())"""
+    type: ClassVar[str] = "turn_accepted"
+    round: int
+    agent: str
+    persona: str
+    text: str
+    timestamp: str
+    claims: Optional[List[str]] = None
+    rebuttal_target: Optional[str] = None
+
+
+@dataclass
+class StandingsUpdated(DebateEvent):
+    """Running scores from the judge's per-turn notes"""
+    type: ClassVar[str] = "standings"
+    round: int
+    standings: Dict[str, dict]
+
+
+@dataclass
+class MemoryUpdated(DebateEvent):
+    type: ClassVar[str] = "memory_updated"
+    round: int
+    summary: str
+
+
+@dataclass
+class Verdict(DebateEvent):
+    type: ClassVar[str] = "verdict"
+    winner: Optional[str]
+    rationale: Optional[str]
+    error: Optional[str]
+
+
+@dataclass
+class DebateFinished(DebateEvent):
+    """Last event of every debate; final_state is what run_langgraph_debate returns"""
+    type: ClassVar[str] = "debate_finished"
+    final_state: Dict[str, Any] = field(repr=False)
+
+    def to_dict(self) -> dict:
+        state = self.final_state or {}
+        return {"type": self.type, "winner": state.get("winner"), "rationale": state.get("rationale"),
+                "error": state.get("error"), "rounds": len(state.get("transcript") or []),
+                "scores": (state.get("summary") or {}).get("scores")}
@@ -0,0 +1,262 @@
+# forking.py
+"""
+Fork a debate at round k and continue it with overrides.
+
+A fork copies the parent's state after round k - the first k turns, the
+judge's notes on them and whose turn comes next - into a new thread, applies
+the overrides and lets the graph generate only rounds k+1 onwards. An A/B test
+of personas, prompts or backends therefore costs the new turns, not a rerun of
+the shared prefix.
+
+Overrides:
+    persona_a, persona_b   who speaks for each side after the fork
+    participants           panel debates: the personas in speaking order (same length)
+    guidance               persona -> prompt guidance replacing the built-in one
+    backend                "gemini" or "local" for the fork's turns and summaries
+    rounds                 total rounds of the forked debate
+
+The parent is read from the graph's checkpointer if this process still
+retains its thread, else from the records store. Forks are saved with source
+"fork" and store only their own turns; RecordsStore.transcript() joins them to
+the parent's prefix, so the prefix is kept once however many forks share it. A
+parent read from the checkpointer is named by its graph thread id, which can
+differ from its records store id (job workers, tournaments and the CLI save
+under their own ids); such a fork stores the prefix as well.
+
+Usage:
+    python src/forking.py <debate_id> --round 4 --persona-b Lawyer
+    python src/forking.py <debate_id> --round 4 --backend local --rounds 10
+    python src/forking.py <debate_id> --round 4 --variants variants.json
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from .logger_util import log_event
+    from .records_store import RecordsStore
+    from .state import Turn
+except ImportError:
+    from logger_util import log_event
+    from records_store import RecordsStore
+    from state import Turn
+
+OVERRIDES = ("persona_a", "persona_b", "participants", "guidance", "backend", "rounds")
+DEFAULT_CONCURRENCY = 4
+
+
+def load_debate(debate_id, store=None):
+    """Topic, personas and transcript of a debate, from a retained checkpoint or the records store"""
+    from langgraph_debate import create_debate_graph, create_panel_graph
+
+    config = {"configurable": {"thread_id": debate_id}}
+    for app in (create_debate_graph(), create_panel_graph()):
+        values = app.get_state(config).values
+        if values and values.get("transcript"):
+            return {"id": debate_id, "topic": values["topic"], "persona_a": values["persona_a"],
+                    "persona_b": values["persona_b"], "participants": values.get("participants"),
+                    "max_rounds": values.get("max_rounds"), "transcript": list(values["transcript"])}
+
+    store = store or RecordsStore()
+    row = store.debate(debate_id)
+    if row is None:
+        raise ValueError(f"no debate {debate_id!r} in the checkpointer or in {store.path}")
+    transcript = [Turn(t["round"], t["agent"], t.get("persona") or "", t["text"], t.get("created_at") or 0.0,
+                       claims=t.get("claims"), rebuttal_target=t.get("rebuttal_target"))
+                  for t in store.transcript(debate_id)]
+    # Panels are stored by their first two personas; the turns name the rest
+    speakers = dict(sorted({t.agent: t.persona for t in transcript}.items()))
+    return {"id": debate_id, "topic": row["topic"], "persona_a": row["persona_a"], "persona_b": row["persona_b"],
+            "participants": list(speakers.values()) if len(speakers) > 2 else None,
+            "max_rounds": None, "transcript": transcript}
+
+
+def fork_state(debate, fork_round, overrides=None):
+    """The state of debate after fork_round with overrides applied, as stream_debate's resume argument
+
+    Returns {"values", "as_node"}: the graph continues as if as_node had just
+    run.
+    """
+    from langgraph_debate import agent_id_for, panel_rounds
+    from nodes import JudgeNode, BACKENDS
+
+    overrides = {key: value for key, value in (overrides or {}).items() if value is not None}
+    unknown = set(overrides) - set(OVERRIDES)
+    if unknown:
+        raise ValueError(f"unknown override(s) {', '.join(sorted(unknown))}; expected {', '.join(OVERRIDES)}")
+    if overrides.get("backend") not in (None,) + BACKENDS:
+        raise ValueError(f"unknown backend {overrides['backend']!r}; expected one of {', '.join(BACKENDS)}")
+    transcript = debate["transcript"]
+    if not 1 <= fork_round <= len(transcript):
+        raise ValueError(f"fork round must be between 1 and {len(transcript)}, the rounds the debate has")
+    rounds = overrides.get("rounds") or debate.get("max_rounds") or max(8, len(transcript))
+    if rounds <= fork_round:
+        raise ValueError(f"a fork at round {fork_round} needs more than {fork_round} rounds (got {rounds})")
+
+    participants = debate.get("participants")
+    panel = bool(participants) and len(participants) > 2
+    if panel:
+        rounds = panel_rounds(rounds, len(participants))
+    prefix = transcript[:fork_round]
+    last = prefix[-1]
+    values = {
+        "topic": debate["topic"],
+        "persona_a": overrides.get("persona_a", debate["persona_a"]),
+        "persona_b": overrides.get("persona_b", debate["persona_b"]),
+        "transcript": prefix,
+        "judge_notes": [JudgeNode(panel=panel).note_turn(turn) for turn in prefix],
+        "last_speaker": last["agent"],
+        "last_text": last["text"],
+        "max_rounds": rounds,
+        "winner": None,
+        "rationale": None,
+        "error": None,
+        "backend": overrides.get("backend"),
+        "prompt_guidance": overrides.get("guidance"),
+        "fork": {"parent": debate["id"], "round": fork_round, "overrides": overrides},
+    }
+
+    if panel:
+        participants = list(overrides.get("participants") or participants)
+        if len(participants) != len(debate["participants"]):
+            raise ValueError("a panel fork keeps the number of participants")
+        if fork_round < len(participants):
+            raise ValueError(f"a panel debate forks after its {len(participants)} openings")
+        values.update(participants=participants, persona_a=participants[0], persona_b=participants[1],
+                      round=fork_round + 1, current_agent=agent_id_for(fork_round % len(participants)))
+        return {"values": values, "as_node": "validator"}
+    if "participants" in overrides:
+        raise ValueError("participants can only be overridden in panel debates")
+    if rounds % 2:
+        raise ValueError(f"two-agent debates run in AgentA/AgentB pairs, so rounds must be even (got {rounds})")
+    if fork_round % 2:
+        # After AgentA's turn: AgentB speaks round state["round"] + 1 next
+        values.update(round=fork_round, current_agent="AgentB")
+        return {"values": values, "as_node": "agent_a"}
+    # After a full AgentA/AgentB pair: the validator's routing picks AgentA or the judge
+    values.update(round=fork_round + 1, current_agent="AgentA")
+    return {"values": values, "as_node": "validator"}
+
+
+def _new_thread_id(debate_id):
+    return f"{debate_id}-fork-{uuid.uuid4().hex[:8]}"
+
+
+def stream_fork(parent, fork_round, overrides=None, thread_id=None, store=None, **options):
+    """stream_debate for a fork of parent (a debate id, or a debate from load_debate)
+
+    options are passed on to stream_debate (judges, convergence, deadline_s, ...).
+    """
+    from langgraph_debate import stream_debate
+
+    debate = parent if isinstance(parent, dict) else load_debate(parent, store)
+    resume = fork_state(debate, fork_round, overrides)
+    values = resume["values"]
+    thread_id = thread_id or _new_thread_id(debate["id"])
+    log_event("debate_forked", {"parent": debate["id"], "thread_id": thread_id, "round": fork_round,
+                                "overrides": values["fork"]["overrides"],
+                                "rounds_to_generate": values["max_rounds"] - fork_round})
+    return stream_debate(values["topic"], values["persona_a"], values["persona_b"], thread_id=thread_id,
+                         participants=values.get("participants"), max_rounds=values["max_rounds"],
+                         resume=resume, **options)
+
+
+def fork_debate(parent, fork_round, overrides=None, thread_id=None, records_db=None, **options):
+    """Run a fork to the end and return its final state
+
+    The fork is saved to the records store under its thread id (records_db=False
+    skips that), so it can be forked again later.
+    """
+    thread_id = thread_id or _new_thread_id(parent["id"] if isinstance(parent, dict) else parent)
+    store = None if records_db is False else RecordsStore(records_db) if records_db else RecordsStore()
+    started = time.time()
+    final_state = None
+    for event in stream_fork(parent, fork_round, overrides, thread_id=thread_id, store=store, **options):
+        if event.type == "debate_finished":
+            final_state = event.final_state
+    if store is not None and final_state.get("fork"):
+        try:
+            store.save_debate(final_state, debate_id=thread_id, started_at=started, source="fork",
+                              metrics={"duration_s": round(time.time() - started, 2)})
+        except Exception as e:
+            log_event("records_store_error", {"id": thread_id, "error": str(e)})
+    final_state["thread_id"] = thread_id
+    return final_state
+
+
+def fan_out(parent, fork_round, variants, concurrency=None, records_db=None, **options):
+    """Fork parent at fork_round once per overrides dict in variants, concurrently
+
+    The parent is loaded once for all of them. Returns the final states in the
+    order of variants.
+    """
+    debate = parent if isinstance(parent, dict) else load_debate(
+        parent, None if records_db is False else RecordsStore(records_db) if records_db else None)
+    # Validate every variant before spending anything on the first one
+    for overrides in variants:
+        fork_state(debate, fork_round, overrides)
+    concurrency = max(1, min(len(variants), concurrency or DEFAULT_CONCURRENCY))
+    log_event("fork_fan_out", {"parent": debate["id"], "round": fork_round, "variants": len(variants),
+                               "concurrency": concurrency})
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fork") as executor:
+        futures = [executor.submit(fork_debate, debate, fork_round, overrides, records_db=records_db, **options)
+                   for overrides in variants]
+        return [future.result() for future in futures]
+
+
+def parse_guidance(values):
+    """['Lawyer=Cite statutes', ...] -> {"Lawyer": "Cite statutes"}"""
+    guidance = {}
+    for value in values or []:
+        persona, sep, text = value.partition("=")
+        if not sep or not persona.strip() or not text.strip():
+            raise ValueError(f"--guidance takes PERSONA=TEXT, got {value!r}")
+        guidance[persona.strip()] = text.strip()
+    return guidance or None
+
+
+def print_forks(results, fork_round):
+    from rich.console import Console
+    from rich.table import Table
+    table = Table(title=f"Forks from round {fork_round}")
+    for column in ("Fork", "Overrides", "New turns", "Winner"):
+        table.add_column(column)
+    for final_state in results:
+        fork = final_state.get("fork") or {}
+        new_turns = len(final_state.get("transcript") or []) - fork_round if fork else 0
+        table.add_row(final_state.get("thread_id", "?"), json.dumps(fork.get("overrides") or {}),
+                      str(max(0, new_turns)), final_state.get("winner") or final_state.get("error") or "no result")
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fork a debate at a round and continue it with overrides")
+    parser.add_argument("debate_id", help="thread id of a debate in this process, or a records store debate id")
+    parser.add_argument("--round", type=int, required=True, help="last round kept from the parent")
+    parser.add_argument("--persona-a", help="persona for AgentA after the fork")
+    parser.add_argument("--persona-b", help="persona for AgentB after the fork")
+    parser.add_argument("--guidance", action="append", metavar="PERSONA=TEXT",
+                        help="replace a persona's prompt guidance (repeatable)")
+    parser.add_argument("--backend", choices=["gemini", "local"], help="generation backend for the new turns")
+    parser.add_argument("--rounds", type=int, help="total rounds of the forked debate")
+    parser.add_argument("--variants", help="JSON file with a list of overrides objects, one fork each")
+    parser.add_argument("--concurrency", type=int, help=f"forks run at once (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--db", help="records store database (default DEBATOR_RECORDS_DB)")
+    args = parser.parse_args()
+
+    try:
+        if args.variants:
+            with open(args.variants, "r", encoding="utf-8") as f:
+                variants = json.load(f)
+        else:
+            variants = [{"persona_a": args.persona_a, "persona_b": args.persona_b,
+                         "guidance": parse_guidance(args.guidance), "backend": args.backend, "rounds": args.rounds}]
+        results = fan_out(args.debate_id, args.round, variants, concurrency=args.concurrency, records_db=args.db)
+    except ValueError as e:
+        parser.error(str(e))
+    print_forks(results, args.round)
@@ -0,0 +1,168 @@
+# hedging.py
+"""
+Hedged generation requests.
+
+When DEBATOR_HEDGING=1, gemini_generate runs each call through hedged_call. If
+the call has not returned after the observed p90 latency for its kind of
+request ("agent_turn", "memory_summary", "judge_rationale", ...), a duplicate is
+sent to the same backend, or to the local model with DEBATOR_HEDGE_BACKEND=local.
+The first valid response wins. Python cannot interrupt a blocking HTTP call, so
+the loser is cancelled if it hasn't started, or otherwise left to finish in the
+background with its result discarded.
+
+Hedges are capped at DEBATOR_HEDGE_MAX_RATE (default 10%) of requests. The
+counters from hedge_stats() are logged at the end of each debate.
+"""
+import os
+import time
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    from .logger_util import log_event
+except ImportError:
+    from logger_util import log_event
+
+QUANTILE = float(os.getenv("DEBATOR_HEDGE_QUANTILE", "0.9"))
+MAX_HEDGE_RATE = float(os.getenv("DEBATOR_HEDGE_MAX_RATE", "0.1"))
+# Threshold used until a kind of request has MIN_SAMPLES latencies recorded
+DEFAULT_THRESHOLD_S = float(os.getenv("DEBATOR_HEDGE_DEFAULT_MS", "4000")) / 1000
+MIN_SAMPLES = 10
+WINDOW = 200
+
+
+def hedging_enabled():
+    return os.getenv("DEBATOR_HEDGING", "").lower() in ("1", "true", "yes")
+
+
+def hedge_backend():
+    """'same' re-sends to the primary backend, 'local' hedges with flan-t5"""
+    return os.getenv("DEBATOR_HEDGE_BACKEND", "same").lower()
+
+
+class LatencyTracker:
+    """Recent latencies per request kind, used to derive the hedge threshold"""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, seconds):
+        with self._lock:
+            self._samples.setdefault(kind, deque(maxlen=self.window)).append(seconds)
+
+    def threshold(self, kind, quantile=QUANTILE):
+        with self._lock:
+            samples = sorted(self._samples.get(kind, ()))
+        if len(samples) < MIN_SAMPLES:
+            return DEFAULT_THRESHOLD_S
+        return samples[min(len(samples) - 1, int(quantile * len(samples)))]
+
+
+class Hedger:
+    """Runs generation calls with a delayed duplicate and keeps hedge counters"""
+
+    def __init__(self, max_rate=MAX_HEDGE_RATE, quantile=QUANTILE, threads=None):
+        self.max_rate = max_rate
+        self.quantile = quantile
+        self.latency = LatencyTracker()
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads or int(os.getenv("DEBATOR_HEDGE_THREADS", "32")),
+            thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges_issued = 0
+        self.hedges_won = 0
+        self.hedges_capped = 0
+
+    def _timed(self, kind, fn, record):
+        start = time.perf_counter()
+        result = fn()
+        if record:
+            self.latency.record(kind, time.perf_counter() - start)
+        return result
+
+    def _may_hedge(self):
+        # One hedge of burst, then at most max_rate of all requests
+        with self._lock:
+            if self.hedges_issued + 1 > self.max_rate * self.requests + 1:
+                self.hedges_capped += 1
+                return False
+            self.hedges_issued += 1
+            return True
+
+    def call(self, kind, primary, alternate=None, is_valid=None):
+        """Return the first valid result of primary() or, once it is slow, alternate()
+
+        alternate defaults to primary. Latencies are only recorded for calls to
+        the primary backend, so a local-model hedge does not skew its threshold.
+        """
+        is_valid = is_valid or (lambda result: bool(result))
+        with self._lock:
+            self.requests += 1
+        threshold = self.latency.threshold(kind, self.quantile)
+        # Each attempt runs in a copy of the caller's context (debate log, deadline budget)
+        first = self.executor.submit(contextvars.copy_context().run, self._timed, kind, primary, True)
+        done, _ = wait([first], timeout=threshold)
+        if done or not self._may_hedge():
+            return first.result()
+
+        log_event("hedge_issued", {"kind": kind, "threshold_ms": round(threshold * 1000)})
+        second = self.executor.submit(contextvars.copy_context().run, self._timed, kind, alternate or primary,
+                                      alternate is None)
+        pending = {first, second}
+        failure = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failure = failure or e
+                    continue
+                if is_valid(result):
+                    for other in pending:
+                        other.cancel()
+                    if future is second:
+                        with self._lock:
+                            self.hedges_won += 1
+                        log_event("hedge_won", {"kind": kind})
+                    return result
+        if failure is not None:
+            raise failure
+        return first.result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges_issued": self.hedges_issued,
+                "hedges_won": self.hedges_won,
+                "hedges_capped": self.hedges_capped,
+                "hedge_rate": round(self.hedges_issued / self.requests, 4) if self.requests else 0.0,
+            }
+
+
+_hedger = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger():
+    """Process-wide hedger shared by every debate"""
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger()
+        return _hedger
+
+
+def hedged_call(kind, primary, alternate=None, is_valid=None):
+    return get_hedger().call(kind, primary, alternate, is_valid)
+
+
+def hedge_stats():
+    """Counters for hedges issued and won; None when hedging has not been used"""
+    return _hedger.stats() if _hedger is not None else None
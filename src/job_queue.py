@@ -0,0 +1,538 @@
+# job_queue.py
+"""
+Debate job queue with lease-based workers.
+
+Jobs go through a broker. Any number of worker processes, on any number of
+hosts that can reach the broker, claim jobs and run them with
+run_langgraph_debate. Each worker writes the result to the records store and
+marks the job done.
+
+A claimed job carries a lease. Its worker renews the lease from a heartbeat
+thread every lease/3 seconds. If a worker dies, the lease runs out, and the
+next worker to poll (or `requeue`) puts the job back in the queue. After
+DEBATOR_JOB_MAX_ATTEMPTS (3) expired leases the job is marked failed. A worker
+that finishes after losing its lease cannot overwrite the new owner's state,
+and the records store is keyed by job id, so a rerun replaces rather than
+duplicates the result.
+
+Brokers implement JobBroker and are chosen by URL (DEBATOR_JOB_BROKER):
+    sqlite:///records/jobs.db   single host: one SQLite file shared by all local workers (default)
+    memory://                   in-process stand-in, for tests and embedding
+Other transports (Redis, a cloud queue) plug in with register_broker(scheme, factory).
+
+Command line:
+    python src/job_queue.py submit --topic "Should AI be regulated?" [--count 10]
+    python src/job_queue.py worker [--concurrency 4] [--exit-when-empty]
+    python src/job_queue.py status
+    python src/job_queue.py requeue
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import signal
+import sqlite3
+import argparse
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from .logger_util import log_event
+    from .records_store import RecordsStore
+except ImportError:
+    from logger_util import log_event
+    from records_store import RecordsStore
+
+DEFAULT_BROKER_URL = os.getenv("DEBATOR_JOB_BROKER", "sqlite:///" + os.path.join("records", "jobs.db"))
+LEASE_SECONDS = float(os.getenv("DEBATOR_JOB_LEASE_S", "60"))
+MAX_ATTEMPTS = int(os.getenv("DEBATOR_JOB_MAX_ATTEMPTS", "3"))
+POLL_SECONDS = 1.0
+
+
+class JobBroker:
+    """Interface every broker implements; all methods must be safe to call from many workers"""
+
+    def enqueue(self, payload, max_attempts=MAX_ATTEMPTS):
+        """Add a job; returns its id"""
+        raise NotImplementedError
+
+    def claim(self, worker_id, lease_s=LEASE_SECONDS):
+        """Take the oldest queued job for worker_id; returns {"id", "payload", "attempts"} or None"""
+        raise NotImplementedError
+
+    def heartbeat(self, worker_id, job_ids, lease_s=LEASE_SECONDS):
+        """Extend the leases worker_id still holds; returns the ids it has lost"""
+        raise NotImplementedError
+
+    def complete(self, job_id, worker_id, result):
+        """Mark a job done; False if worker_id no longer holds it"""
+        raise NotImplementedError
+
+    def fail(self, job_id, worker_id, error, retry=True):
+        """Give a job back (retry) or mark it failed; False if worker_id no longer holds it"""
+        raise NotImplementedError
+
+    def requeue_expired(self):
+        """Return jobs with lapsed leases to the queue (or fail them); returns how many"""
+        raise NotImplementedError
+
+    def get(self, job_id):
+        raise NotImplementedError
+
+    def stats(self):
+        """Job counts by status plus the workers seen recently"""
+        raise NotImplementedError
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT PRIMARY KEY,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker       TEXT,
+    lease_until  REAL,
+    created_at   REAL NOT NULL,
+    started_at   REAL,
+    finished_at  REAL,
+    result       TEXT,
+    error        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, lease_until);
+CREATE TABLE IF NOT EXISTS workers (
+    id           TEXT PRIMARY KEY,
+    host         TEXT,
+    pid          INTEGER,
+    started_at   REAL,
+    heartbeat_at REAL,
+    jobs_done    INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class SQLiteBroker(JobBroker):
+    """Broker on one SQLite file (WAL); claims are a single atomic UPDATE ... RETURNING"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(SQLITE_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _run(self, sql, params=()):
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def enqueue(self, payload, max_attempts=MAX_ATTEMPTS):
+        job_id = uuid.uuid4().hex[:12]
+        self._run("INSERT INTO jobs (id, payload, status, max_attempts, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                  (job_id, json.dumps(payload), max_attempts, time.time()))
+        return job_id
+
+    def claim(self, worker_id, lease_s=LEASE_SECONDS):
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, lease_until = ?, started_at = ?, attempts = attempts + 1 "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1) "
+                "RETURNING id, payload, attempts",
+                (worker_id, now + lease_s, now)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"id": row["id"], "payload": json.loads(row["payload"]), "attempts": row["attempts"]}
+
+    def heartbeat(self, worker_id, job_ids, lease_s=LEASE_SECONDS):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO workers (id, host, pid, started_at, heartbeat_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (worker_id, socket.gethostname(), os.getpid(), now, now))
+            lost = []
+            for job_id in job_ids:
+                renewed = conn.execute(
+                    "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                    (now + lease_s, job_id, worker_id)).rowcount
+                if not renewed:
+                    lost.append(job_id)
+            conn.execute("COMMIT")
+            return lost
+        finally:
+            conn.close()
+
+    def complete(self, job_id, worker_id, result):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, finished_at = ?, lease_until = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (json.dumps(result), time.time(), job_id, worker_id)).rowcount
+            if done:
+                conn.execute("UPDATE workers SET jobs_done = jobs_done + 1 WHERE id = ?", (worker_id,))
+            conn.execute("COMMIT")
+            return bool(done)
+        finally:
+            conn.close()
+
+    def fail(self, job_id, worker_id, error, retry=True):
+        return bool(self._run(
+            "UPDATE jobs SET status = CASE WHEN ? AND attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+            "error = ?, worker = NULL, lease_until = NULL, "
+            "finished_at = CASE WHEN ? AND attempts < max_attempts THEN NULL ELSE ? END "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (retry, error, retry, time.time(), job_id, worker_id)).rowcount)
+
+    def requeue_expired(self):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            expired = conn.execute(
+                "SELECT id, worker, attempts, max_attempts FROM jobs WHERE status = 'running' AND lease_until < ?",
+                (now,)).fetchall()
+            for row in expired:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL, error = ?, finished_at = ? WHERE id = ?",
+                    ("queued" if row["attempts"] < row["max_attempts"] else "failed",
+                     f"lease expired on worker {row['worker']}",
+                     None if row["attempts"] < row["max_attempts"] else now, row["id"]))
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        for row in expired:
+            log_event("job_lease_expired", {"id": row["id"], "worker": row["worker"], "attempts": row["attempts"]})
+        return len(expired)
+
+    def get(self, job_id):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def stats(self):
+        conn = self._connect()
+        try:
+            counts = {row["status"]: row["n"] for row in
+                      conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")}
+            workers = [dict(row) for row in conn.execute(
+                "SELECT id, host, pid, heartbeat_at, jobs_done FROM workers WHERE heartbeat_at > ? ORDER BY id",
+                (time.time() - 3 * LEASE_SECONDS,))]
+        finally:
+            conn.close()
+        return {"jobs": counts, "workers": workers}
+
+
+class MemoryBroker(JobBroker):
+    """In-process broker with the same semantics; a stand-in for a network broker"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._workers = {}
+
+    def enqueue(self, payload, max_attempts=MAX_ATTEMPTS):
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._jobs[job_id] = {"id": job_id, "payload": payload, "status": "queued", "attempts": 0,
+                                  "max_attempts": max_attempts, "worker": None, "lease_until": None,
+                                  "created_at": time.time(), "started_at": None, "finished_at": None,
+                                  "result": None, "error": None}
+        return job_id
+
+    def claim(self, worker_id, lease_s=LEASE_SECONDS):
+        now = time.time()
+        with self._lock:
+            queued = [job for job in self._jobs.values() if job["status"] == "queued"]
+            if not queued:
+                return None
+            job = min(queued, key=lambda j: j["created_at"])
+            job.update(status="running", worker=worker_id, lease_until=now + lease_s, started_at=now)
+            job["attempts"] += 1
+            return {"id": job["id"], "payload": job["payload"], "attempts": job["attempts"]}
+
+    def _held(self, job_id, worker_id):
+        job = self._jobs.get(job_id)
+        return job if job and job["worker"] == worker_id and job["status"] == "running" else None
+
+    def heartbeat(self, worker_id, job_ids, lease_s=LEASE_SECONDS):
+        now = time.time()
+        with self._lock:
+            worker = self._workers.setdefault(worker_id, {"id": worker_id, "host": socket.gethostname(),
+                                                          "pid": os.getpid(), "jobs_done": 0})
+            worker["heartbeat_at"] = now
+            lost = []
+            for job_id in job_ids:
+                job = self._held(job_id, worker_id)
+                if job:
+                    job["lease_until"] = now + lease_s
+                else:
+                    lost.append(job_id)
+            return lost
+
+    def complete(self, job_id, worker_id, result):
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if not job:
+                return False
+            job.update(status="done", result=result, finished_at=time.time(), lease_until=None)
+            if worker_id in self._workers:
+                self._workers[worker_id]["jobs_done"] += 1
+            return True
+
+    def fail(self, job_id, worker_id, error, retry=True):
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if not job:
+                return False
+            again = retry and job["attempts"] < job["max_attempts"]
+            job.update(status="queued" if again else "failed", error=error, worker=None, lease_until=None,
+                       finished_at=None if again else time.time())
+            return True
+
+    def requeue_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job["status"] == "running" and job["lease_until"] < now]
+            for job in expired:
+                again = job["attempts"] < job["max_attempts"]
+                job.update(status="queued" if again else "failed", error=f"lease expired on worker {job['worker']}",
+                           worker=None, lease_until=None, finished_at=None if again else now)
+        for job in expired:
+            log_event("job_lease_expired", {"id": job["id"], "attempts": job["attempts"]})
+        return len(expired)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return {"jobs": counts, "workers": [dict(w) for w in self._workers.values()]}
+
+
+BROKERS = {
+    "sqlite": lambda rest: SQLiteBroker(rest),
+    "memory": lambda rest: MemoryBroker(),
+}
+
+
+def register_broker(scheme, factory):
+    """Make broker_from_url accept scheme://...; factory receives the part after '://'"""
+    BROKERS[scheme] = factory
+
+
+def broker_from_url(url=None):
+    url = url or DEFAULT_BROKER_URL
+    scheme, _, rest = url.partition("://")
+    if scheme not in BROKERS:
+        raise ValueError(f"Unknown job broker '{scheme}' (registered: {', '.join(sorted(BROKERS))})")
+    if scheme == "sqlite" and rest.startswith("/") and not rest.startswith("//"):
+        # sqlite:///relative/path and sqlite:////absolute/path, as in SQLAlchemy URLs
+        rest = rest[1:]
+    return BROKERS[scheme](rest)
+
+
+def debate_payload(topic, persona_a="Scientist", persona_b="Philosopher", **options):
+    """Job payload for one debate; options are passed through to run_langgraph_debate"""
+    return {"topic": topic, "persona_a": persona_a, "persona_b": persona_b, "options": options}
+
+
+class Worker:
+    """Claims jobs from a broker and runs up to `concurrency` debates at a time"""
+
+    def __init__(self, broker, concurrency=1, lease_s=LEASE_SECONDS, records_db=None, run=None,
+                 worker_id=None):
+        self.broker = broker
+        self.concurrency = max(1, concurrency)
+        self.lease_s = lease_s
+        self.records_db = records_db
+        self.run = run
+        self.id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.stopping = threading.Event()
+        self._active = set()
+        self._lock = threading.Lock()
+        self.done = 0
+        self.failed = 0
+
+    def _run_debate(self, payload, job_id):
+        if self.run is not None:
+            return self.run(payload)
+        from langgraph_debate import run_langgraph_debate
+        return run_langgraph_debate(payload["topic"], payload["persona_a"], payload["persona_b"],
+                                    thread_id=f"job-{job_id}", **payload.get("options", {}))
+
+    def _heartbeat_loop(self):
+        while not self.stopping.wait(self.lease_s / 3):
+            with self._lock:
+                held = list(self._active)
+            try:
+                lost = self.broker.heartbeat(self.id, held, self.lease_s)
+            except Exception as e:
+                log_event("job_heartbeat_error", {"worker": self.id, "error": str(e)})
+                continue
+            for job_id in lost:
+                log_event("job_lease_lost", {"worker": self.id, "id": job_id})
+
+    def _process(self, job):
+        job_id = job["id"]
+        started = time.time()
+        log_event("job_started", {"worker": self.id, "id": job_id, "attempt": job["attempts"]})
+        try:
+            try:
+                final_state = self._run_debate(job["payload"], job_id)
+            except Exception as e:
+                log_event("job_error", {"worker": self.id, "id": job_id, "error": str(e)})
+                if self.broker.fail(job_id, self.id, str(e)):
+                    self._count("failed")
+                return
+            summary = {"winner": final_state.get("winner"), "rationale": final_state.get("rationale"),
+                       "error": final_state.get("error"), "rounds": len(final_state.get("transcript") or [])}
+            # Settle the job first: only the worker still holding the lease records a result
+            if final_state.get("error"):
+                held, outcome = self.broker.fail(job_id, self.id, final_state["error"], retry=False), "failed"
+            else:
+                held, outcome = self.broker.complete(job_id, self.id, summary), "done"
+            if not held:
+                log_event("job_result_discarded", {"worker": self.id, "id": job_id})
+                return
+            self._count(outcome)
+            if self.records_db is not False:
+                # A storage error is logged, not retried: rerunning the debate would not fix it
+                try:
+                    store = RecordsStore(self.records_db) if self.records_db else RecordsStore()
+                    store.save_debate(final_state, debate_id=job_id, started_at=started, source="worker",
+                                      metrics={"duration_s": round(time.time() - started, 3),
+                                               "attempt": job["attempts"]})
+                except Exception as e:
+                    log_event("records_store_error", {"worker": self.id, "id": job_id, "error": str(e)})
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+            log_event("job_finished", {"worker": self.id, "id": job_id,
+                                       "duration_s": round(time.time() - started, 3)})
+
+    def _count(self, outcome):
+        with self._lock:
+            if outcome == "done":
+                self.done += 1
+            else:
+                self.failed += 1
+
+    def serve(self, max_jobs=None, exit_when_empty=False):
+        """Claim and run jobs until stopped, max_jobs have been claimed, or (optionally) the queue is empty"""
+        self.broker.heartbeat(self.id, [], self.lease_s)
+        threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True).start()
+        log_event("worker_started", {"worker": self.id, "concurrency": self.concurrency})
+        threads = []
+        claimed = 0
+        reaped_at = 0.0
+        while not self.stopping.is_set() and (max_jobs is None or claimed < max_jobs):
+            with self._lock:
+                busy = len(self._active)
+            if busy >= self.concurrency:
+                time.sleep(0.05)
+                continue
+            if time.time() - reaped_at >= self.lease_s / 3:
+                self.broker.requeue_expired()
+                reaped_at = time.time()
+            job = self.broker.claim(self.id, self.lease_s)
+            if job is None:
+                if exit_when_empty and busy == 0:
+                    break
+                self.stopping.wait(POLL_SECONDS)
+                continue
+            claimed += 1
+            with self._lock:
+                self._active.add(job["id"])
+            thread = threading.Thread(target=self._process, args=(job,), name=f"job-{job['id']}", daemon=True)
+            thread.start()
+            threads.append(thread)
+            threads = [t for t in threads if t.is_alive()]
+        for thread in threads:
+            thread.join()
+        self.stopping.set()
+        log_event("worker_stopped", {"worker": self.id, "done": self.done, "failed": self.failed})
+        return self.done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Debate job queue")
+    parser.add_argument("--broker", default=DEFAULT_BROKER_URL, help="broker URL, e.g. sqlite:///records/jobs.db")
+    sub = parser.add_subparsers(dest="command", required=True)
+    submit = sub.add_parser("submit", help="queue debates")
+    submit.add_argument("--topic", required=True)
+    submit.add_argument("--persona-a", default="Scientist")
+    submit.add_argument("--persona-b", default="Philosopher")
+    submit.add_argument("--count", type=int, default=1, help="queue this many copies")
+    worker = sub.add_parser("worker", help="run jobs from the queue")
+    worker.add_argument("--concurrency", type=int, default=1, help="debates run at once by this worker")
+    worker.add_argument("--lease", type=float, default=LEASE_SECONDS, help="seconds a claim lasts without a heartbeat")
+    worker.add_argument("--max-jobs", type=int)
+    worker.add_argument("--exit-when-empty", action="store_true")
+    sub.add_parser("status", help="job counts and live workers")
+    sub.add_parser("requeue", help="return jobs from dead workers to the queue")
+    args = parser.parse_args()
+
+    broker = broker_from_url(args.broker)
+    if args.command == "submit":
+        for _ in range(args.count):
+            print(broker.enqueue(debate_payload(args.topic, args.persona_a, args.persona_b)))
+    elif args.command == "worker":
+        runner = Worker(broker, concurrency=args.concurrency, lease_s=args.lease)
+        # Finish the debates in flight, then exit
+        signal.signal(signal.SIGTERM, lambda *_: runner.stopping.set())
+        try:
+            done = runner.serve(max_jobs=args.max_jobs, exit_when_empty=args.exit_when_empty)
+        except KeyboardInterrupt:
+            runner.stopping.set()
+            done = runner.done
+        print(f"Worker {runner.id}: {done} debates done, {runner.failed} failed")
+    elif args.command == "status":
+        stats = broker.stats()
+        print("Jobs: " + (", ".join(f"{status} {n}" for status, n in sorted(stats["jobs"].items())) or "none"))
+        for w in stats["workers"]:
+            print(f"  worker {w['id']} on {w['host']}: {w['jobs_done']} done, "
+                  f"last heartbeat {time.time() - w['heartbeat_at']:.0f}s ago")
+    else:
+        print(f"Requeued {broker.requeue_expired()} jobs")
+
+
+if __name__ == "__main__":
+    main()
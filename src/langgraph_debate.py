@@ -2,23 +2,38 @@
 LangGraph implementation for Multi-Agent Debate DAG
 Implements the complete LangGraph workflow with all nodes as LangGraph nodes
 """
-from typing import TypedDict, List, Optional, Dict, Any, Literal
+from typing import TypedDict, List, Optional, Dict, Any, Literal, Iterator, AsyncIterator
+import os
 import json
 import time
-from datetime import datetime
+import queue
+import asyncio
+import threading
+import contextvars
 
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph.state import CompiledStateGraph
+try:
+    from langgraph.types import Send
+except ImportError:
+    from langgraph.constants import Send
 
-from state import DebateState
-from nodes import Agent, MemoryNode, JudgeNode, validate_turn, gemini_generate
+from state import DebateState, Turn, seen_texts
+from nodes import Agent, MemoryNode, backend_scope, JudgeNode, validate_turn, gemini_generate, make_judge, aggregate_verdicts, JUDGE_PROFILES, turn_novelty
 from logger_util import log_event
+from debate_events import (DebateEvent, DebateStarted, RoundStarted, TurnAccepted, StandingsUpdated, MemoryUpdated,
+                           Verdict, DebateFinished)
+from argument_cache import get_argument_cache, cache_enabled
+from checkpointing import BoundedMemorySaver
+from hedging import hedge_stats
+from rate_scheduler import debate_scope, current_debate, scheduler_stats
+from deadline import (configured_deadline, is_tight, round_slice, judge_slice, node_budget, remaining,
+                      bind_cancellation, is_cancelled)
 
 
 def user_input_node(state: DebateState) -> DebateState:
     """Accepts the debate topic at runtime from the user"""
-    log_event("node_start", {"node": "user_input", "state_before": state})
+    log_event("node_start", {"node": "user_input", "debate_id": current_debate(), "state_before": state})
     
     # Initialize state with topic and personas
     initial_state = state.copy()
@@ -28,49 +43,153 @@ def user_input_node(state: DebateState) -> DebateState:
     initial_state["rationale"] = None
     initial_state["error"] = None
     initial_state["transcript"] = []
-    initial_state["seen_texts"] = []
     initial_state["last_speaker"] = None
     initial_state["last_text"] = None
     
     log_event("user_input_end", initial_state)
-    log_event("node_end", {"node": "user_input", "state_after": initial_state})
+    log_event("node_end", {"node": "user_input", "debate_id": current_debate(), "state_after": initial_state})
     return initial_state
 
 
-def agent_a_node(state: DebateState) -> DebateState:
-    """AgentA's turn to speak - speaks in odd rounds (1, 3, 5, 7)"""
-    log_event("node_start", {"node": "agent_a", "state_before": state})
-    
-    # Ensure we're at an odd round for AgentA
-    # Round 1, 3, 5, 7 = AgentA's rounds
-    current_round = state["round"]
+def _argument_cache(state: DebateState):
+    """The shared argument cache if this debate opted in, else None"""
+    return get_argument_cache() if state.get("cache_stats") is not None else None
+
+
+def _record_cache_use(state: DebateState, agent: Agent, round_num: int, text: str) -> None:
+    """Count the agent's cache outcome and remember freshly generated openings"""
+    stats = state.get("cache_stats")
+    if stats is None or agent.cache_outcome is None:
+        return
+    stats["lookups"] += 1
+    stats[agent.cache_outcome] += 1
+    if agent.last_source == "llm":
+        try:
+            agent.cache.store(state["topic"], agent.persona, round_num, text)
+        except Exception as e:
+            log_event("argument_cache_error", {"round": round_num, "error": str(e)})
+
+
+# Per-agent fallback wording used when generation or validation fails. AgentA and
+# AgentB keep their original scientist/philosopher flavour; extra panelists get
+# a neutral set.
+FALLBACK_STYLES = {
+    "AgentA": {
+        "hints": ["emphasizing empirical evidence", "highlighting data-driven analysis",
+                  "focusing on safety protocols", "stressing rigorous testing",
+                  "underlining risk assessment", "advocating for systematic validation",
+                  "demonstrating scientific methodology", "showcasing evidence-based approach"],
+        "responding": " while responding to philosophical concerns",
+        "claim": "demands systematic evaluation based on empirical data and risk assessment",
+        "failed": "I argue that {topic}. This perspective is crucial for round {round}.",
+    },
+    "AgentB": {
+        "hints": ["examining ethical implications", "questioning underlying values",
+                  "exploring autonomy concerns", "analyzing societal impacts",
+                  "considering moral dimensions", "evaluating philosophical foundations",
+                  "reflecting on human dignity", "contemplating fundamental rights"],
+        "responding": " while challenging empirical assumptions",
+        "claim": "raises profound questions about human autonomy, ethical frameworks, and societal values",
+        "failed": "I counter that {topic}. This alternative view is essential for round {round}.",
+    },
+}
+DEFAULT_FALLBACK_STYLE = {
+    "hints": ["weighing practical consequences", "examining the strongest counterexamples",
+              "questioning hidden assumptions", "comparing real-world precedents",
+              "assessing costs and benefits", "considering who bears the risk",
+              "testing the argument against edge cases", "drawing on professional experience"],
+    "responding": " while responding to the other panelists",
+    "claim": "deserves careful consideration of its trade-offs from every professional perspective",
+    "failed": "I add that {topic}. This perspective matters for round {round}.",
+}
+
+
+def agent_id_for(index: int) -> str:
+    """Agent identifier for the participant at a given position: AgentA, AgentB, AgentC, ..."""
+    return "Agent" + chr(ord("A") + index)
+
+
+def _recent_context(transcript: List[dict]) -> str:
+    """Last 2 exchanges of the transcript as prompt context"""
+    recent = transcript[-4:] if len(transcript) >= 4 else transcript
+    return "\n".join([f"[{t['persona']}]: {t['text']}" for t in recent])
+
+
+# Stateless default judge used for the per-turn notes
+_note_judge = JudgeNode()
+_panel_note_judge = JudgeNode(panel=True)
+
+
+def note_judge(state: dict) -> JudgeNode:
+    """The judge that notes each turn as it lands; panel debates use one lexicon for every panelist"""
+    return _panel_note_judge if state.get("participants") else _note_judge
+
+
+def panel_rounds(max_rounds: int, panelists: int) -> int:
+    """max_rounds rounded up to whole cycles, so every panelist speaks equally often"""
+    return -(-max(max_rounds, panelists) // panelists) * panelists
+
+
+def _take_turn(state: DebateState, agent_id: str, persona: str, current_round: int) -> dict:
+    """Generate, validate and record one argument; returns the transcript entry
+
+    Shared by every turn node. The transcript and last_* fields of state are
+    updated in place.
+    """
+    prefix = "agent_" + agent_id[len("Agent"):].lower()
+    style = FALLBACK_STYLES.get(agent_id, DEFAULT_FALLBACK_STYLE)
     
-    # Create AgentA instance
-    agent_a = Agent(state["persona_a"])
+    agent = Agent(persona, cache=_argument_cache(state), guidance=(state.get("prompt_guidance") or {}).get(persona))
+    spoken = seen_texts(state["transcript"])
     
     # Generate argument
     context = ""
     if state["transcript"]:
-        # Get last 2 exchanges for context
-        recent = state["transcript"][-4:] if len(state["transcript"]) >= 4 else state["transcript"]
-        context = "\n".join([f"[{t['persona']}]: {t['text']}" for t in recent])
-    
-    text = agent_a.speak(
-        topic=state["topic"],
-        context=context,
-        seen_texts=state["seen_texts"],
-        round_num=current_round
-    )
+        context = _recent_context(state["transcript"])
+    
+    deadline = state.get("deadline")
+    # A tournament generates each persona's opening once per topic and hands it to every pairing
+    opening = (state.get("openings") or {}).get(persona) if not state["transcript"] else None
+    if opening:
+        log_event("opening_reused", {"agent": agent_id, "persona": persona, "round": current_round})
+        text = opening
+    elif is_cancelled():
+        # The caller gave up on this debate: finish the node without a backend call
+        log_event("debate_cancelled_skip", {"node": prefix, "round": current_round})
+        text = None
+    elif is_tight(deadline):
+        # Out of budget: skip the model and use the fallback text below
+        log_event("deadline_fallback", {"agent": agent_id, "round": current_round, "remaining_s": round(remaining(deadline), 3)})
+        text = None
+    else:
+        rounds_left = (state.get("max_rounds") or 8) - current_round + 1
+        with node_budget(round_slice(deadline, rounds_left)), backend_scope(state.get("backend")):
+            text = agent.speak(
+                topic=state["topic"],
+                context=context,
+                seen_texts=spoken,
+                round_num=current_round
+            )
+    # Claims and rebuttal target of a structured turn go into the transcript with its text
+    structured = agent.last_turn
     
     if text:
+        # Debug: log the generated text
+        log_event(f"{prefix}_generated", {
+            "round": current_round,
+            "text": text,
+            "text_length": len(text.split()),
+            "seen_texts_count": len(spoken)
+        })
+        
         # Validate the turn (returns cleaned text or None)
-        cleaned_text = validate_turn(text, state["seen_texts"], max_words=80)
+        cleaned_text = validate_turn(text, spoken, max_words=80)
         if cleaned_text:
             # Use cleaned text
             text = cleaned_text
         else:
             # Validation failed - try to use original text anyway (very lenient)
-            log_event("agent_a_validation_failed", {"round": current_round, "original_text": text})
+            log_event(f"{prefix}_validation_failed", {"round": current_round, "original_text": text})
             # Clean and use original text if it's reasonable
             original_text = text.strip().strip('\"\'` ')
             if len(original_text.split()) >= 3 and len(original_text.split()) <= 100:
@@ -78,221 +197,215 @@ def agent_a_node(state: DebateState) -> DebateState:
                 if not original_text[-1] in '.!?':
                     original_text += '.'
                 text = original_text
-                log_event("agent_a_using_original", {"round": current_round, "text": text})
+                log_event(f"{prefix}_using_original", {"round": current_round, "text": text})
             else:
                 # Last resort: generate unique context-aware fallback
                 prev_args = state.get("transcript", [])
-                prev_texts_list = state.get("seen_texts", [])
                 
                 # Generate a unique argument based on round and previous context
-                round_specific = ["emphasizing empirical evidence", "highlighting data-driven analysis", 
-                                 "focusing on safety protocols", "stressing rigorous testing",
-                                 "underlining risk assessment", "advocating for systematic validation",
-                                 "demonstrating scientific methodology", "showcasing evidence-based approach"]
-                
+                round_specific = style["hints"]
                 context_hint = round_specific[(current_round - 1) % len(round_specific)]
                 
                 if prev_args:
                     last_speaker = prev_args[-1].get("agent", "")
-                    if last_speaker == "AgentB":
-                        context_hint += " while responding to philosophical concerns"
+                    if last_speaker and last_speaker != agent_id:
+                        context_hint += style["responding"]
                 
                 # Create unique text that won't match previous ones
-                text = f"As {state['persona_a']}, I {context_hint}: {state['topic']} demands systematic evaluation based on empirical data and risk assessment in round {current_round}."
-                if not text.endswith(('.', '!', '?')):
-                    text += "."
-                log_event("agent_a_fallback_used", {"round": current_round, "fallback_text": text})
-        
-        # Add to transcript (always add, even if validation failed - debate must continue)
-        entry = {
-            "round": current_round,
-            "agent": "AgentA",
-            "persona": state["persona_a"],
-            "text": text,
-            "timestamp": datetime.now().isoformat()
-        }
-        state["transcript"].append(entry)
-        state["seen_texts"].append(text)
-        state["last_speaker"] = "AgentA"
-        state["last_text"] = text
-        
-        log_event("agent_a_speak", {
-            "round": current_round,
-            "persona": state["persona_a"],
-            "text": text
-        })
+                text = f"As {persona}, I {context_hint}: {state['topic']} {style['claim']} in round {current_round}."
+                structured = None
+                log_event(f"{prefix}_fallback_used", {"debate_id": current_debate(), "round": current_round,
+                                                      "fallback_text": text})
     else:
         # Generation failed - use fallback to ensure debate continues
-        log_event("agent_a_generation_failed", {"round": current_round})
-        text = f"As {state['persona_a']}, I argue that {state['topic']}. This perspective is crucial for round {current_round}."
-        if not text.endswith(('.', '!', '?')):
-            text += "."
-        log_event("agent_a_fallback_used", {"round": current_round, "fallback_text": text, "reason": "generation_failed"})
-        
-        # Add fallback to transcript
-        entry = {
-            "round": current_round,
-            "agent": "AgentA",
-            "persona": state["persona_a"],
-            "text": text,
-            "timestamp": datetime.now().isoformat()
-        }
-        state["transcript"].append(entry)
-        state["seen_texts"].append(text)
-        state["last_speaker"] = "AgentA"
-        state["last_text"] = text
+        log_event(f"{prefix}_generation_failed", {"round": current_round})
+        text = f"As {persona}, " + style["failed"].format(topic=state["topic"], round=current_round)
+        structured = None
+        log_event(f"{prefix}_fallback_used", {"debate_id": current_debate(), "round": current_round, "fallback_text": text,
+                                              "reason": "generation_failed"})
+    
+    # Add to transcript (always add, even if validation failed - debate must continue)
+    entry = Turn(current_round, agent_id, persona, text, time.time(),
+                 claims=structured["claims"] if structured else None,
+                 rebuttal_target=(structured["rebuttal_target"] or None) if structured else None)
+    state["transcript"].append(entry)
+    state["last_speaker"] = agent_id
+    state["last_text"] = text
+    _record_cache_use(state, agent, current_round, text)
+    # Score and condense the turn now, so the judge only has to total the notes at the end
+    state.setdefault("judge_notes", []).append(note_judge(state).note_turn(entry))
+    
+    log_event(f"{prefix}_speak", {
+        "debate_id": current_debate(),
+        "round": current_round,
+        "persona": persona,
+        "text": text
+    })
+    return entry
+
+
+def agent_a_node(state: DebateState) -> DebateState:
+    """AgentA's turn to speak - speaks in odd rounds (1, 3, 5, 7)"""
+    log_event("node_start", {"node": "agent_a", "debate_id": current_debate(), "state_before": state})
+    
+    # Round 1, 3, 5, 7 = AgentA's rounds
+    _take_turn(state, "AgentA", state["persona_a"], state["round"])
     
     # Switch to AgentB for next turn
     state["current_agent"] = "AgentB"
     
-    log_event("node_end", {"node": "agent_a", "state_after": state})
+    log_event("node_end", {"node": "agent_a", "debate_id": current_debate(), "state_after": state})
     return state
 
 
 def agent_b_node(state: DebateState) -> DebateState:
     """AgentB's turn to speak - speaks in even rounds (2, 4, 6, 8)"""
-    log_event("node_start", {"node": "agent_b", "state_before": state})
+    log_event("node_start", {"node": "agent_b", "debate_id": current_debate(), "state_before": state})
     
     # AgentB speaks in even rounds (2, 4, 6, 8)
-    # Round number should be even (2, 4, 6, 8)
     current_round = state["round"] + 1  # Increment to next round (even number)
-    
-    # Create AgentB instance
-    agent_b = Agent(state["persona_b"])
-    
-    # Generate argument
-    context = ""
-    if state["transcript"]:
-        # Get last 2 exchanges for context
-        recent = state["transcript"][-4:] if len(state["transcript"]) >= 4 else state["transcript"]
-        context = "\n".join([f"[{t['persona']}]: {t['text']}" for t in recent])
-    
-    text = agent_b.speak(
-        topic=state["topic"],
-        context=context,
-        seen_texts=state["seen_texts"],
-        round_num=current_round
-    )
-    
-    if text:
-        # Debug: log the generated text
-        log_event("agent_b_generated", {
-            "round": current_round,
-            "text": text,
-            "text_length": len(text.split()),
-            "seen_texts_count": len(state["seen_texts"])
-        })
-        
-        # Validate the turn (returns cleaned text or None)
-        cleaned_text = validate_turn(text, state["seen_texts"], max_words=80)
-        if cleaned_text:
-            # Use cleaned text
-            text = cleaned_text
-        else:
-            # Validation failed - try to use original text anyway (very lenient)
-            log_event("agent_b_validation_failed", {"round": current_round, "original_text": text})
-            # Clean and use original text if it's reasonable
-            original_text = text.strip().strip('\"\'` ')
-            if len(original_text.split()) >= 3 and len(original_text.split()) <= 100:
-                # Add punctuation if missing
-                if not original_text[-1] in '.!?':
-                    original_text += '.'
-                text = original_text
-                log_event("agent_b_using_original", {"round": current_round, "text": text})
-            else:
-                # Last resort: generate unique context-aware fallback
-                prev_args = state.get("transcript", [])
-                prev_texts_list = state.get("seen_texts", [])
-                
-                # Generate a unique argument based on round and previous context
-                round_specific = ["examining ethical implications", "questioning underlying values",
-                                 "exploring autonomy concerns", "analyzing societal impacts",
-                                 "considering moral dimensions", "evaluating philosophical foundations",
-                                 "reflecting on human dignity", "contemplating fundamental rights"]
-                
-                context_hint = round_specific[(current_round - 1) % len(round_specific)]
-                
-                if prev_args:
-                    last_speaker = prev_args[-1].get("agent", "")
-                    if last_speaker == "AgentA":
-                        context_hint += " while challenging empirical assumptions"
-                
-                # Create unique text that won't match previous ones
-                text = f"As {state['persona_b']}, I {context_hint}: {state['topic']} raises profound questions about human autonomy, ethical frameworks, and societal values in round {current_round}."
-                if not text.endswith(('.', '!', '?')):
-                    text += "."
-                log_event("agent_b_fallback_used", {"round": current_round, "fallback_text": text})
-        
-        # Add to transcript (always add, even if validation failed - debate must continue)
-        entry = {
-            "round": current_round,
-            "agent": "AgentB",
-            "persona": state["persona_b"],
-            "text": text,
-            "timestamp": datetime.now().isoformat()
-        }
-        state["transcript"].append(entry)
-        state["seen_texts"].append(text)
-        state["last_speaker"] = "AgentB"
-        state["last_text"] = text
-        
-        log_event("agent_b_speak", {
-            "round": current_round,
-            "persona": state["persona_b"],
-            "text": text
-        })
-    else:
-        # Generation failed - use fallback to ensure debate continues
-        log_event("agent_b_generation_failed", {"round": current_round})
-        text = f"As {state['persona_b']}, I counter that {state['topic']}. This alternative view is essential for round {current_round}."
-        if not text.endswith(('.', '!', '?')):
-            text += "."
-        log_event("agent_b_fallback_used", {"round": current_round, "fallback_text": text, "reason": "generation_failed"})
-        
-        # Add fallback to transcript
-        entry = {
-            "round": current_round,
-            "agent": "AgentB",
-            "persona": state["persona_b"],
-            "text": text,
-            "timestamp": datetime.now().isoformat()
-        }
-        state["transcript"].append(entry)
-        state["seen_texts"].append(text)
-        state["last_speaker"] = "AgentB"
-        state["last_text"] = text
+    _take_turn(state, "AgentB", state["persona_b"], current_round)
     
     # Increment round for next turn (will be odd, so AgentA speaks next)
     state["round"] = current_round + 1  # Set to next odd number for AgentA
     # Switch back to AgentA for next round
     state["current_agent"] = "AgentA"
     
-    log_event("node_end", {"node": "agent_b", "state_after": state})
+    log_event("node_end", {"node": "agent_b", "debate_id": current_debate(), "state_after": state})
+    return state
+
+
+# --- Panel (N-party) debates ---
+
+def next_speaker(state: DebateState) -> int:
+    """Scheduler: index of the participant who speaks in the current round (round robin)"""
+    return (state["round"] - 1) % len(state["participants"])
+
+
+def fan_out_openings(state: DebateState) -> List[Send]:
+    """Dispatch every participant's opening statement at once
+
+    Openings don't depend on each other, so they run as one parallel step.
+    """
+    return [
+        Send("opening_turn", {
+            "topic": state["topic"],
+            "persona": persona,
+            "agent": agent_id_for(index),
+            "round": index + 1,
+            "use_cache": state.get("cache_stats") is not None,
+            "deadline": state.get("deadline"),
+            "max_rounds": state.get("max_rounds"),
+            "participants": state["participants"]
+        })
+        for index, persona in enumerate(state["participants"])
+    ]
+
+
+def opening_turn_node(task: dict) -> dict:
+    """One participant's opening statement (runs concurrently with the others)"""
+    log_event("node_start", {"node": "opening_turn", "agent": task["agent"], "debate_id": current_debate(),
+                             "round": task["round"]})
+    
+    # Private scratch state: openings never see each other
+    scratch = {
+        "topic": task["topic"],
+        "transcript": [],
+        "cache_stats": {"lookups": 0, "reuse": 0, "seed": 0, "miss": 0} if task["use_cache"] else None,
+        "deadline": task.get("deadline"),
+        "max_rounds": task.get("max_rounds"),
+        "participants": task.get("participants")
+    }
+    entry = _take_turn(scratch, task["agent"], task["persona"], task["round"])
+    if scratch["cache_stats"] and scratch["cache_stats"]["lookups"]:
+        # Carried to collect_openings, which folds it into the debate's counters
+        entry.cache = next(kind for kind in ("reuse", "seed", "miss") if scratch["cache_stats"][kind])
+    
+    log_event("node_end", {"node": "opening_turn", "agent": task["agent"], "debate_id": current_debate(),
+                           "entry": entry})
+    return {"transcript": [entry], "judge_notes": scratch["judge_notes"]}
+
+
+def generate_opening(topic: str, persona: str, argument_cache: bool = False) -> str:
+    """An opening argument for persona, exactly as it would open a two-agent debate
+
+    Round 1 sees no transcript, so the text does not depend on the opponent and
+    can be passed to run_langgraph_debate(openings=...) for any pairing.
+    """
+    scratch = {
+        "topic": topic,
+        "transcript": [],
+        "cache_stats": {"lookups": 0, "reuse": 0, "seed": 0, "miss": 0} if argument_cache else None,
+        "deadline": None
+    }
+    return _take_turn(scratch, "AgentA", persona, 1)["text"]
+
+
+def collect_openings_node(state: DebateState) -> DebateState:
+    """Join point after the opening fan-out: rebuild derived fields and advance the round"""
+    log_event("node_start", {"node": "collect_openings", "debate_id": current_debate(), "state_before": state})
+    
+    stats = state.get("cache_stats")
+    for entry in state["transcript"]:
+        if stats is not None and entry.cache:
+            stats["lookups"] += 1
+            stats[entry.cache] += 1
+            entry.cache = None
+    
+    last = state["transcript"][-1]
+    state["last_speaker"] = last["agent"]
+    state["last_text"] = last["text"]
+    state["round"] = len(state["participants"]) + 1
+    state["current_agent"] = agent_id_for(next_speaker(state))
+    
+    log_event("node_end", {"node": "collect_openings", "debate_id": current_debate(), "state_after": state})
+    return state
+
+
+def panel_turn_node(state: DebateState) -> DebateState:
+    """Generic turn node: whoever the scheduler picks speaks this round"""
+    log_event("node_start", {"node": "panel_turn", "debate_id": current_debate(), "state_before": state})
+    
+    index = next_speaker(state)
+    _take_turn(state, agent_id_for(index), state["participants"][index], state["round"])
+    state["round"] += 1
+    state["current_agent"] = agent_id_for(next_speaker(state))
+    
+    log_event("node_end", {"node": "panel_turn", "debate_id": current_debate(), "state_after": state})
     return state
 
 
 def memory_node(state: DebateState) -> DebateState:
     """Updates memory and generates summaries"""
-    log_event("node_start", {"node": "memory", "state_before": state})
+    log_event("node_start", {"node": "memory", "debate_id": current_debate(), "state_before": state})
     
     memory = MemoryNode()
     
+    deadline = state.get("deadline")
     # Update memory with new transcript entries
-    if state["transcript"]:
-        memory.update(state["transcript"])
-        
-        # Generate summary
+    if state["transcript"] and is_cancelled():
+        log_event("debate_cancelled_skip", {"node": "memory", "round": state["round"]})
+    elif state["transcript"] and is_tight(deadline):
+        # Summaries are the first thing dropped when the deadline is close
+        log_event("deadline_skip_summary", {"round": state["round"], "remaining_s": round(remaining(deadline), 3)})
+    elif state["transcript"]:
+        # update() is what calls the model for the summary, so it runs inside the node's budget
+        rounds_left = (state.get("max_rounds") or 8) - state["round"] + 1
+        with node_budget(round_slice(deadline, rounds_left)), backend_scope(state.get("backend")):
+            memory.update(state["transcript"])
         summary = memory.get_summary()
         if summary:
+            if not summary.startswith("Error"):
+                state["memory_summary"] = summary
             log_event("memory_summary", {"summary": summary, "round": state["round"]})
     
-    log_event("node_end", {"node": "memory", "state_after": state})
+    log_event("node_end", {"node": "memory", "debate_id": current_debate(), "state_after": state})
     return state
 
 
 def validator_node(state: DebateState) -> DebateState:
     """Validates the debate state and ensures logical coherence"""
-    log_event("node_start", {"node": "validator", "state_before": state})
+    log_event("node_start", {"node": "validator", "debate_id": current_debate(), "state_before": state})
     
     # Don't stop on errors - log them but continue the debate
     if state.get("error"):
@@ -320,27 +433,53 @@ def validator_node(state: DebateState) -> DebateState:
                 "action": "continuing_debate"
             })
             # Don't set error - just log it and continue
+    
+    # Optional early termination once recent turns stop adding new content
+    if state.get("convergence") and not state.get("converged_at"):
+        check_convergence(state)
         
-    log_event("node_end", {"node": "validator", "state_after": state})
+    log_event("node_end", {"node": "validator", "debate_id": current_debate(), "state_after": state})
     return state
 
 
+def check_convergence(state: DebateState) -> bool:
+    """Mark the debate converged when the last `window` turns all scored below the novelty threshold
+
+    Novelty is the share of a turn's content words not used by any earlier turn.
+    Nothing is checked before min_rounds have been completed.
+    """
+    policy = state["convergence"]
+    transcript = state["transcript"]
+    completed = len(transcript)
+    if completed < max(policy["min_rounds"], policy["window"] + 1):
+        return False
+    texts = [entry["text"] for entry in transcript]
+    novelty = [round(turn_novelty(texts[i], texts[:i]), 3) for i in range(completed - policy["window"], completed)]
+    log_event("convergence_check", {"round": completed, "novelty": novelty, "threshold": policy["threshold"]})
+    if max(novelty) >= policy["threshold"]:
+        return False
+    state["converged_at"] = completed
+    log_event("debate_converged", {"round": completed, "novelty": novelty})
+    return True
+
+
 def judge_node(state: DebateState) -> DebateState:
     """Reviews memory and all argument nodes, produces summary and declares winner"""
-    log_event("node_start", {"node": "judge", "state_before": state})
+    log_event("node_start", {"node": "judge", "debate_id": current_debate(), "state_before": state})
     
-    judge = JudgeNode()
+    if is_cancelled():
+        # Nobody waits for the rationale any more; score without the model
+        log_event("debate_cancelled_skip", {"node": "judge", "round": state["round"]})
+        state = deadline_verdict(state)
+        log_event("node_end", {"node": "judge", "debate_id": current_debate(), "state_after": state})
+        return state
     
-    # Review the debate - pass topic if available in transcript entries or use state topic
-    transcript_for_judge = state["transcript"]
-    # Add topic to transcript entries if not present (for judge's use)
-    if transcript_for_judge and len(transcript_for_judge) > 0:
-        for entry in transcript_for_judge:
-            if "topic" not in entry:
-                entry = entry.copy()
-                entry["topic"] = state.get("topic", "the debate topic")
+    judge = JudgeNode(panel=bool(state.get("participants")))
     
-    result = judge.review(state["transcript"], state["persona_a"], state["persona_b"], state.get("topic", ""))
+    # Review the debate; the topic is passed separately since turns don't carry it
+    with node_budget(judge_slice(state.get("deadline"))):
+        result = judge.review(state["transcript"], state["persona_a"], state["persona_b"], state.get("topic", ""),
+                              notes=state.get("judge_notes"))
     
     if result:
         state["winner"] = result["winner"]
@@ -349,16 +488,97 @@ def judge_node(state: DebateState) -> DebateState:
         
         log_event("judge_review_end", {
             "winner": result["winner"],
-            "rationale": result["rationale"]
+            "rationale": result["rationale"],
+            "scores": result.get("scores")
         })
     else:
         state["error"] = "Judge failed to review debate"
         log_event("judge_review_failed", {"round": state["round"]})
     
-    log_event("node_end", {"node": "judge", "state_after": state})
+    log_event("node_end", {"node": "judge", "debate_id": current_debate(), "state_after": state})
+    return state
+
+
+def fan_out_judges(state: DebateState):
+    """Route to the single judge, or fan out one judge_worker per panel judge"""
+    panel = state.get("judge_panel")
+    if not panel:
+        return "judge"
+    return [
+        Send("judge_worker", {
+            "judge": name,
+            "transcript": state["transcript"],
+            "persona_a": state["persona_a"],
+            "persona_b": state["persona_b"],
+            "topic": state.get("topic", ""),
+            "notes": state.get("judge_notes"),
+            "panel": bool(state.get("participants")),
+            "deadline": state.get("deadline")
+        })
+        for name in panel["judges"]
+    ]
+
+
+def judge_worker_node(task: dict) -> dict:
+    """One panel judge reviewing the debate independently (runs in parallel with the others)"""
+    name = task["judge"]
+    log_event("node_start", {"node": "judge_worker", "judge": name, "debate_id": current_debate()})
+    if is_cancelled():
+        log_event("debate_cancelled_skip", {"node": "judge_worker", "judge": name})
+        # No update: an empty list would reset the channel and drop the other judges' results
+        return {}
+    with node_budget(judge_slice(task.get("deadline"))):
+        result = make_judge(name, panel=task.get("panel", False)).review(task["transcript"], task["persona_a"], task["persona_b"], task["topic"],
+                                         notes=task.get("notes"))
+    if not result:
+        log_event("judge_review_failed", {"judge": name})
+        log_event("node_end", {"node": "judge_worker", "judge": name, "debate_id": current_debate()})
+        return {}
+    result["judge"] = name
+    result["winner_agent"] = result["winner"].rsplit("(", 1)[-1].rstrip(")")
+    log_event("judge_worker_end", {"judge": name, "winner": result["winner"], "scores": result["scores"]})
+    log_event("node_end", {"node": "judge_worker", "judge": name, "debate_id": current_debate()})
+    return {"judge_results": [result]}
+
+
+def judge_aggregate_node(state: DebateState) -> DebateState:
+    """Combines the panel judges' results into the final verdict"""
+    log_event("node_start", {"node": "judge_aggregate", "debate_id": current_debate()})
+    results = state.get("judge_results") or []
+    if not results:
+        state["error"] = "Judge panel failed to review debate"
+        log_event("judge_review_failed", {"round": state["round"]})
+        return state
+    
+    personas = {"AgentA": state["persona_a"], "AgentB": state["persona_b"]}
+    for entry in state["transcript"]:
+        personas.setdefault(entry["agent"], entry["persona"])
+    verdict = aggregate_verdicts(results, personas, (state.get("judge_panel") or {}).get("aggregation", "majority"))
+    verdict["panel"] = [{k: r[k] for k in ("judge", "winner", "scores")} for r in results]
+    
+    state["winner"] = verdict["winner"]
+    state["rationale"] = verdict["rationale"]
+    state["summary"] = verdict
+    log_event("judge_panel_verdict", {"winner": verdict["winner"], "votes": verdict["votes"],
+                                      "scores": verdict["scores"], "method": verdict["method"]})
+    log_event("node_end", {"node": "judge_aggregate", "debate_id": current_debate()})
     return state
 
 
+def route_after_validator(state: DebateState):
+    """Two-agent routing after validator, sending finished debates to the judge(s)"""
+    if should_continue_after_validator(state) == "judge":
+        return fan_out_judges(state)
+    return "agent_a"
+
+
+def route_after_panel_validator(state: DebateState):
+    """Panel routing after validator, sending finished debates to the judge(s)"""
+    if should_continue_panel(state) == "judge":
+        return fan_out_judges(state)
+    return "panel_turn"
+
+
 def should_continue_debate(state: DebateState) -> Literal["agent_b", "memory", "judge"]:
     """Conditional routing function to determine if debate should continue"""
     # Check for errors
@@ -381,20 +601,36 @@ def should_continue_after_validator(state: DebateState) -> Literal["agent_a", "j
     # Check if we've completed 8 rounds
     # After AgentB speaks in round 8, round becomes 9
     # We want 8 rounds total: 1(A), 2(B), 3(A), 4(B), 5(A), 6(B), 7(A), 8(B)
-    # When round > 8, we've completed all 8 rounds
-    if state["round"] > 8:
+    # When round > 8, we've completed all 8 rounds (a fork may set its own max_rounds)
+    max_rounds = state.get("max_rounds") or 8
+    if state["round"] > max_rounds:
+        return "judge"
+    
+    # Stop early once the convergence policy fired or the deadline is close
+    if state.get("converged_at") or is_tight(state.get("deadline")):
         return "judge"
     
     # Check if we have 8 entries in transcript (safety check)
-    if len(state.get("transcript", [])) >= 8:
+    if len(state.get("transcript", [])) >= max_rounds:
         return "judge"
     
     # Continue with AgentA for next round
     return "agent_a"
 
 
+def should_continue_panel(state: DebateState) -> Literal["panel_turn", "judge"]:
+    """Conditional routing after validator in panel debates"""
+    if state["round"] > (state.get("max_rounds") or 8) or is_tight(state.get("deadline")):
+        return "judge"
+    # Convergence ends a panel debate only after a whole cycle, so every panelist spoke equally often
+    if state.get("converged_at") and next_speaker(state) == 0:
+        return "judge"
+    return "panel_turn"
+
+
 # Cache the compiled graph to avoid recreating it every time
 _graph_cache = None
+_panel_graph_cache = None
 
 def create_debate_graph() -> CompiledStateGraph:
     """Creates and compiles the LangGraph debate workflow"""
@@ -414,6 +650,8 @@ def create_debate_graph() -> CompiledStateGraph:
     workflow.add_node("memory", memory_node)
     workflow.add_node("validator", validator_node)
     workflow.add_node("judge", judge_node)
+    workflow.add_node("judge_worker", judge_worker_node)
+    workflow.add_node("judge_aggregate", judge_aggregate_node)
     
     # Set entry point
     workflow.set_entry_point("user_input")
@@ -433,18 +671,17 @@ def create_debate_graph() -> CompiledStateGraph:
     # Conditional routing from validator
     workflow.add_conditional_edges(
         "validator",
-        should_continue_after_validator,
-        {
-            "agent_a": "agent_a",
-            "judge": "judge"
-        }
+        route_after_validator,
+        ["agent_a", "judge", "judge_worker"]
     )
     
-    # Judge to END
+    # Judge (or the aggregated judge panel) to END
     workflow.add_edge("judge", END)
+    workflow.add_edge("judge_worker", "judge_aggregate")
+    workflow.add_edge("judge_aggregate", END)
     
     # Compile the graph
-    memory = MemorySaver()
+    memory = BoundedMemorySaver()
     app = workflow.compile(checkpointer=memory)
     
     # Cache the compiled graph
@@ -453,12 +690,242 @@ def create_debate_graph() -> CompiledStateGraph:
     return app
 
 
-def run_langgraph_debate(topic: str, persona_a: str, persona_b: str, console=None) -> Dict[str, Any]:
-    """Execute the LangGraph debate workflow with progressive updates"""
-    log_event("langgraph_debate_start", {"topic": topic, "persona_a": persona_a, "persona_b": persona_b})
+def create_panel_graph() -> CompiledStateGraph:
+    """Creates and compiles the N-party panel workflow
+
+    user_input fans out one opening_turn per participant in a single parallel
+    step, collect_openings joins them, then panel_turn lets the scheduler pick
+    the next speaker until max_rounds is reached.
+    """
+    global _panel_graph_cache
+    
+    if _panel_graph_cache is not None:
+        return _panel_graph_cache
+    
+    workflow = StateGraph(DebateState)
+    
+    workflow.add_node("user_input", user_input_node)
+    workflow.add_node("opening_turn", opening_turn_node)
+    workflow.add_node("collect_openings", collect_openings_node)
+    workflow.add_node("panel_turn", panel_turn_node)
+    workflow.add_node("memory", memory_node)
+    workflow.add_node("validator", validator_node)
+    workflow.add_node("judge", judge_node)
+    workflow.add_node("judge_worker", judge_worker_node)
+    workflow.add_node("judge_aggregate", judge_aggregate_node)
+    
+    workflow.set_entry_point("user_input")
+    
+    # Concurrent opening statements
+    workflow.add_conditional_edges("user_input", fan_out_openings, ["opening_turn"])
+    workflow.add_edge("opening_turn", "collect_openings")
+    workflow.add_edge("collect_openings", "memory")
+    
+    # Scheduled turns
+    workflow.add_edge("panel_turn", "memory")
+    workflow.add_edge("memory", "validator")
+    workflow.add_conditional_edges(
+        "validator",
+        route_after_panel_validator,
+        ["panel_turn", "judge", "judge_worker"]
+    )
+    workflow.add_edge("judge", END)
+    workflow.add_edge("judge_worker", "judge_aggregate")
+    workflow.add_edge("judge_aggregate", END)
+    
+    app = workflow.compile(checkpointer=BoundedMemorySaver())
+    _panel_graph_cache = app
+    return app
+
+
+# Nodes whose updates carry a freshly spoken turn
+TURN_NODES = ["agent_a", "agent_b", "opening_turn", "panel_turn"]
+# Nodes whose updates carry the final verdict
+VERDICT_NODES = ["judge", "judge_aggregate"]
+AGENT_COLORS = {"AgentA": "green", "AgentB": "yellow"}
+PANEL_COLORS = ["cyan", "magenta", "blue", "red", "bright_green", "bright_yellow"]
+
+
+def agent_color(agent: str) -> str:
+    """Console color for an agent id (AgentC and later cycle through PANEL_COLORS)"""
+    if agent in AGENT_COLORS:
+        return AGENT_COLORS[agent]
+    return PANEL_COLORS[(ord(agent[-1]) - ord("C")) % len(PANEL_COLORS)]
+
+
+def configured_judge_panel(judges: Optional[List[str]] = None, aggregation: Optional[str] = None) -> Optional[dict]:
+    """Judge panel settings from arguments or the environment; None means the single judge"""
+    if judges is None:
+        judges = [j.strip() for j in os.getenv("DEBATOR_JUDGE_PANEL", "").split(",") if j.strip()]
+    if not judges:
+        return None
+    unknown = [j for j in judges if j not in JUDGE_PROFILES]
+    if unknown:
+        raise ValueError(f"Unknown judge profile(s): {', '.join(unknown)} (choose from {', '.join(JUDGE_PROFILES)})")
+    aggregation = aggregation or os.getenv("DEBATOR_JUDGE_AGGREGATION", "majority")
+    if aggregation not in ("majority", "weighted"):
+        raise ValueError(f"Unknown judge aggregation: {aggregation}")
+    return {"judges": list(dict.fromkeys(judges)), "aggregation": aggregation}
+
+
+def configured_convergence(enabled: Optional[bool] = None) -> Optional[dict]:
+    """Convergence policy from DEBATOR_CONVERGENCE* settings; None keeps the full round count"""
+    if enabled is None:
+        enabled = os.getenv("DEBATOR_CONVERGENCE", "").lower() in ("1", "true", "yes")
+    if not enabled:
+        return None
+    return {
+        "threshold": float(os.getenv("DEBATOR_CONVERGENCE_THRESHOLD", "0.3")),
+        "window": int(os.getenv("DEBATOR_CONVERGENCE_WINDOW", "2")),
+        "min_rounds": int(os.getenv("DEBATOR_MIN_ROUNDS", "4"))
+    }
+
+
+def early_termination_savings(final_state: dict, planned_rounds: int, panel: bool) -> dict:
+    """Rounds and LLM calls a converged debate did not spend
+
+    Each skipped round is one agent call; memory summarises after every panel
+    turn but only after each AgentA/AgentB pair in the two-agent graph.
+    """
+    rounds_run = len(final_state.get("transcript", []))
+    rounds_saved = max(0, planned_rounds - rounds_run)
+    summaries_saved = rounds_saved if panel else rounds_saved // 2
+    return {
+        "rounds_run": rounds_run,
+        "rounds_planned": planned_rounds,
+        "rounds_saved": rounds_saved,
+        "llm_calls_saved": rounds_saved + summaries_saved
+    }
+
+
+def _scoped(stream, debate_id):
+    """Iterate stream with its backend requests attributed to debate_id (fair queuing under the rate limit)"""
+    iterator = iter(stream)
+    while True:
+        with debate_scope(debate_id):
+            try:
+                event = next(iterator)
+            except StopIteration:
+                return
+        yield event
+
+
+def _stream_within(stream, deadline):
+    """Yield graph events, giving up once the debate's deadline has passed
+
+    The graph runs on a daemon thread so that a request stuck past its own
+    timeout cannot hold the caller beyond the deadline. On expiry the debate is
+    cancelled: the graph stops after the running node, which makes no further
+    backend requests (nodes check is_cancelled()).
+    """
+    if not deadline:
+        yield from stream
+        return
+    events = queue.Queue()
+    # The graph thread keeps the caller's context (debate log, rate-limit scope) plus a cancellation event
+    context = contextvars.copy_context()
+    cancelled = context.run(bind_cancellation)
+    
+    def pump():
+        try:
+            for event in stream:
+                if cancelled.is_set():
+                    break
+                events.put(("event", event))
+            events.put(("done", None))
+        except Exception as e:
+            events.put(("error", e))
+        finally:
+            # Closing the stream keeps LangGraph from scheduling the next step
+            stream.close()
+    
+    threading.Thread(target=context.run, args=(pump,), name="debate-graph", daemon=True).start()
+    while True:
+        try:
+            kind, item = events.get(timeout=max(0.0, remaining(deadline)))
+        except queue.Empty:
+            cancelled.set()
+            log_event("deadline_exceeded", {"budget_s": deadline["budget_s"]})
+            return
+        if kind == "done":
+            return
+        if kind == "error":
+            raise item
+        yield item
+
+
+def live_standings(notes) -> Dict[str, dict]:
+    """Running keyword score per agent from the judge's notes, leader first"""
+    standings = {}
+    for note in notes:
+        entry = standings.setdefault(note["agent"], {"persona": note["persona"], "score": 0.0, "turns": 0})
+        entry["score"] += note["score"]
+        entry["turns"] += 1
+    return dict(sorted(standings.items(), key=lambda item: (-item[1]["score"], item[0])))
+
+
+def deadline_verdict(state: dict) -> dict:
+    """Keyword-score verdict without a rationale call, for debates that ran out of time"""
+    transcript = state.get("transcript") or []
+    if not transcript:
+        state["error"] = "Debate deadline exceeded before any round finished"
+        return state
+    personas = {entry["agent"]: entry["persona"] for entry in transcript}
+    scores = JudgeNode(panel=bool(state.get("participants")))._calculate_scores(transcript)
+    winner = None
+    for agent in sorted(scores):
+        if winner is None or scores[agent] >= scores[winner]:
+            winner = agent
+    state["winner"] = f"{personas.get(winner, winner)} ({winner})"
+    state["rationale"] = (f"The debate reached its deadline before the judge finished; "
+                          f"{personas.get(winner, winner)} wins on argument keyword scores.")
+    state["summary"] = {"winner": state["winner"], "rationale": state["rationale"], "scores": scores}
+    log_event("deadline_verdict", {"winner": state["winner"], "scores": scores, "rounds": len(transcript)})
+    return state
+
+
+def _turn_starting(node_name: str, task_input: dict):
+    """(round, agent, persona) of the turn a scheduled turn node is about to speak"""
+    if node_name == "opening_turn":
+        return task_input["round"], task_input["agent"], task_input["persona"]
+    if node_name == "agent_a":
+        return task_input["round"], "AgentA", task_input["persona_a"]
+    if node_name == "agent_b":
+        return task_input["round"] + 1, "AgentB", task_input["persona_b"]
+    index = next_speaker(task_input)
+    return task_input["round"], agent_id_for(index), task_input["participants"][index]
+
+
+def stream_debate(topic: str, persona_a: str, persona_b: str, thread_id: str = "debate-thread-1",
+                  argument_cache: Optional[bool] = None,
+                  participants: Optional[List[str]] = None, max_rounds: int = 8,
+                  judges: Optional[List[str]] = None, judge_aggregation: Optional[str] = None,
+                  convergence: Optional[bool] = None, deadline_s: Optional[float] = None,
+                  openings: Optional[Dict[str, str]] = None,
+                  resume: Optional[Dict[str, Any]] = None) -> Iterator[DebateEvent]:
+    """Run a debate, yielding typed events (see debate_events.py) as it progresses
+
+    The last event is always DebateFinished, whose final_state is what
+    run_langgraph_debate returns. Arguments are as for run_langgraph_debate.
+    resume ({"values", "as_node"} from forking.fork_state) seeds the thread with
+    a state part-way through a debate, as if as_node had just run, and only the
+    remaining rounds are generated.
+    """
+    if argument_cache is None:
+        argument_cache = cache_enabled()
+    judge_panel = configured_judge_panel(judges, judge_aggregation)
+    convergence_policy = configured_convergence(convergence)
+    deadline = configured_deadline(deadline_s)
+    panel = bool(participants) and len(participants) > 2
+    if panel:
+        persona_a, persona_b = participants[0], participants[1]
+        max_rounds = panel_rounds(max_rounds, len(participants))
+    log_event("langgraph_debate_start", {"debate_id": thread_id, "topic": topic, "persona_a": persona_a,
+                                         "persona_b": persona_b, "participants": participants if panel else None,
+                                         "thread_id": thread_id})
     
     # Create the graph
-    app = create_debate_graph()
+    app = create_panel_graph() if panel else create_debate_graph()
     
     # Initialize state
     initial_state = DebateState(
@@ -467,68 +934,126 @@ def run_langgraph_debate(topic: str, persona_a: str, persona_b: str, console=Non
         persona_b=persona_b,
         round=1,
         transcript=[],
-        seen_texts=[],
         current_agent="AgentA",
         winner=None,
         rationale=None,
         error=None,
         last_speaker=None,
-        last_text=None
+        last_text=None,
+        cache_stats={"lookups": 0, "reuse": 0, "seed": 0, "miss": 0} if argument_cache else None,
+        participants=list(participants) if panel else None,
+        max_rounds=max_rounds if panel else None,
+        judge_panel=judge_panel,
+        judge_results=[],
+        judge_notes=[],
+        convergence=convergence_policy,
+        converged_at=None,
+        deadline=deadline,
+        openings=openings if not panel else None,
+        memory_summary=None,
+        backend=None,
+        prompt_guidance=None,
+        fork=None
     )
+    if resume:
+        initial_state.update(resume["values"])
+    yield DebateStarted(topic, list(participants) if panel else [persona_a, persona_b], thread_id)
     
-    # Track displayed rounds to avoid duplicates
-    displayed_rounds = set()
+    # Track announced and accepted rounds to avoid duplicates
+    started_rounds = set()
+    accepted_rounds = set()
+    verdict_sent = False
     
     # Run the graph with streaming for progressive updates
     try:
         config = {
-            "recursion_limit": 50,
-            "configurable": {"thread_id": "debate-thread-1"}
+            "recursion_limit": max(50, max_rounds * 4 + 10),
+            "configurable": {"thread_id": thread_id}
         }
         
-        # Use stream to get progressive updates
         final_state = None
-        for event in app.stream(initial_state, config=config, stream_mode="updates"):
+        notes_seen = {}
+        summary_seen = None
+        graph_input = initial_state
+        if resume:
+            # A fork starts from its copied prefix: the graph picks up after as_node
+            app.update_state(config, initial_state, as_node=resume["as_node"])
+            graph_input = None
+        # "tasks" announces each node as it is scheduled; "updates" carries its result
+        stream = _scoped(app.stream(graph_input, config=config, stream_mode=["updates", "tasks"]), thread_id)
+        for mode, chunk in _stream_within(stream, deadline):
+            if mode == "tasks":
+                if chunk.get("name") in TURN_NODES and "input" in chunk:
+                    round_num, agent, persona = _turn_starting(chunk["name"], chunk["input"])
+                    if round_num not in started_rounds:
+                        started_rounds.add(round_num)
+                        yield RoundStarted(round_num, agent, persona)
+                continue
             # Get the state after each node execution
-            for node_name, state in event.items():
-                # Display rounds as they complete (after agent nodes)
-                if node_name in ["agent_a", "agent_b"] and state.get("transcript"):
+            for node_name, state in chunk.items():
+                if not isinstance(state, dict):
+                    continue
+                for note in state.get("judge_notes") or []:
+                    notes_seen[(note["round"], note["agent"])] = note
+                # Announce rounds as they complete (after agent nodes)
+                if node_name in TURN_NODES and state.get("transcript"):
                     # Find the latest transcript entry
                     latest_entry = state["transcript"][-1]
                     round_num = latest_entry["round"]
                     
-                    # Only display if we haven't shown this round yet
-                    if round_num not in displayed_rounds:
-                        displayed_rounds.add(round_num)
-                        if console:
-                            agent = latest_entry["agent"]
-                            persona = latest_entry["persona"]
-                            text = latest_entry["text"]
-                            color = "green" if agent == "AgentA" else "yellow"
-                            
-                            from rich.rule import Rule
-                            from rich.panel import Panel
-                            console.print(Rule(f"Round {round_num}", style="bold blue"))
-                            console.print(Panel(text, title=f"[bold {color}]{persona}[/bold {color}]", border_style=color))
-                            console.print()  # Add spacing between rounds
+                    # Only announce if we haven't yet
+                    if round_num not in accepted_rounds:
+                        accepted_rounds.add(round_num)
+                        yield TurnAccepted(**latest_entry.to_dict())
+                        # Live standings from the judge's running notes
+                        yield StandingsUpdated(round_num, live_standings(notes_seen.values()))
+                
+                if node_name == "memory" and state.get("memory_summary") and state["memory_summary"] != summary_seen:
+                    summary_seen = state["memory_summary"]
+                    yield MemoryUpdated(len(state.get("transcript") or []), summary_seen)
                 
-                # Display judge decision when judge node completes
-                if node_name == "judge" and state.get("winner") and console:
-                    console.print()
-                    console.print(Rule("Judge's Verdict", style="bold magenta"))
+                if node_name in VERDICT_NODES:
+                    verdict_sent = True
+                    yield Verdict(state.get("winner"), state.get("rationale"), state.get("error"))
                 
                 # Update final state
                 final_state = state
         
+        # Overran the deadline: take the last checkpoint and score it without the LLM
+        if deadline and remaining(deadline) <= 0 and not (final_state or {}).get("winner"):
+            final_state = deadline_verdict(dict(app.get_state(config).values or initial_state))
+        
         # If streaming didn't work, fall back to invoke
         if final_state is None:
             final_state = app.invoke(initial_state, config=config)
         
-        log_event("langgraph_debate_end", {"final_state": final_state})
-        return final_state
+        if not verdict_sent and final_state.get("winner"):
+            yield Verdict(final_state.get("winner"), final_state.get("rationale"), final_state.get("error"))
+        
+        stats = final_state.get("cache_stats") if final_state else None
+        if stats:
+            stats["hit_rate"] = round((stats["reuse"] + stats["seed"]) / stats["lookups"], 3) if stats["lookups"] else 0.0
+            log_event("argument_cache_stats", stats)
+        
+        hedging = hedge_stats()
+        if hedging:
+            log_event("hedge_stats", hedging)
+        rate_limits = scheduler_stats()
+        if rate_limits:
+            log_event("rate_scheduler_stats", rate_limits)
+        
+        if convergence_policy:
+            savings = early_termination_savings(final_state, initial_state["max_rounds"] or 8, panel)
+            final_state["early_termination"] = savings
+            log_event("early_termination", {"converged_at": final_state.get("converged_at"), **savings})
+        
+        # The finished thread is kept for inspection until newer debates push it out
+        app.checkpointer.mark_finished(thread_id)
+        
+        log_event("langgraph_debate_end", {"debate_id": thread_id, "final_state": final_state})
     except Exception as e:
         log_event("langgraph_debate_error", {"error": str(e)})
-        return {
+        final_state = {
             "error": f"LangGraph execution failed: {str(e)}",
             "topic": topic,
             "persona_a": persona_a,
@@ -537,6 +1062,104 @@ def run_langgraph_debate(topic: str, persona_a: str, persona_b: str, console=Non
             "winner": None,
             "rationale": None
         }
+    yield DebateFinished(final_state)
+
+
+async def astream_debate(topic: str, persona_a: str, persona_b: str, **options) -> AsyncIterator[DebateEvent]:
+    """stream_debate as an async generator; the graph runs on a worker thread, not the event loop
+
+    The caller's context (debate log, rate-limit scope) goes with it.
+    """
+    loop = asyncio.get_running_loop()
+    events = stream_debate(topic, persona_a, persona_b, **options)
+    context = contextvars.copy_context()
+    done = object()
+    try:
+        while True:
+            event = await loop.run_in_executor(None, context.run, next, events, done)
+            if event is done:
+                return
+            yield event
+    finally:
+        await loop.run_in_executor(None, context.run, events.close)
+
+
+def render_event(console, event: DebateEvent) -> None:
+    """The rich console view of a debate: one consumer of stream_debate"""
+    from rich.rule import Rule
+    from rich.panel import Panel
+    if isinstance(event, TurnAccepted):
+        color = agent_color(event.agent)
+        console.print(Rule(f"Round {event.round}", style="bold blue"))
+        console.print(Panel(event.text, title=f"[bold {color}]{event.persona}[/bold {color}]", border_style=color))
+    elif isinstance(event, StandingsUpdated):
+        console.print("[dim]Standings: " + " · ".join(
+            f"{s['persona']} {s['score']:.1f}" for s in event.standings.values()) + "[/dim]")
+        console.print()  # Add spacing between rounds
+    elif isinstance(event, Verdict) and event.winner:
+        console.print()
+        console.print(Rule("Judge's Verdict", style="bold magenta"))
+    elif isinstance(event, DebateFinished):
+        stats = event.final_state.get("cache_stats")
+        if stats:
+            console.print(f"[dim]Argument cache: {stats['reuse']} reused, {stats['seed']} seeded, "
+                          f"{stats['miss']} missed (hit rate {stats['hit_rate']:.0%})[/dim]")
+        savings = event.final_state.get("early_termination")
+        if savings and savings["rounds_saved"]:
+            console.print(f"[dim]Debate converged after {savings['rounds_run']} rounds: "
+                          f"{savings['rounds_saved']} rounds and {savings['llm_calls_saved']} LLM calls saved[/dim]")
+
+
+# on_event names kept from before the typed events
+CALLBACK_EVENTS = {TurnAccepted: "round", StandingsUpdated: "standings", Verdict: "verdict"}
+
+
+def run_langgraph_debate(topic: str, persona_a: str, persona_b: str, console=None,
+                         thread_id: str = "debate-thread-1", on_event=None,
+                         argument_cache: Optional[bool] = None,
+                         participants: Optional[List[str]] = None, max_rounds: int = 8,
+                         judges: Optional[List[str]] = None, judge_aggregation: Optional[str] = None,
+                         convergence: Optional[bool] = None, deadline_s: Optional[float] = None,
+                         openings: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Execute the LangGraph debate workflow with progressive updates
+
+    A consumer of stream_debate that renders to console and returns the final
+    state.
+    thread_id keys the checkpointer, so concurrent debates must use distinct ids.
+    on_event, if given, is called as on_event(event_type, payload) for each
+    completed round ("round"), for the live standings after it ("standings")
+    and for the judge's decision ("verdict").
+    argument_cache turns the opening-argument cache on or off; None follows
+    DEBATOR_ARGUMENT_CACHE.
+    participants with more than two personas runs a panel debate (concurrent
+    openings, then round-robin turns up to max_rounds); persona_a/persona_b are
+    then taken from the first two participants.
+    judges names a panel of JUDGE_PROFILES that review the finished debate in
+    parallel; their verdicts are combined by judge_aggregation ("majority" or
+    "weighted"). Both default to DEBATOR_JUDGE_PANEL / DEBATOR_JUDGE_AGGREGATION.
+    convergence enables early termination once recent turns add little new
+    content; None follows DEBATOR_CONVERGENCE.
+    deadline_s bounds the whole debate (default DEBATOR_DEADLINE_S): nodes and
+    backend requests get slices of what is left, and the graph degrades to
+    fallback turns and an early verdict rather than overrun it.
+    openings maps personas to opening arguments from generate_opening(); the
+    persona who opens a two-agent debate uses its entry instead of calling the
+    model.
+    """
+    final_state = None
+    for event in stream_debate(topic, persona_a, persona_b, thread_id=thread_id, argument_cache=argument_cache,
+                               participants=participants, max_rounds=max_rounds, judges=judges,
+                               judge_aggregation=judge_aggregation, convergence=convergence,
+                               deadline_s=deadline_s, openings=openings):
+        if on_event and type(event) in CALLBACK_EVENTS:
+            payload = event.to_dict()
+            del payload["type"]
+            on_event(CALLBACK_EVENTS[type(event)], payload)
+        if console:
+            render_event(console, event)
+        if isinstance(event, DebateFinished):
+            final_state = event.final_state
+    return final_state
 
 
 def generate_langgraph_dag() -> str:
@@ -0,0 +1,284 @@
+# local_daemon.py
+"""
+Persistent local inference daemon for flan-t5.
+
+Every CLI run that falls back to the local model pays for loading it from
+disk, which dominates short scripted debates. `python src/local_daemon.py start`
+loads the model once and serves generate requests over a Unix domain socket
+(DEBATOR_LOCAL_DAEMON_SOCKET). The daemon exits after DEBATOR_LOCAL_DAEMON_IDLE_S
+(900) seconds without a request. While it is running, hf_generate sends its
+requests there and never loads the model in-process. Set DEBATOR_LOCAL_DAEMON=0
+to ignore a running daemon.
+
+Framing: every message is a 5-byte header (op code, payload length as a
+big-endian uint32) followed by a compact JSON payload. A connection may carry
+any number of request/response pairs.
+
+Usage:
+    python src/local_daemon.py start [--idle 900]
+    python src/local_daemon.py status
+    python src/local_daemon.py stop
+"""
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import argparse
+import tempfile
+import threading
+import subprocess
+import socketserver
+
+try:
+    from .logger_util import log_event
+except ImportError:
+    from logger_util import log_event
+
+SOCKET_PATH = os.getenv(
+    "DEBATOR_LOCAL_DAEMON_SOCKET",
+    os.path.join(tempfile.gettempdir(), f"debator-flan-t5-{getattr(os, 'getuid', lambda: 0)()}.sock"))
+IDLE_SECONDS = float(os.getenv("DEBATOR_LOCAL_DAEMON_IDLE_S", "900"))
+# Seconds `start` waits for the daemon to load the model and answer a ping
+START_TIMEOUT_S = 300
+
+HEADER = struct.Struct("!BI")
+MAX_FRAME = 16 * 1024 * 1024
+OP_PING = 1
+OP_GENERATE = 2
+OP_SHUTDOWN = 3
+OP_OK = 0x80
+OP_ERROR = 0x81
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket; the caller should generate in-process"""
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("connection closed mid-frame")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock, op, payload):
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    sock.sendall(HEADER.pack(op, len(body)) + body)
+
+
+def recv_frame(sock):
+    """Read one frame; returns (None, None) on a clean end of stream"""
+    first = sock.recv(HEADER.size)
+    if not first:
+        return None, None
+    header = first + (_recv_exact(sock, HEADER.size - len(first)) if len(first) < HEADER.size else b"")
+    op, length = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"frame of {length} bytes exceeds the {MAX_FRAME} byte limit")
+    return op, json.loads(_recv_exact(sock, length).decode("utf-8")) if length else None
+
+
+# --- Client ---
+
+def daemon_enabled():
+    return os.getenv("DEBATOR_LOCAL_DAEMON", "1") != "0"
+
+
+def daemon_running(path=None):
+    """Cheap check used on every hf_generate call: is there a socket to try?"""
+    return daemon_enabled() and os.path.exists(path or SOCKET_PATH)
+
+
+def request(op, payload=None, timeout=None, path=None):
+    """Send one request and return the response payload"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path or SOCKET_PATH)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonUnavailable(str(e))
+        send_frame(sock, op, payload)
+        reply_op, reply = recv_frame(sock)
+    finally:
+        sock.close()
+    if reply_op == OP_ERROR:
+        raise RuntimeError(reply.get("error", "daemon error"))
+    if reply_op != OP_OK:
+        raise ConnectionError("daemon closed the connection without a reply")
+    return reply
+
+
+def daemon_generate(prompt, timeout=None, path=None, **kwargs):
+    """Generate on the daemon; raises DaemonUnavailable when nothing is listening"""
+    return request(OP_GENERATE, {"prompt": prompt, "kwargs": kwargs}, timeout=timeout, path=path)["text"]
+
+
+def ping(path=None, timeout=2.0):
+    """Daemon status dict, or None when it is not running"""
+    try:
+        return request(OP_PING, timeout=timeout, path=path)
+    except (DaemonUnavailable, OSError):
+        return None
+
+
+# --- Server ---
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                op, payload = recv_frame(self.request)
+            except (OSError, ValueError):
+                return
+            if op is None:
+                return
+            server.touch()
+            try:
+                if op == OP_PING:
+                    send_frame(self.request, OP_OK, server.status())
+                elif op == OP_GENERATE:
+                    send_frame(self.request, OP_OK, {"text": server.generate(payload["prompt"], payload.get("kwargs") or {})})
+                elif op == OP_SHUTDOWN:
+                    send_frame(self.request, OP_OK, {"stopping": True})
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                    return
+                else:
+                    send_frame(self.request, OP_ERROR, {"error": f"unknown op {op}"})
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up (e.g. its deadline passed) before the reply was ready
+                return
+            except Exception as e:
+                try:
+                    send_frame(self.request, OP_ERROR, {"error": str(e)})
+                except OSError:
+                    return
+            finally:
+                server.touch()
+
+
+class LocalModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-socket server that owns one loaded pipeline and stops when idle"""
+    daemon_threads = True
+
+    def __init__(self, path, generator, idle_s=IDLE_SECONDS):
+        self.generator = generator
+        self.idle_s = idle_s
+        self.started_at = time.time()
+        self.last_active = time.monotonic()
+        self.requests = 0
+        # The pipeline is not safe to call concurrently; requests are served in turn
+        self._generate_lock = threading.Lock()
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o600)
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def generate(self, prompt, kwargs):
+        with self._generate_lock:
+            self.requests += 1
+            out = self.generator(prompt, **kwargs)
+        return out[0].get("generated_text", "").strip()
+
+    def status(self):
+        return {"pid": os.getpid(), "uptime_s": round(time.time() - self.started_at, 1),
+                "requests": self.requests, "idle_s": self.idle_s}
+
+    def watch_idle(self):
+        """Stop serving once no request has arrived for idle_s seconds"""
+        interval = max(0.05, min(5.0, self.idle_s / 4))
+        while True:
+            time.sleep(interval)
+            if time.monotonic() - self.last_active >= self.idle_s and not self._generate_lock.locked():
+                log_event("local_daemon_idle_shutdown", {"idle_s": self.idle_s, "requests": self.requests})
+                self.shutdown()
+                return
+
+
+def serve(path=None, idle_s=IDLE_SECONDS, generator=None):
+    """Load the model (unless a generator is given) and serve until idle or stopped"""
+    path = path or SOCKET_PATH
+    if os.path.exists(path):
+        if ping(path) is not None:
+            raise RuntimeError(f"a daemon is already listening on {path}")
+        # Left behind by a daemon that was killed
+        os.unlink(path)
+    if generator is None:
+        from nodes import get_text_generator
+        generator = get_text_generator()
+        if generator is None:
+            raise RuntimeError("text-generation pipeline not available")
+    server = LocalModelServer(path, generator, idle_s)
+    log_event("local_daemon_start", {"socket": path, "pid": os.getpid(), "idle_s": idle_s})
+    threading.Thread(target=server.watch_idle, name="local-daemon-idle", daemon=True).start()
+    try:
+        server.serve_forever(poll_interval=0.2)
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        log_event("local_daemon_stop", {"socket": path, "requests": server.requests})
+    return server.requests
+
+
+def start_detached(path=None, idle_s=IDLE_SECONDS):
+    """Launch `serve` in its own session and wait until it answers; returns its status"""
+    status = ping(path)
+    if status is not None:
+        return status
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--socket", path or SOCKET_PATH, "--idle", str(idle_s)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True)
+    waited = 0.0
+    while waited < START_TIMEOUT_S:
+        time.sleep(0.25)
+        waited += 0.25
+        status = ping(path)
+        if status is not None:
+            return status
+        if process.poll() is not None:
+            # Exited during startup, e.g. the pipeline could not be loaded
+            return None
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Persistent flan-t5 daemon shared across CLI runs")
+    parser.add_argument("command", choices=["start", "serve", "status", "stop"],
+                        help="start in the background, serve in the foreground, report status, or stop")
+    parser.add_argument("--socket", default=SOCKET_PATH, help=f"Unix socket path (default {SOCKET_PATH})")
+    parser.add_argument("--idle", type=float, default=IDLE_SECONDS, help="seconds without requests before exiting")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.idle)
+    elif args.command == "start":
+        status = start_detached(args.socket, args.idle)
+        if status is None:
+            print(f"Daemon did not come up on {args.socket} (check the event log for pipeline_creation_error)")
+            sys.exit(1)
+        print(f"Daemon running on {args.socket} (pid {status['pid']}, idle timeout {status['idle_s']:.0f}s)")
+    elif args.command == "status":
+        status = ping(args.socket)
+        if status is None:
+            print(f"No daemon on {args.socket}")
+            sys.exit(1)
+        print(f"Daemon on {args.socket}: pid {status['pid']}, up {status['uptime_s']}s, "
+              f"{status['requests']} requests served")
+    elif args.command == "stop":
+        try:
+            request(OP_SHUTDOWN, timeout=5.0, path=args.socket)
+            print("Daemon stopped")
+        except (DaemonUnavailable, OSError):
+            print(f"No daemon on {args.socket}")
@@ -0,0 +1,142 @@
+# local_workers.py
+"""
+Process pool for local flan-t5 inference.
+
+A single in-process pipeline is limited to one torch thread pool and competes
+with the graph for the GIL. With DEBATOR_LOCAL_WORKERS=N, hf_generate instead
+dispatches to N worker processes, each with cpu_count // N torch threads.
+
+Forking is only safe while the parent has a single thread: a child forked
+while other threads hold locks (the logger's, torch's thread pool, the graph's
+executor) inherits those locks held forever. So app.py starts the pool before
+the warm-up thread, and start_pool forks only when no other thread is running.
+Then the parent loads the model once, every worker is forked right away and
+shares the weight pages copy-on-write (inference never writes to them).
+Otherwise - a pool started lazily from a debate thread, or no fork on this
+platform - workers come from a forkserver (or spawn) with the backend modules
+preloaded, and each loads the model itself; safetensors checkpoints are
+memory-mapped, so the file pages are still shared through the page cache.
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+_pool = None
+_pool_size = 0
+_pool_method = None
+_pool_lock = threading.Lock()
+
+# Set inside each worker process by _init_worker
+_worker_generator = None
+
+
+def configured_workers():
+    """Number of local inference workers requested via DEBATOR_LOCAL_WORKERS (0 = in-process)"""
+    try:
+        return max(0, int(os.getenv("DEBATOR_LOCAL_WORKERS", "0")))
+    except ValueError:
+        return 0
+
+
+def threads_per_worker(workers, cores=None):
+    """Split the available CPU cores evenly between workers (at least one thread each)"""
+    cores = cores or os.cpu_count() or 1
+    return max(1, cores // max(1, workers))
+
+
+def _load_generator():
+    from nodes import get_text_generator
+    return get_text_generator()
+
+
+def _init_worker(threads, loader):
+    """Pin torch threads for this worker and make sure the pipeline is loaded"""
+    global _worker_generator
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    # Under fork this returns the parent's already-loaded pipeline
+    _worker_generator = loader()
+
+
+def _worker_ready(_):
+    return os.getpid()
+
+
+def _worker_generate(prompt, kwargs):
+    if _worker_generator is None:
+        return "Error: text-generation pipeline not available."
+    out = _worker_generator(prompt, **kwargs)
+    return out[0].get("generated_text", "").strip()
+
+
+def start_method():
+    """fork while this process has a single thread, else forkserver (or spawn where that is missing)"""
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods and threading.active_count() == 1:
+        return "fork"
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+def start_pool(workers, loader=_load_generator):
+    """Start (or replace) the worker pool with the given number of processes
+
+    Every worker is started and has loaded the pipeline (loader(), a
+    module-level function) when this returns.
+    """
+    global _pool, _pool_size, _pool_method
+    with _pool_lock:
+        if _pool is not None and _pool_size == workers:
+            return _pool
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        method = start_method()
+        context = multiprocessing.get_context(method)
+        if method == "fork":
+            # Load once in the parent so workers inherit the weights copy-on-write
+            loader()
+        elif method == "forkserver":
+            context.set_forkserver_preload(["local_workers", "nodes"])
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(threads_per_worker(workers), loader),
+        )
+        # Start the workers now: a fork pool would otherwise fork on the first request, from a debate thread
+        list(_pool.map(_worker_ready, range(workers)))
+        _pool_size = workers
+        _pool_method = method
+        return _pool
+
+
+def get_pool():
+    """Return the configured pool, starting it on first use; None when disabled"""
+    if _pool is not None:
+        return _pool
+    workers = configured_workers()
+    if workers <= 0:
+        return None
+    return start_pool(workers)
+
+
+def pooled_generate(prompt, timeout=None, **kwargs):
+    """Run one generation request on the worker pool (blocks only the calling thread)
+
+    timeout bounds the wait; the worker finishes the request in the background.
+    """
+    pool = get_pool()
+    return pool.submit(_worker_generate, prompt, kwargs).result(timeout=timeout)
+
+
+def shutdown_pool():
+    global _pool, _pool_size, _pool_method
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool = None
+        _pool_size = 0
+        _pool_method = None
@@ -0,0 +1,373 @@
+# log_analytics.py
+"""
+Streaming analytics over debate event logs.
+
+Reads any number of debate_log.txt / global_debate_log.txt files one line at a
+time, including the rotated .gz/.zst segments of each (see log_rotation.py),
+and reports:
+  * per-node latency percentiles, from node_start/node_end pairs
+  * per-persona turn latency, generation attempts, retries and fallback rate
+  * per-backend request latency and error rate, from llm_call events
+  * Agent.speak retries, lenient acceptances, repairs and failures per output
+    mode (structured JSON or free text)
+  * the slowest debates
+
+Node, turn and LLM events carry the debate's thread id ("debate_id"), so node
+spans and turns are paired within their own debate even when several debates
+write to the same log at once (the global log, the server, the job queue).
+Older logs without the id are read as one debate at a time per file.
+
+Memory stays constant however large the logs are. Latencies go into
+fixed-resolution log histograms (about 2% relative error), slowest debates are
+kept in a bounded heap, and only open node spans and debates are tracked. Most
+lines carry a full state snapshot; their type, node and timestamp are read
+from the line prefix, so full JSON parsing is limited to the few small events
+that need it.
+
+Command line:
+    python src/log_analytics.py global_debate_log.txt debates/*/debate_log.txt
+    python src/log_analytics.py global_debate_log.txt --format json --slowest 20
+    python src/log_analytics.py debates/*/debate_log.txt --format csv > latency.csv
+"""
+import os
+import sys
+import argparse
+import csv
+import heapq
+import json
+import math
+import re
+from datetime import datetime
+
+try:
+    from .log_rotation import log_segments, open_segment
+except ImportError:
+    from log_rotation import log_segments, open_segment
+
+# Fields are read from the start of each line; state snapshots come after them
+PREFIX_CHARS = 400
+TIMESTAMP_RE = re.compile(r'"timestamp": "([^"]+)"')
+TYPE_RE = re.compile(r'"type": "([^"]+)"')
+NODE_RE = re.compile(r'"node": "([^"]+)"')
+# Parallel nodes (opening_turn, judge_worker) name their agent or judge right after the node
+AGENT_RE = re.compile(r'"node": "[^"]+", "(?:agent|judge)": "([^"]+)"')
+DEBATE_ID_RE = re.compile(r'"debate_id": "([^"]+)"')
+SPEAK_RE = re.compile(r"^agent_([a-z])_speak$")
+FALLBACK_RE = re.compile(r"^agent_([a-z])_fallback_used$")
+
+# Events whose (small) payload is parsed in full
+PARSED_EVENTS = {"langgraph_debate_start", "agent_speak_raw", "agent_speak_failed", "agent_speak_lenient_accepted",
+                 "agent_speak_repaired", "llm_call"}
+
+
+class LogHistogram:
+    """Constant-memory latency histogram with geometric buckets"""
+
+    GROWTH = 1.02
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        bucket = int(math.log(max(value, 1e-3) * 1000, self.GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                # Bucket midpoint, in the units that were added
+                return min(self.max, self.GROWTH ** (bucket + 0.5) / 1000)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4) if self.count else 0.0,
+            "p50": round(self.percentile(0.50), 4),
+            "p90": round(self.percentile(0.90), 4),
+            "p99": round(self.percentile(0.99), 4),
+            "max": round(self.max, 4),
+        }
+
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value.rstrip("Z")).timestamp()
+
+
+class LogAnalyzer:
+    """Accumulates statistics from a stream of log lines"""
+
+    def __init__(self, slowest=10):
+        self.slowest = slowest
+        self.nodes = {}
+        self.personas = {}
+        self.backends = {}
+        # Agent.speak outcomes per output mode ("json" or the free-text "text")
+        self.outputs = {}
+        self.lines = 0
+        self.bad_lines = 0
+        self._open_spans = {}
+        self._open_debates = {}
+        self._slowest_heap = []
+        self._debates_seen = 0
+
+    # --- helpers ---
+
+    def _histogram(self, table, key):
+        if key not in table:
+            table[key] = {"latency_s": LogHistogram()}
+        return table[key]
+
+    def _persona(self, persona):
+        stats = self.personas.get(persona)
+        if stats is None:
+            stats = self.personas[persona] = {"latency_s": LogHistogram(), "turns": 0, "attempts": 0,
+                                              "retries": 0, "fallbacks": 0, "agent_fallbacks": 0}
+        return stats
+
+    def _output(self, mode):
+        return self.outputs.setdefault(mode or "text", {"attempts": 0, "retries": 0, "lenient_accepted": 0,
+                                                        "repaired": 0, "failed": 0})
+
+    def _debate(self, debate_key):
+        return self._open_debates.setdefault(debate_key, {"start": None, "topic": None, "thread_id": None, "rounds": 0})
+
+    # --- ingestion ---
+
+    def feed(self, line, source):
+        """Consume one raw log line; source names the file, for debates without an id"""
+        self.lines += 1
+        head = line[:PREFIX_CHARS]
+        type_match = TYPE_RE.search(head)
+        ts_match = TIMESTAMP_RE.search(head)
+        if not type_match or not ts_match:
+            self.bad_lines += 1
+            return
+        event_type = type_match.group(1)
+        try:
+            ts = parse_timestamp(ts_match.group(1))
+        except ValueError:
+            self.bad_lines += 1
+            return
+        id_match = DEBATE_ID_RE.search(head)
+        # Without a debate id (older logs), debates in one file are assumed to run one after another
+        debate_key = id_match.group(1) if id_match else source
+
+        if event_type in ("node_start", "node_end"):
+            node_match = NODE_RE.search(head)
+            if node_match:
+                self._node_event(event_type, node_match.group(1), head, ts, debate_key)
+            return
+
+        payload = None
+        speak = SPEAK_RE.match(event_type)
+        if event_type in PARSED_EVENTS or speak:
+            try:
+                payload = json.loads(line).get("payload") or {}
+            except ValueError:
+                self.bad_lines += 1
+                return
+
+        if event_type == "langgraph_debate_start":
+            debate = self._debate(debate_key)
+            debate.update(start=ts, topic=payload.get("topic"), thread_id=payload.get("thread_id"), rounds=0)
+        elif event_type == "langgraph_debate_end":
+            self._finish_debate(debate_key, ts)
+        elif event_type == "agent_speak_raw":
+            stats = self._persona(payload.get("persona", "?"))
+            output = self._output(payload.get("mode"))
+            stats["attempts"] += 1
+            output["attempts"] += 1
+            if (payload.get("attempt") or 1) > 1:
+                stats["retries"] += 1
+                output["retries"] += 1
+        elif event_type == "agent_speak_failed":
+            # Agent.speak gave up and returned its canned argument
+            self._persona(payload.get("persona", "?"))["agent_fallbacks"] += 1
+            self._output(payload.get("mode"))["failed"] += 1
+            self._debate(debate_key)["fallback_pending"] = True
+        elif event_type == "agent_speak_lenient_accepted":
+            self._output("text")["lenient_accepted"] += 1
+        elif event_type == "agent_speak_repaired":
+            self._output("json")["repaired"] += 1
+        elif event_type == "llm_call":
+            stats = self._histogram(self.backends, payload.get("backend", "?"))
+            stats["latency_s"].add((payload.get("latency_ms") or 0) / 1000)
+            stats["errors"] = stats.get("errors", 0) + (0 if payload.get("ok") else 1)
+            kinds = stats.setdefault("kinds", {})
+            kinds[payload.get("kind", "default")] = kinds.get(payload.get("kind", "default"), 0) + 1
+        elif speak:
+            debate = self._debate(debate_key)
+            debate["rounds"] += 1
+            debate["pending_persona"] = payload.get("persona", "?")
+        elif FALLBACK_RE.match(event_type):
+            self._debate(debate_key)["fallback_pending"] = True
+
+    def _node_event(self, event_type, node, head, ts, debate_key):
+        agent_match = AGENT_RE.search(head)
+        span = (debate_key, node, agent_match.group(1) if agent_match else None)
+        if event_type == "node_start":
+            self._open_spans[span] = ts
+            return
+        started = self._open_spans.pop(span, None)
+        if started is None:
+            return
+        self._histogram(self.nodes, node)["latency_s"].add(ts - started)
+        debate = self._open_debates.get(debate_key)
+        if debate is None or not debate.get("pending_persona"):
+            return
+        # The turn's persona comes from the agent_x_speak event inside the span
+        stats = self._persona(debate.pop("pending_persona"))
+        stats["turns"] += 1
+        stats["latency_s"].add(ts - started)
+        if debate.pop("fallback_pending", False):
+            stats["fallbacks"] += 1
+
+    def _finish_debate(self, debate_key, ts):
+        debate = self._open_debates.pop(debate_key, None)
+        if not debate or debate["start"] is None:
+            return
+        self._debates_seen += 1
+        record = (ts - debate["start"], self._debates_seen, {
+            "topic": debate["topic"], "thread_id": debate["thread_id"], "debate": debate_key,
+            "rounds": debate["rounds"], "duration_s": round(ts - debate["start"], 3),
+            "started_at": datetime.fromtimestamp(debate["start"]).isoformat()})
+        if len(self._slowest_heap) < self.slowest:
+            heapq.heappush(self._slowest_heap, record)
+        else:
+            heapq.heappushpop(self._slowest_heap, record)
+        # Spans left open by a debate that ended (e.g. a failed node) are dropped
+        for span in [s for s in self._open_spans if s[0] == debate_key]:
+            del self._open_spans[span]
+
+    def feed_file(self, path):
+        source = os.path.abspath(path)
+        with open_segment(path) as f:
+            for line in f:
+                self.feed(line, source)
+
+    # --- reporting ---
+
+    def report(self):
+        personas = {}
+        for persona, stats in self.personas.items():
+            turns = stats["turns"] or 1
+            personas[persona] = {
+                **stats["latency_s"].summary(),
+                "turns": stats["turns"],
+                "attempts": stats["attempts"],
+                "retries": stats["retries"],
+                "retries_per_turn": round(stats["retries"] / turns, 3),
+                "fallback_rate": round(stats["fallbacks"] / turns, 3),
+                "agent_fallbacks": stats["agent_fallbacks"],
+            }
+        backends = {}
+        for backend, stats in self.backends.items():
+            summary = stats["latency_s"].summary()
+            backends[backend] = {**summary, "errors": stats.get("errors", 0),
+                                 "error_rate": round(stats.get("errors", 0) / summary["count"], 3) if summary["count"] else 0.0,
+                                 "kinds": stats.get("kinds", {})}
+        return {
+            "lines": self.lines,
+            "bad_lines": self.bad_lines,
+            "debates": self._debates_seen,
+            "nodes": {node: stats["latency_s"].summary() for node, stats in sorted(self.nodes.items())},
+            "personas": personas,
+            "backends": backends,
+            "agent_output": {mode: {**stats, "retry_rate": round(stats["retries"] / stats["attempts"], 3) if stats["attempts"] else 0.0}
+                             for mode, stats in sorted(self.outputs.items())},
+            "slowest_debates": [record for _, _, record in sorted(self._slowest_heap, reverse=True)],
+        }
+
+
+def expand_segments(paths):
+    """Replace each active log with its rotated segments (oldest first) plus itself"""
+    expanded = []
+    for path in paths:
+        for segment in log_segments(path) or [path]:
+            if segment not in expanded:
+                expanded.append(segment)
+    return expanded
+
+
+def analyze(paths, slowest=10):
+    """Stream every log in paths, including rotated segments, and return the report dict"""
+    analyzer = LogAnalyzer(slowest=slowest)
+    for path in expand_segments(paths):
+        analyzer.feed_file(path)
+    return analyzer.report()
+
+
+LATENCY_COLUMNS = ["count", "mean", "p50", "p90", "p99", "max"]
+
+
+def write_csv(report, out):
+    """One row per node, persona and backend; slowest debates follow as their own group"""
+    writer = csv.writer(out)
+    writer.writerow(["group", "key"] + LATENCY_COLUMNS + ["retries", "fallback_rate", "error_rate"])
+    for group in ("nodes", "personas", "backends"):
+        for key, stats in report[group].items():
+            writer.writerow([group[:-1], key] + [stats[c] for c in LATENCY_COLUMNS] +
+                            [stats.get("retries", ""), stats.get("fallback_rate", ""), stats.get("error_rate", "")])
+    for record in report["slowest_debates"]:
+        writer.writerow(["slowest_debate", record["thread_id"] or record["debate"], 1, record["duration_s"], "", "", "",
+                         record["duration_s"], "", "", ""])
+
+
+def print_table(report):
+    def section(title, rows, extra=()):
+        if not rows:
+            return
+        print(f"\n{title}")
+        columns = LATENCY_COLUMNS + list(extra)
+        widths = [max(9, len(c) + 2) for c in columns]
+        print(f"  {'':<22}" + "".join(f"{c:>{w}}" for c, w in zip(columns, widths)))
+        for key, stats in rows.items():
+            print(f"  {key[:22]:<22}" + "".join(f"{stats[c]:>{w}}" for c, w in zip(columns, widths)))
+
+    print(f"{report['lines']} lines, {report['debates']} debates ({report['bad_lines']} unreadable lines)")
+    section("Node latency (s)", report["nodes"])
+    section("Persona turns (s)", report["personas"], ("retries", "fallback_rate"))
+    section("Backend requests (s)", report["backends"], ("errors",))
+    if report["agent_output"]:
+        print("\nAgent output (requests per mode)")
+        for mode, stats in report["agent_output"].items():
+            print(f"  {mode:<6} {stats['attempts']:>6} attempts  {stats['retries']:>5} retries ({stats['retry_rate']:.1%})  "
+                  f"{stats['lenient_accepted']:>5} lenient  {stats['repaired']:>5} repaired  {stats['failed']:>5} failed")
+    if report["slowest_debates"]:
+        print("\nSlowest debates")
+        for record in report["slowest_debates"]:
+            print(f"  {record['duration_s']:>8.2f}s  {record['rounds']:>2} rounds  "
+                  f"[{record['thread_id']}] {record['topic']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-node, per-persona and per-backend latency from debate logs")
+    parser.add_argument("logs", nargs="+", help="debate_log.txt / global_debate_log.txt files; rotated segments are included")
+    parser.add_argument("--format", choices=["table", "json", "csv"], default="table")
+    parser.add_argument("--slowest", type=int, default=10, help="number of slowest debates to report")
+    args = parser.parse_args()
+
+    report = analyze(args.logs, slowest=args.slowest)
+    if args.format == "json":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.format == "csv":
+        write_csv(report, sys.stdout)
+    else:
+        print_table(report)
+
+
+if __name__ == "__main__":
+    main()
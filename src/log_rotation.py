@@ -0,0 +1,196 @@
+# log_rotation.py
+"""
+Size- and time-based rotation for the global event log.
+
+The active file (DEBATOR_LOG_FILE, default ./global_debate_log.txt) is kept
+open for appends. It is rotated once it exceeds DEBATOR_LOG_MAX_BYTES (64 MB)
+or has been open longer than DEBATOR_LOG_ROTATE_HOURS (24). A rotated segment
+is renamed to <stem>.<UTC timestamp><suffix>, for example
+global_debate_log.20261019T120000123456.txt. A background thread then
+compresses it with gzip, or with zstd when DEBATOR_LOG_COMPRESSION=zstd and the
+zstandard package is installed. Only the newest DEBATOR_LOG_RETENTION segments
+(20) are kept.
+
+log_segments(path) lists every segment of a log, oldest first and the active
+file last, and open_segment() reads any of them, so readers can treat a
+rotated log as one stream.
+"""
+import os
+import re
+import gzip
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+MAX_BYTES = int(os.getenv("DEBATOR_LOG_MAX_BYTES", str(64 * 1024 * 1024)))
+ROTATE_SECONDS = float(os.getenv("DEBATOR_LOG_ROTATE_HOURS", "24")) * 3600
+RETENTION = int(os.getenv("DEBATOR_LOG_RETENTION", "20"))
+COMPRESSION = os.getenv("DEBATOR_LOG_COMPRESSION", "gzip").lower()
+# Another process may still append to a segment right after it is renamed;
+# it notices within INODE_CHECK_S, so compression waits a little longer
+INODE_CHECK_S = 1.0
+COMPRESS_DELAY_S = 2.0
+FIRST_TIMESTAMP_RE = re.compile(r'"timestamp": "([^"Z]+)Z?"')
+_compress_lock = threading.Lock()
+
+
+def _segment_re(path):
+    stem, suffix = os.path.splitext(os.path.basename(path))
+    return re.compile(re.escape(stem) + r"\.(\d{8}T\d{12})" + re.escape(suffix) + r"(\.gz|\.zst)?$")
+
+
+def log_segments(path):
+    """Rotated segments of a log, oldest first, followed by the active file if it exists"""
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    pattern = _segment_re(path)
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        names = []
+    stamped = {}
+    for name in names:
+        match = pattern.match(name)
+        # Prefer the compressed copy if both exist mid-compression
+        if match and (match.group(2) or match.group(1) not in stamped):
+            stamped[match.group(1)] = name
+    segments = [os.path.join(directory, stamped[stamp]) for stamp in sorted(stamped)]
+    if os.path.exists(path):
+        segments.append(path)
+    return segments
+
+
+def open_segment(path):
+    """Text reader for a plain, .gz or .zst log segment"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.endswith(".zst"):
+        import io
+        import zstandard
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")),
+                                encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def compress_segment(path, method=COMPRESSION):
+    """Compress a closed segment next to itself and remove the original"""
+    if method == "none":
+        return path
+    if method == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            method = "gzip"
+    target = path + (".zst" if method == "zstd" else ".gz")
+    tmp = target + ".tmp"
+    with open(path, "rb") as src:
+        if method == "zstd":
+            with open(tmp, "wb") as dst:
+                zstandard.ZstdCompressor(level=10).copy_stream(src, dst)
+        else:
+            with gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(tmp, target)
+    os.remove(path)
+    return target
+
+
+def _first_timestamp(path):
+    """Epoch time of a log's first event, or None"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            match = FIRST_TIMESTAMP_RE.search(f.readline(200))
+        return datetime.fromisoformat(match.group(1)).replace(tzinfo=timezone.utc).timestamp() if match else None
+    except (OSError, ValueError):
+        return None
+
+
+class RotatingLog:
+    """Append-only log file with rotation, background compression and retention"""
+
+    def __init__(self, path, max_bytes=MAX_BYTES, rotate_seconds=ROTATE_SECONDS, retention=RETENTION,
+                 compression=COMPRESSION):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.retention = retention
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._file = None
+        self._closed = False
+        self._opened_at = 0.0
+        self._checked_at = 0.0
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        # A reopened, already-old file keeps the age of its first line
+        self._opened_at = (_first_timestamp(self.path) if self._file.tell() else None) or time.time()
+        self._checked_at = time.time()
+
+    def _stale(self, now):
+        """True when another process has rotated the file out from under our handle"""
+        if now - self._checked_at < INODE_CHECK_S:
+            return False
+        self._checked_at = now
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except OSError:
+            return True
+
+    def write(self, line):
+        """Append line; False (nothing written) once the log has been closed"""
+        with self._lock:
+            if self._closed:
+                return False
+            now = time.time()
+            if self._file is None or self._stale(now):
+                if self._file is not None:
+                    self._file.close()
+                self._open()
+            self._file.write(line)
+            self._file.flush()
+            size = self._file.tell()
+            if size >= self.max_bytes or (self.rotate_seconds and size and now - self._opened_at >= self.rotate_seconds):
+                self._rotate()
+            return True
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        stem, suffix = os.path.splitext(self.path)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        segment = f"{stem}.{stamp}{suffix}"
+        try:
+            os.rename(self.path, segment)
+        except OSError:
+            # Another process rotated it first
+            return
+        threading.Thread(target=self._finish_segment, name="log-compress", daemon=True).start()
+
+    def _finish_segment(self):
+        """Compress every uncompressed rotated segment, then apply retention"""
+        time.sleep(COMPRESS_DELAY_S)
+        with _compress_lock:
+            for segment in log_segments(self.path):
+                if segment != self.path and segment.endswith(os.path.splitext(self.path)[1]):
+                    try:
+                        compress_segment(segment, self.compression)
+                    except OSError:
+                        pass
+            rotated = [s for s in log_segments(self.path) if s != self.path]
+            for old in rotated[:max(0, len(rotated) - self.retention)]:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
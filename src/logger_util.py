@@ -1,17 +1,113 @@
 # logger_util.py
+"""
+Event logging.
+
+Every event goes to the rotating global log. An event logged inside a debate
+also goes to that debate's debate_log.txt. The debate log is bound with
+contextvars, not a module global, so debates running at the same time on
+different threads or asyncio tasks each write to their own file. LangGraph
+copies the context into the threads that run a debate's nodes.
+
+    with debate_log("records/topic/debate_log.txt"):
+        run_langgraph_debate(...)
+
+A debate log is an unbuffered append-only file: each event is one write()
+with no lock in Python, and lines from parallel nodes of the same debate do not
+interleave.
+"""
+import os
 import json
 import datetime
+import threading
+import contextvars
+from contextlib import contextmanager
 from pathlib import Path
 
-GLOBAL_LOG_FILE = Path("global_debate_log.txt")
-DEBATE_LOG_FILE = None
+try:
+    from .log_rotation import RotatingLog
+except ImportError:
+    from log_rotation import RotatingLog
+
+# Absolute location via DEBATOR_LOG_FILE; rotation settings are in log_rotation.py
+GLOBAL_LOG_FILE = Path(os.getenv("DEBATOR_LOG_FILE", "global_debate_log.txt")).expanduser().absolute()
+_global_log = None
+# Taken only to create or replace _global_log; writes go through RotatingLog's own lock
+_global_log_lock = threading.Lock()
+
+# Debate log of the running debate (a DebateLog), inherited by the nodes' threads
+_debate_log = contextvars.ContextVar("debate_log", default=None)
+
+def set_global_log_file(path):
+    """Move the global log (it is reopened on the next event)"""
+    global GLOBAL_LOG_FILE
+    GLOBAL_LOG_FILE = Path(path).expanduser().absolute()
+
+class DebateLog:
+    """One debate's log file, opened for appending (an existing file is cleared)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if self.path.exists():
+            self.path.unlink()
+        self._file = open(self.path, "ab", buffering=0)
+
+    def write(self, line):
+        try:
+            self._file.write(line.encode("utf-8"))
+        except ValueError:
+            # Closed: a straggling node of a debate that has already returned
+            pass
+
+    def close(self):
+        self._file.close()
+
+@contextmanager
+def debate_log(path):
+    """Send the events logged inside the block (and the threads it starts via LangGraph) to path"""
+    sink = DebateLog(path)
+    token = _debate_log.set(sink)
+    try:
+        yield sink
+    finally:
+        _debate_log.reset(token)
+        sink.close()
+
+def current_debate_log():
+    """Path of the debate log bound in this context, or None"""
+    sink = _debate_log.get()
+    return sink.path if sink is not None else None
 
 def set_log_file(path):
-    global DEBATE_LOG_FILE
-    DEBATE_LOG_FILE = Path(path)
-    # Clear the debate log file if it exists
-    if DEBATE_LOG_FILE.exists():
-        DEBATE_LOG_FILE.unlink()
+    """Bind a debate log for the rest of the current context (thread or task)
+
+    Prefer debate_log(), which also closes the file; this is for callers that
+    run one debate per thread.
+    """
+    previous = _debate_log.get()
+    _debate_log.set(DebateLog(path))
+    if previous is not None:
+        previous.close()
+
+def _current_global_log():
+    """The RotatingLog for GLOBAL_LOG_FILE, opening it (and closing a moved one) if needed"""
+    global _global_log
+    log = _global_log
+    if log is not None and log.path == str(GLOBAL_LOG_FILE):
+        return log
+    with _global_log_lock:
+        if _global_log is None or _global_log.path != str(GLOBAL_LOG_FILE):
+            # Moved by set_global_log_file: close the old file; writers still holding it retry here
+            previous = _global_log
+            _global_log = RotatingLog(str(GLOBAL_LOG_FILE))
+            if previous is not None:
+                previous.close()
+        return _global_log
+
+def _json_default(value):
+    # Transcript turns (state.Turn) and anything else with a dict form
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
 
 def log_event(event_type, payload):
     entry = {
@@ -19,11 +115,12 @@ def log_event(event_type, payload):
         "type": event_type,
         "payload": payload
     }
-    # Write to global log file
-    with GLOBAL_LOG_FILE.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-    
-    # Write to debate-specific log file if set
-    if DEBATE_LOG_FILE:
-        with DEBATE_LOG_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    line = json.dumps(entry, ensure_ascii=False, default=_json_default) + "\n"
+    # Write to the (rotating) global log file; a log closed by a concurrent move refuses the line
+    while not _current_global_log().write(line):
+        pass
+
+    # Write to the debate log bound in this context, if any
+    sink = _debate_log.get()
+    if sink is not None:
+        sink.write(line)
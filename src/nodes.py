@@ -4,61 +4,256 @@ import json
 import re
 import time
 import os
+import threading
+import contextvars
+from contextlib import contextmanager
 from logger_util import log_event
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-import google.generativeai as genai
+from local_workers import configured_workers, get_pool, pooled_generate
+from local_daemon import DaemonUnavailable, daemon_running, daemon_generate
+from hedging import hedging_enabled, hedge_backend, hedged_call
+from deadline import request_timeout, is_cancelled
+from rate_scheduler import (QuotaTimeout, get_scheduler, current_debate, estimate_tokens, usage_tokens,
+                            is_rate_limit_error)
+from structured_output import TURN_FORMAT, gemini_turn_config, output_mode, parse_turn
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Backends are configured lazily: importing google.generativeai and transformers
+# (and loading flan-t5 weights) costs seconds, and the CLI should be able to show
+# its prompts before any of that happens.
+_backend_lock = threading.Lock()
+_gemini_model = None
+_gemini_ready = False
+_text_generator = None
+_text_generator_ready = False
+
+# Generation backend for the current debate: None follows the usual Gemini-then-local
+# order, "local" sends every request to the local model (forks compare backends this way)
+BACKENDS = ("gemini", "local")
+_backend = contextvars.ContextVar("generation_backend", default=None)
+
+@contextmanager
+def backend_scope(backend):
+    """Generate with backend ("gemini", "local" or None for the default) inside the block"""
+    if backend is not None and backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    token = _backend.set(backend)
+    try:
+        yield
+    finally:
+        _backend.reset(token)
+
+def current_backend():
+    return _backend.get()
+
 # --- Gemini API Configuration ---
-try:
-    gemini_api_key = os.getenv("GEMINI_API_KEY")
-    if not gemini_api_key:
-        log_event("gemini_api_key_not_found")
-        gemini_model = None
-    else:
-        genai.configure(api_key=gemini_api_key)
-        gemini_model = genai.GenerativeModel('gemini-2.0-flash')
-except Exception as e:
-    log_event("gemini_configuration_error", {"error": str(e)})
-    gemini_model = None
+def get_gemini_model():
+    """Configure the Gemini client on first use and return it (None if unavailable)"""
+    global _gemini_model, _gemini_ready
+    if _gemini_ready:
+        return _gemini_model
+    with _backend_lock:
+        if _gemini_ready:
+            return _gemini_model
+        try:
+            gemini_api_key = os.getenv("GEMINI_API_KEY")
+            if not gemini_api_key:
+                log_event("gemini_api_key_not_found", {})
+                _gemini_model = None
+            else:
+                import google.generativeai as genai
+                genai.configure(api_key=gemini_api_key)
+                _gemini_model = genai.GenerativeModel('gemini-2.0-flash')
+        except Exception as e:
+            log_event("gemini_configuration_error", {"error": str(e)})
+            _gemini_model = None
+        _gemini_ready = True
+    return _gemini_model
 
-def gemini_generate(prompt, **kwargs):
+def _log_llm_call(backend, kind, started, ok):
+    """One line per backend request, used by log_analytics for per-backend latency"""
+    log_event("llm_call", {"debate_id": current_debate(), "backend": backend, "kind": kind, "ok": ok,
+                           "latency_ms": round((time.perf_counter() - started) * 1000, 1)})
+
+def gemini_generate(prompt, kind="default", **kwargs):
+    """Generate with Gemini; kind ("agent_turn", "memory_summary", ...) groups latencies for hedging
+    and sets the request's priority under the shared rate limit"""
+    if current_backend() == "local":
+        # flan-t5 takes no Gemini generation_config; structured turns are parsed and repaired instead
+        kwargs.pop("generation_config", None)
+        return hf_generate(prompt, kind, **kwargs)
+    if is_cancelled():
+        return "Error: debate cancelled."
+    gemini_model = get_gemini_model()
     if gemini_model is None:
         return "Error: Gemini API not configured."
-    try:
+    # Inside a deadline budget every request carries the time the node has left
+    timeout = request_timeout()
+    if timeout is not None and timeout < 0.1:
+        return "Error: deadline budget exhausted."
+    # Wait for a slot under the shared RPM/TPM quota (see rate_scheduler.py)
+    scheduler = get_scheduler()
+    tokens = estimate_tokens(prompt, kwargs)
+    debate = current_debate()
+    if scheduler is not None:
+        try:
+            waited = scheduler.acquire(kind, tokens, debate, timeout=timeout)
+        except QuotaTimeout as e:
+            log_event("gemini_quota_timeout", {"kind": kind, "error": str(e)})
+            return "Error: deadline budget exhausted while queued for the rate limit."
+        if waited >= 0.01:
+            log_event("rate_queue_wait", {"kind": kind, "wait_ms": round(waited * 1000, 1)})
+        timeout = request_timeout()
+    if timeout is not None:
+        kwargs["request_options"] = {"timeout": max(0.1, timeout)}
+    started = time.perf_counter()
+    
+    def call():
         response = gemini_model.generate_content(prompt, **kwargs)
+        if scheduler is not None:
+            scheduler.settle(tokens, usage_tokens(response))
         return response.text.strip()
+    
+    def duplicate():
+        # A same-backend hedge is another request against the quota; it only goes out if a slot is free
+        if not scheduler.try_acquire(kind, tokens, debate):
+            raise QuotaTimeout("no free slot for a hedge")
+        return call()
+    
+    try:
+        if hedging_enabled():
+            if hedge_backend() == "local":
+                alternate = lambda: hf_generate(prompt, kind)
+            else:
+                alternate = duplicate if scheduler is not None else None
+            text = hedged_call(kind, call, alternate, is_valid=lambda text: bool(text) and not text.startswith("Error"))
+        else:
+            text = call()
+        _log_llm_call("gemini", kind, started, True)
+        return text
     except Exception as e:
+        _log_llm_call("gemini", kind, started, False)
         log_event("gemini_generate_error", {"error": str(e)})
-        # Fallback to local model if available
-        if text_generator:
+        if scheduler is not None and is_rate_limit_error(e):
+            scheduler.throttle()
+        # Fallback to local model if available (and the deadline allows it); flan-t5 takes no
+        # Gemini generation_config, so a structured turn is parsed and repaired instead
+        kwargs.pop("request_options", None)
+        kwargs.pop("generation_config", None)
+        if request_timeout() != 0.0 and local_backend_ready():
             try:
-                return hf_generate(prompt, **kwargs)
+                return hf_generate(prompt, kind, **kwargs)
             except:
                 pass
         return f"Error generating text with Gemini: {e}"
 
+def gemini_embed(text):
+    """Embed text with Gemini; returns a list of floats, or None if Gemini is unavailable"""
+    if get_gemini_model() is None:
+        return None
+    try:
+        import google.generativeai as genai
+        result = genai.embed_content(model="models/text-embedding-004", content=text)
+        return list(result["embedding"])
+    except Exception as e:
+        log_event("gemini_embed_error", {"error": str(e)})
+        return None
+
+def warm_backend():
+    """Set up the generation backend ahead of the first real request.
+
+    Configures the Gemini client and issues a token count so the TLS connection
+    is already open when round 1 starts. The local pipeline is only a fallback,
+    so it is preloaded only when DEBATOR_PRELOAD_LOCAL_MODEL is set - in the
+    worker pool when DEBATOR_LOCAL_WORKERS is set, never in this process as well.
+    """
+    gemini_model = get_gemini_model()
+    if gemini_model is not None:
+        try:
+            gemini_model.count_tokens("warm-up")
+        except Exception as e:
+            log_event("gemini_warmup_error", {"error": str(e)})
+    if os.getenv("DEBATOR_PRELOAD_LOCAL_MODEL") and not daemon_running():
+        if configured_workers() > 0:
+            get_pool()
+        else:
+            get_text_generator()
+    return "gemini" if gemini_model is not None else "local"
+
 # --- Local Transformers Pipeline ---
-try:
-    MODEL_NAME = "google/flan-t5-base"
-    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-    model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
-    if tokenizer.pad_token_id is None:
-        tokenizer.pad_token_id = tokenizer.eos_token_id
-    text_generator = pipeline("text2text-generation", model=model, tokenizer=tokenizer, device=-1)
-except Exception as e:
-    log_event("pipeline_creation_error", {"error": str(e)})
-    text_generator = None
-
-def hf_generate(prompt, **kwargs):
+MODEL_NAME = "google/flan-t5-base"
+
+def get_text_generator():
+    """Load the local flan-t5 pipeline on first use and return it (None if unavailable)"""
+    global _text_generator, _text_generator_ready
+    if _text_generator_ready:
+        return _text_generator
+    with _backend_lock:
+        if _text_generator_ready:
+            return _text_generator
+        try:
+            from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+            tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+            model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+            if tokenizer.pad_token_id is None:
+                tokenizer.pad_token_id = tokenizer.eos_token_id
+            _text_generator = pipeline("text2text-generation", model=model, tokenizer=tokenizer, device=-1)
+        except Exception as e:
+            log_event("pipeline_creation_error", {"error": str(e)})
+            _text_generator = None
+        _text_generator_ready = True
+    return _text_generator
+
+def local_backend_ready():
+    """True when hf_generate can serve requests
+
+    The daemon and the worker pool hold the model in their own processes, so
+    neither loads it here; only in-process generation needs the pipeline.
+    """
+    return daemon_running() or configured_workers() > 0 or get_text_generator() is not None
+
+def hf_generate(prompt, kind=None, **kwargs):
+    if is_cancelled():
+        return "Error: debate cancelled."
+    timeout = request_timeout()
+    if timeout is not None and timeout < 0.1:
+        return "Error: deadline budget exhausted."
+    # A running local daemon already has the model loaded (see local_daemon.py)
+    if daemon_running():
+        started = time.perf_counter()
+        try:
+            text = daemon_generate(prompt, timeout=timeout, **kwargs)
+            _log_llm_call("local", kind, started, True)
+            return text
+        except DaemonUnavailable as e:
+            # Stale socket from a daemon that has exited; generate in-process instead
+            log_event("local_daemon_unavailable", {"error": str(e)})
+        except Exception as e:
+            _log_llm_call("local", kind, started, False)
+            log_event("hf_generate_error", {"error": str(e), "daemon": True})
+            return f"Error generating text: {e}"
+    # Dispatch to the worker processes when DEBATOR_LOCAL_WORKERS is set
+    if configured_workers() > 0:
+        started = time.perf_counter()
+        try:
+            text = pooled_generate(prompt, timeout=timeout, **kwargs)
+            _log_llm_call("local", kind, started, True)
+            return text
+        except Exception as e:
+            _log_llm_call("local", kind, started, False)
+            log_event("hf_generate_error", {"error": str(e), "pooled": True})
+            return f"Error generating text: {e}"
+    text_generator = get_text_generator()
     if text_generator is None:
         return "Error: text-generation pipeline not available."
+    started = time.perf_counter()
     try:
         out = text_generator(prompt, **kwargs)
+        _log_llm_call("local", kind, started, True)
         return out[0].get("generated_text", "").strip()
     except Exception as e:
+        _log_llm_call("local", kind, started, False)
         log_event("hf_generate_error", {"error": str(e)})
         return f"Error generating text: {e}"
 
@@ -76,6 +271,18 @@ def jaccard_similarity(a, b):
         return 0.0
     return len(sa & sb) / len(sa | sb)
 
+CONTENT_WORD_RE = re.compile(r"[a-z']{4,}")
+
+def turn_novelty(text, history):
+    """Share of a turn's content words (4+ letters) that no earlier turn used"""
+    words = set(CONTENT_WORD_RE.findall(text.lower()))
+    if not words:
+        return 0.0
+    seen = set()
+    for past in history:
+        seen.update(CONTENT_WORD_RE.findall(past.lower()))
+    return len(words - seen) / len(words)
+
 def clean_and_validate(text, prev_texts, max_words=80):
     if not text:
         return None
@@ -111,6 +318,9 @@ def clean_and_validate(text, prev_texts, max_words=80):
     
     return text
 
+# A schema-constrained reply rarely needs a second try
+STRUCTURED_ATTEMPTS = 2
+
 class ValidationError(Exception):
     pass
 
@@ -123,11 +333,44 @@ def validate_turn(text, seen_texts, max_words=80):
 class Agent:
     """Debate agent that generates arguments"""
     
-    def __init__(self, persona: str):
+    def __init__(self, persona: str, cache=None, guidance: str = None):
         self.persona = persona
+        # Replaces the persona's built-in prompt guidance (forks compare prompts this way)
+        self.guidance = guidance
+        # Optional ArgumentCache consulted for opening rounds
+        self.cache = cache
+        # Outcome of the last speak(): where the text came from and what the cache returned
+        self.last_source = None
+        self.cache_outcome = None
+        # Claims and rebuttal target of the last structured turn
+        self.last_turn = None
     
     def speak(self, topic: str, context: str = "", seen_texts: list = [], round_num: int = 1) -> str:
         """Generate an argument for the given topic"""
+        self.last_source = None
+        self.cache_outcome = None
+        self.last_turn = None
+        
+        # Warm start from the argument cache: reuse a near-identical past opening
+        # outright, or hand a similar one to the model as a seed
+        seed = None
+        if self.cache is not None and round_num <= self.cache.max_round:
+            try:
+                hit = self.cache.lookup(topic, self.persona, round_num)
+                self.cache_outcome = hit.kind
+                if hit.kind == "reuse":
+                    reused = clean_and_validate(hit.text, seen_texts, max_words=100)
+                    if reused:
+                        self.last_source = "cache"
+                        log_event("agent_speak_cache_reuse", {"persona": self.persona, "round": round_num,
+                                                              "similarity": hit.similarity, "text": reused})
+                        return reused
+                    self.cache_outcome = "seed"
+                if self.cache_outcome == "seed":
+                    seed = hit.text
+            except Exception as e:
+                log_event("argument_cache_error", {"persona": self.persona, "round": round_num, "error": str(e)})
+        
         # Build persona-specific prompts
         persona_prompts = {
             "Scientist": "Focus on evidence-based reasoning, technical aspects, safety, data, and empirical research.",
@@ -138,7 +381,7 @@ class Agent:
             "Doctor": "Focus on medical analogies, patient safety, clinical trials, and health outcomes."
         }
         
-        prompt_guidance = persona_prompts.get(self.persona, "Focus on providing a clear, reasoned argument.")
+        prompt_guidance = self.guidance or persona_prompts.get(self.persona, "Focus on providing a clear, reasoned argument.")
         
         # Build a more detailed prompt for better arguments
         round_context = ""
@@ -150,6 +393,11 @@ class Agent:
             round_context = "This is a later round. Strengthen your position with compelling evidence and reasoning."
         
         # Build prompt
+        mode = output_mode()
+        if mode == "json":
+            output_instruction = TURN_FORMAT
+        else:
+            output_instruction = "Output ONLY the argument text, no labels or metadata:"
         recent_exchange = ""
         if context:
             recent_exchange = "RECENT EXCHANGE:\n" + context + "\n"
@@ -171,21 +419,81 @@ TASK: Write a compelling argument (3-6 sentences, 40-80 words) that:
 {("PREVIOUS ARGUMENTS (avoid repeating): " + "; ".join(seen_texts[-3:]) if seen_texts else "This is the first argument.")}
 
 {recent_exchange}
+{("A STRONG ARGUMENT FROM A SIMILAR PAST DEBATE (adapt it to this exact topic, do not copy it): " + seed) if seed else ""}
 
-Write your argument now. Be substantive, thoughtful, and specific. Output ONLY the argument text, no labels or metadata:
+Write your argument now. Be substantive, thoughtful, and specific. {output_instruction}
 
 """
         
-        # Use Gemini by default
-        generator = gemini_generate
-        gen_params = {}
+        if mode == "json":
+            cleaned = self._speak_structured(prompt, seen_texts, round_num)
+        else:
+            cleaned = self._speak_text(prompt, seen_texts, round_num)
         
+        if cleaned and len(cleaned.split()) >= 10:
+            self.last_source = "llm"
+            return cleaned
+        else:
+            log_event("agent_speak_failed", {"debate_id": current_debate(), "persona": self.persona, "round": round_num,
+                                             "final_text": cleaned, "mode": mode})
+            # Return a better fallback with more substance
+            round_themes = {
+                1: f"As {self.persona}, I argue that {topic} requires careful analysis of {('empirical evidence and safety protocols' if self.persona == 'Scientist' else 'ethical implications and human values')}.",
+                2: f"As {self.persona}, I counter that {topic} involves complex considerations about {('systematic validation and risk assessment' if self.persona == 'Scientist' else 'autonomy and moral frameworks')}.",
+                3: f"As {self.persona}, I emphasize that {topic} demands {('rigorous scientific methodology and data-driven decision making' if self.persona == 'Scientist' else 'philosophical reflection on fundamental rights')}.",
+                4: f"As {self.persona}, I contend that {topic} raises {('critical questions about algorithmic bias and equitable outcomes' if self.persona == 'Scientist' else 'profound issues regarding human dignity and societal impact')}.",
+                5: f"As {self.persona}, I demonstrate that {topic} necessitates {('comprehensive testing protocols and evidence-based regulation' if self.persona == 'Scientist' else 'deep ethical reasoning and consideration of moral principles')}.",
+                6: f"As {self.persona}, I highlight that {topic} touches upon {('fundamental safety concerns and technical verification' if self.persona == 'Scientist' else 'core questions about freedom and human agency')}.",
+                7: f"As {self.persona}, I stress that {topic} requires {('systematic evaluation of empirical data and long-term consequences' if self.persona == 'Scientist' else 'careful examination of values and ethical frameworks')}.",
+                8: f"As {self.persona}, I conclude that {topic} ultimately depends on {('scientific rigor and evidence-based policy decisions' if self.persona == 'Scientist' else 'philosophical wisdom and respect for human autonomy')}."
+            }
+            fallback = round_themes.get(round_num, f"As {self.persona}, I believe {topic} demands thoughtful consideration of complex factors.")
+            self.last_source = "fallback"
+            return fallback
+    
+    def _speak_structured(self, prompt: str, seen_texts: list, round_num: int):
+        """Ask for a TURN_SCHEMA object (see structured_output.py); returns the argument, or None"""
+        self.last_turn = None
+        for attempt in range(STRUCTURED_ATTEMPTS):
+            if request_timeout() == 0.0:
+                log_event("agent_speak_deadline", {"persona": self.persona, "round": round_num, "attempt": attempt + 1})
+                break
+            try:
+                raw = gemini_generate(prompt, kind="agent_turn", generation_config=gemini_turn_config())
+            except Exception as e:
+                log_event("agent_speak_generation_error", {"persona": self.persona, "round": round_num, "error": str(e)})
+                continue
+            log_event("agent_speak_raw", {"persona": self.persona, "round": round_num, "raw_text": raw, "attempt": attempt + 1,
+                                          "mode": "json"})
+            turn, how = parse_turn(raw) if not raw.startswith("Error") else (None, "error")
+            if turn is not None and how != "json":
+                log_event("agent_speak_repaired", {"persona": self.persona, "round": round_num, "how": how})
+            # Schema-shaped output needs no cleanup; only a too-short or repeated argument is retried
+            argument = turn["argument"] if turn else ""
+            validated = clean_and_validate(argument, seen_texts, max_words=100) if len(argument.split()) >= 10 else None
+            if validated:
+                self.last_turn = {**turn, "argument": validated}
+                log_event("agent_speak_success", {"persona": self.persona, "round": round_num, "text": validated,
+                                                  "claims": turn["claims"], "rebuttal_target": turn["rebuttal_target"],
+                                                  "mode": "json"})
+                return validated
+            log_event("agent_speak_rejected", {"persona": self.persona, "round": round_num, "attempt": attempt + 1,
+                                               "reason": how if turn is None else "short_or_repeated"})
+        return None
+    
+    def _speak_text(self, prompt: str, seen_texts: list, round_num: int):
+        """Free-text generation with label stripping, padding and lenient acceptance (DEBATOR_AGENT_OUTPUT=text)"""
         raw = ""
         cleaned = None
         for attempt in range(3):  # Try 3 times
+            # Stop retrying once the node's deadline budget is spent
+            if request_timeout() == 0.0:
+                log_event("agent_speak_deadline", {"persona": self.persona, "round": round_num, "attempt": attempt + 1})
+                break
             try:
-                raw = generator(prompt, **gen_params)
-                log_event("agent_speak_raw", {"persona": self.persona, "round": round_num, "raw_text": raw, "attempt": attempt + 1})
+                raw = gemini_generate(prompt, kind="agent_turn")
+                log_event("agent_speak_raw", {"persona": self.persona, "round": round_num, "raw_text": raw, "attempt": attempt + 1,
+                                              "mode": "text"})
                 
                 if not raw or len(raw.strip()) < 10:
                     time.sleep(0.3)
@@ -255,23 +563,7 @@ Write your argument now. Be substantive, thoughtful, and specific. Output ONLY t
                 log_event("agent_speak_generation_error", {"persona": self.persona, "round": round_num, "error": str(e)})
                 time.sleep(0.5)
         
-        if cleaned and len(cleaned.split()) >= 10:
-            return cleaned
-        else:
-            log_event("agent_speak_failed", {"persona": self.persona, "round": round_num, "final_text": cleaned})
-            # Return a better fallback with more substance
-            round_themes = {
-                1: f"As {self.persona}, I argue that {topic} requires careful analysis of {('empirical evidence and safety protocols' if self.persona == 'Scientist' else 'ethical implications and human values')}.",
-                2: f"As {self.persona}, I counter that {topic} involves complex considerations about {('systematic validation and risk assessment' if self.persona == 'Scientist' else 'autonomy and moral frameworks')}.",
-                3: f"As {self.persona}, I emphasize that {topic} demands {('rigorous scientific methodology and data-driven decision making' if self.persona == 'Scientist' else 'philosophical reflection on fundamental rights')}.",
-                4: f"As {self.persona}, I contend that {topic} raises {('critical questions about algorithmic bias and equitable outcomes' if self.persona == 'Scientist' else 'profound issues regarding human dignity and societal impact')}.",
-                5: f"As {self.persona}, I demonstrate that {topic} necessitates {('comprehensive testing protocols and evidence-based regulation' if self.persona == 'Scientist' else 'deep ethical reasoning and consideration of moral principles')}.",
-                6: f"As {self.persona}, I highlight that {topic} touches upon {('fundamental safety concerns and technical verification' if self.persona == 'Scientist' else 'core questions about freedom and human agency')}.",
-                7: f"As {self.persona}, I stress that {topic} requires {('systematic evaluation of empirical data and long-term consequences' if self.persona == 'Scientist' else 'careful examination of values and ethical frameworks')}.",
-                8: f"As {self.persona}, I conclude that {topic} ultimately depends on {('scientific rigor and evidence-based policy decisions' if self.persona == 'Scientist' else 'philosophical wisdom and respect for human autonomy')}."
-            }
-            fallback = round_themes.get(round_num, f"As {self.persona}, I believe {topic} demands thoughtful consideration of complex factors.")
-            return fallback
+        return cleaned
 
 
 class MemoryNode:
@@ -308,7 +600,7 @@ Summarize these debate arguments in one sentence (max 20 words):
 """
         
         try:
-            summary = gemini_generate(prompt)
+            summary = gemini_generate(prompt, kind="memory_summary")
             if summary and len(summary.strip()) > 5:
                 return summary.strip()
         except Exception as e:
@@ -317,29 +609,80 @@ Summarize these debate arguments in one sentence (max 20 words):
         return ""
 
 
+# Words kept from a turn's first sentence in the judge's running notes
+NOTE_WORDS = 20
+
+
 class JudgeNode:
     """Judge that evaluates debate and determines winner"""
     
-    def __init__(self):
-        self.weighted_keywords = {
+    def __init__(self, weighted_keywords: dict = None, focus: str = None, generate=None, panel: bool = False):
+        self.weighted_keywords = weighted_keywords or {
             "AgentA": {"risk": 1.5, "safety": 1.5, "protocol": 1.5, "technical": 1, "verification": 1, "data": 1, "evidence": 1, "scientific": 1, "bias": 1, "testing": 1, "impact": 1, "policy": 1, "regulation": 1.5, "medicine": 1.5},
             "AgentB": {"autonomy": 1.5, "freedom": 1.5, "ethics": 1.5, "moral": 1.5, "dignity": 1, "philosophy": 1, "consciousness": 1, "agency": 1, "human": 1, "societal": 1, "rights": 1, "knowledge": 1, "wisdom": 1, "innovation": 1.5, "progress": 1.5}
         }
+        # Extra instruction for the rationale prompt (used by judge panels)
+        self.focus = focus
+        # Text generation backend for the rationale
+        self.generate = generate or gemini_generate
+        # Notes carry scores under the default lexicon; judges with their own lexicon rescore
+        self.default_lexicon = weighted_keywords is None
+        # Panel debates score every panelist against one combined lexicon, so no speaking position is favoured
+        self.panel = panel
+        self.shared_keywords = {}
+        for keywords in self.weighted_keywords.values():
+            self.shared_keywords.update(keywords)
+    
+    def note_turn(self, entry) -> dict:
+        """Score one turn and condense it into a short note as soon as it lands
+        
+        The notes feed live standings during the debate and replace the raw
+        transcript in the final rationale prompt.
+        """
+        text = entry["text"]
+        keywords = self._keywords_for(entry["agent"])
+        lowered = text.lower()
+        counts = {keyword: lowered.count(keyword) for keyword in keywords}
+        score = sum(count * keywords[keyword] for keyword, count in counts.items())
+        matched = sorted((k for k, c in counts.items() if c), key=lambda k: (-counts[k] * keywords[k], k))
+        claim = re.split(r'(?<=[.?!])\s+', text.strip(), maxsplit=1)[0]
+        words = claim.split()
+        if len(words) > NOTE_WORDS:
+            claim = " ".join(words[:NOTE_WORDS]) + "..."
+        return {"round": entry["round"], "agent": entry["agent"], "persona": entry["persona"],
+                "score": score, "keywords": matched[:3], "claim": claim}
     
-    def review(self, transcript: list, persona_a: str, persona_b: str, topic: str = "") -> dict:
-        """Review the debate and determine winner"""
+    def review(self, transcript: list, persona_a: str, persona_b: str, topic: str = "", notes: list = None) -> dict:
+        """Review the debate and determine winner
+        
+        notes from note_turn(), when they cover every turn, supply the default
+        judge's scores and the rationale prompt's summary of the debate.
+        """
         if not transcript:
             return None
+        if notes and {(n["round"], n["agent"]) for n in notes} != {(t["round"], t["agent"]) for t in transcript}:
+            notes = None
         
-        # Calculate scores
-        scores = self._calculate_scores(transcript)
+        # Calculate scores (already accumulated turn by turn when notes are available)
+        if notes and self.default_lexicon:
+            scores = {"AgentA": 0, "AgentB": 0}
+            for note in notes:
+                scores[note["agent"]] = scores.get(note["agent"], 0) + note["score"]
+        else:
+            scores = self._calculate_scores(transcript)
+        personas = {"AgentA": persona_a, "AgentB": persona_b}
+        for entry in transcript:
+            personas.setdefault(entry["agent"], entry["persona"])
         
-        # Determine winner
-        winner = "AgentA" if scores["AgentA"] > scores["AgentB"] else "AgentB"
-        winner_persona = persona_a if winner == "AgentA" else persona_b
+        # Determine winner: highest score, ties go to the later agent (AgentB in a two-agent debate)
+        winner = None
+        for agent in sorted(scores):
+            if winner is None or scores[agent] >= scores[winner]:
+                winner = agent
+        winner_persona = personas[winner]
         
         # Generate rationale
-        rationale = self._generate_rationale(transcript, scores, winner, winner_persona, topic)
+        rationale = self._generate_rationale(transcript, scores, winner, winner_persona, topic, notes)
         
         return {
             "winner": f"{winner_persona} ({winner})",
@@ -347,6 +690,12 @@ class JudgeNode:
             "scores": scores
         }
     
+    def _keywords_for(self, agent: str) -> dict:
+        # The two-agent debate scores each side against its own lexicon
+        if self.panel or agent not in self.weighted_keywords:
+            return self.shared_keywords
+        return self.weighted_keywords[agent]
+    
     def _calculate_scores(self, transcript: list) -> dict:
         """Calculate keyword-based scores for each agent"""
         scores = {"AgentA": 0, "AgentB": 0}
@@ -354,22 +703,31 @@ class JudgeNode:
         for entry in transcript:
             agent = entry["agent"]
             text = entry["text"].lower()
+            scores.setdefault(agent, 0)
             
-            if agent in self.weighted_keywords:
-                keywords = self.weighted_keywords[agent]
-                for keyword, weight in keywords.items():
-                    count = text.count(keyword)
-                    scores[agent] += count * weight
+            keywords = self._keywords_for(agent)
+            for keyword, weight in keywords.items():
+                count = text.count(keyword)
+                scores[agent] += count * weight
         
         return scores
     
-    def _generate_rationale(self, transcript: list, scores: dict, winner: str, winner_persona: str, topic: str = "") -> str:
+    def _generate_rationale(self, transcript: list, scores: dict, winner: str, winner_persona: str, topic: str = "",
+                            notes: list = None) -> str:
         """Generate rationale for the decision"""
         # Build summary of key arguments
         agent_a_args = [t['text'] for t in transcript if t['agent'] == 'AgentA']
         agent_b_args = [t['text'] for t in transcript if t['agent'] == 'AgentB']
         
-        transcript_text = "\n".join([f"[{t['persona']} Round {t['round']}]: {t['text']}" for t in transcript])
+        if notes:
+            # One compact line per turn instead of the full text of every argument
+            transcript_title = "DEBATE NOTES (key claim of each turn)"
+            transcript_text = "\n".join(
+                f"[{n['persona']} Round {n['round']}]: {n['claim']}" + (f" ({', '.join(n['keywords'])})" if n['keywords'] else "")
+                for n in sorted(notes, key=lambda n: n["round"]))
+        else:
+            transcript_title = "DEBATE TRANSCRIPT"
+            transcript_text = "\n".join([f"[{t['persona']} Round {t['round']}]: {t['text']}" for t in transcript])
         
         # Use provided topic or extract from transcript
         debate_topic = topic if topic else ("the debate topic")
@@ -380,10 +738,10 @@ class JudgeNode:
         prompt = f"""
 You are an impartial judge evaluating a debate on: "{debate_topic}"
 
-DEBATE TRANSCRIPT:
+{transcript_title}:
 {transcript_text}
 
-SCORES: AgentA scored {scores['AgentA']:.2f} points, AgentB scored {scores['AgentB']:.2f} points.
+SCORES: {", ".join(f"{agent} scored {score:.2f} points" for agent, score in sorted(scores.items()))}.
 WINNER: {winner_persona} ({winner})
 
 TASK: Write a clear, concise rationale (2-3 sentences) explaining the winner. 
@@ -391,12 +749,12 @@ TASK: Write a clear, concise rationale (2-3 sentences) explaining the winner.
 - Explain why {winner_persona} won based on argument quality, relevance, and persuasiveness
 - DO NOT repeat the scores or mention them directly
 - Focus on the quality of arguments, not numerical scores
-
+{f"- Pay particular attention to {self.focus}" if self.focus else ""}
 Output ONLY the rationale text, no labels or prefixes:
 """
         
         try:
-            raw_rationale = gemini_generate(prompt)
+            raw_rationale = self.generate(prompt, kind="judge_rationale")
             
             # Clean and validate rationale
             if raw_rationale and len(raw_rationale.strip()) > 20:
@@ -442,3 +800,64 @@ Output ONLY the rationale text, no labels or prefixes:
                 return f"{winner_persona} presented more convincing arguments with stronger evidence and clearer reasoning throughout the debate."
             else:
                 return f"{winner_persona} wins based on stronger argumentation and more relevant points during the debate."
+
+
+# --- Judge panel profiles ---
+# Each profile varies the lexicon, the rationale prompt or the backend so that
+# panel judges make (partly) independent errors.
+EVIDENCE_KEYWORDS = {"evidence": 1.5, "because": 1, "therefore": 1, "example": 1, "data": 1, "study": 1, "research": 1, "trial": 1, "precedent": 1, "consequence": 1, "risk": 1, "benefit": 1}
+REBUTTAL_KEYWORDS = {"however": 1.5, "counter": 1.5, "contrary": 1.5, "overlooks": 1.5, "ignores": 1.5, "although": 1, "whereas": 1, "yet": 1, "fails": 1, "but": 1}
+
+JUDGE_PROFILES = {
+    "keyword": {"weight": 1.0},
+    "evidence": {"keywords": EVIDENCE_KEYWORDS, "focus": "the quality of evidence and reasoning", "weight": 1.0},
+    "rebuttal": {"keywords": REBUTTAL_KEYWORDS, "focus": "how directly each side engaged with and rebutted the other", "weight": 1.0},
+    "local": {"backend": "local", "weight": 0.5},
+}
+
+
+def make_judge(name: str, panel: bool = False) -> JudgeNode:
+    """Build the JudgeNode for a named panel profile (panel: judging a panel debate)"""
+    profile = JUDGE_PROFILES[name]
+    keywords = profile.get("keywords")
+    return JudgeNode(
+        weighted_keywords={"AgentA": keywords, "AgentB": keywords} if keywords else None,
+        focus=profile.get("focus"),
+        generate=hf_generate if profile.get("backend") == "local" else gemini_generate,
+        panel=panel
+    )
+
+
+def aggregate_verdicts(results: list, personas: dict, method: str = "majority") -> dict:
+    """Combine panel judges' results into one verdict
+
+    majority: each judge's weight goes to the agent it picked; ties fall back to
+    the weighted score shares. weighted: only the weighted score shares count.
+    Scores are normalised per judge (share of that judge's total) so lexicons of
+    different sizes are comparable. The rationale comes from the highest-weight
+    judge that agrees with the final winner, so no extra LLM call is needed.
+    """
+    votes = {}
+    shares = {}
+    for result in results:
+        weight = JUDGE_PROFILES.get(result["judge"], {}).get("weight", 1.0)
+        votes[result["winner_agent"]] = votes.get(result["winner_agent"], 0) + weight
+        total = sum(result["scores"].values()) or 1
+        for agent, score in result["scores"].items():
+            shares[agent] = shares.get(agent, 0) + weight * score / total
+    
+    if method == "weighted":
+        winner = max(sorted(shares), key=lambda a: shares[a])
+    else:
+        winner = max(sorted(shares), key=lambda a: (votes.get(a, 0), shares[a]))
+    
+    agreeing = [r for r in results if r["winner_agent"] == winner] or results
+    spokesperson = max(agreeing, key=lambda r: JUDGE_PROFILES.get(r["judge"], {}).get("weight", 1.0))
+    return {
+        "winner": f"{personas.get(winner, winner)} ({winner})",
+        "rationale": spokesperson["rationale"],
+        "scores": {agent: round(share, 4) for agent, share in shares.items()},
+        "votes": votes,
+        "judges": [r["judge"] for r in results],
+        "method": method
+    }
@@ -0,0 +1,287 @@
+# rate_scheduler.py
+"""
+Process-wide rate scheduler for Gemini requests.
+
+Concurrent debates share one provider quota. With DEBATOR_GEMINI_RPM and/or
+DEBATOR_GEMINI_TPM set, every gemini_generate call first takes a slot from a
+requests-per-minute and a tokens-per-minute token bucket. The buckets refill at
+DEBATOR_RATE_HEADROOM (95%) of the quota and hold a burst of at most
+DEBATOR_RATE_BURST (5%) of it, so no 60-second window can exceed the quota.
+
+Waiting requests are served by priority class (judge rationale, then agent
+turns, then memory summaries), and within a class by fair queuing between
+debates: the debate that has been granted the fewest tokens goes first. A
+request's tokens are estimated from its prompt and output limit, then
+corrected from the response's usage metadata. A 429 drains the buckets so
+that the next requests back off instead of failing as well.
+
+scheduler_stats() reports queue waits per class, and the server's /metrics
+includes it.
+"""
+import os
+import time
+import itertools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    from .logger_util import log_event
+except ImportError:
+    from logger_util import log_event
+
+HEADROOM = float(os.getenv("DEBATOR_RATE_HEADROOM", "0.95"))
+BURST = float(os.getenv("DEBATOR_RATE_BURST", "0.05"))
+# Output tokens assumed for a request that sets no max_output_tokens
+DEFAULT_OUTPUT_TOKENS = int(os.getenv("DEBATOR_RATE_OUTPUT_TOKENS", "256"))
+CHARS_PER_TOKEN = 4
+
+# Lower is served first; kinds not listed queue with agent turns
+PRIORITY_CLASSES = {"judge_rationale": 0, "agent_turn": 1, "memory_summary": 2}
+CLASS_NAMES = {0: "judge_rationale", 1: "agent_turn", 2: "memory_summary"}
+DEFAULT_PRIORITY = 1
+WAIT_WINDOW = 500
+
+# Debate the current node belongs to, set by run_langgraph_debate
+_debate = contextvars.ContextVar("rate_debate", default=None)
+
+
+class QuotaTimeout(Exception):
+    """No slot became free before the caller's deadline"""
+
+
+@contextmanager
+def debate_scope(debate_id):
+    """Attribute every request made inside the block to debate_id for fair queuing"""
+    token = _debate.set(debate_id)
+    try:
+        yield
+    finally:
+        _debate.reset(token)
+
+
+def current_debate():
+    return _debate.get()
+
+
+def estimate_tokens(prompt, kwargs=None):
+    """Prompt tokens (about 4 characters each) plus the output the request may produce"""
+    config = (kwargs or {}).get("generation_config") or {}
+    limit = config.get("max_output_tokens") if isinstance(config, dict) else getattr(config, "max_output_tokens", None)
+    return len(prompt) // CHARS_PER_TOKEN + (limit or DEFAULT_OUTPUT_TOKENS)
+
+
+def usage_tokens(response):
+    """Total tokens billed for a Gemini response, or None when not reported"""
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None) or None
+
+
+def is_rate_limit_error(error):
+    text = f"{type(error).__name__} {error}"
+    return "ResourceExhausted" in text or "429" in text
+
+
+class TokenBucket:
+    """Refills at rate units/second up to capacity; may go into debt for oversized requests"""
+
+    def __init__(self, per_minute, headroom=HEADROOM, burst=BURST):
+        self.rate = per_minute * headroom / 60.0
+        self.capacity = max(1.0, per_minute * burst)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost, now):
+        """Seconds until cost can be taken (a request larger than the burst waits for a full bucket)"""
+        self._refill(now)
+        missing = min(cost, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, cost):
+        self.level -= cost
+
+    def drain(self):
+        self.level = min(self.level, 0.0)
+
+
+class _Ticket:
+    __slots__ = ("priority", "debate", "seq", "tokens", "enqueued")
+
+    def __init__(self, priority, debate, seq, tokens):
+        self.priority = priority
+        self.debate = debate
+        self.seq = seq
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+
+
+class RateScheduler:
+    """Admits requests under the RPM/TPM quota by priority, then fairly between debates"""
+
+    def __init__(self, rpm=0, tpm=0, headroom=HEADROOM, burst=BURST):
+        self.buckets = {}
+        if rpm:
+            self.buckets["requests"] = TokenBucket(rpm, headroom, burst)
+        if tpm:
+            self.buckets["tokens"] = TokenBucket(tpm, headroom, burst)
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        # Tokens granted per debate (its virtual time); a newly active debate starts at _virtual
+        self._served = {}
+        self._virtual = 0
+        self.granted = 0
+        self.tokens_estimated = 0
+        self.tokens_actual = 0
+        self.timeouts = 0
+        self.throttled = 0
+        self.skipped = 0
+        self._waits = {name: deque(maxlen=WAIT_WINDOW) for name in CLASS_NAMES.values()}
+        self._wait_totals = {name: [0, 0.0, 0.0] for name in CLASS_NAMES.values()}
+
+    def _head(self):
+        return min(self._waiting, key=lambda t: (t.priority, self._served.get(t.debate, 0), t.seq))
+
+    def _wait_time(self, tokens, now):
+        waits = [0.0]
+        if "requests" in self.buckets:
+            waits.append(self.buckets["requests"].wait_time(1, now))
+        if "tokens" in self.buckets:
+            waits.append(self.buckets["tokens"].wait_time(tokens, now))
+        return max(waits)
+
+    def _grant(self, ticket, now):
+        if "requests" in self.buckets:
+            self.buckets["requests"].take(1)
+        if "tokens" in self.buckets:
+            self.buckets["tokens"].take(ticket.tokens)
+        self._virtual = self._served.get(ticket.debate, 0)
+        self._served[ticket.debate] = self._virtual + ticket.tokens
+        self.granted += 1
+        self.tokens_estimated += ticket.tokens
+        waited = now - ticket.enqueued
+        name = CLASS_NAMES[ticket.priority]
+        self._waits[name].append(waited)
+        totals = self._wait_totals[name]
+        totals[0] += 1
+        totals[1] += waited
+        totals[2] = max(totals[2], waited)
+        if len(self._served) > 1024:
+            active = {t.debate for t in self._waiting}
+            self._served = {d: v for d, v in self._served.items() if d in active}
+        return waited
+
+    def acquire(self, kind, tokens, debate=None, timeout=None):
+        """Block until the request may be sent; returns the seconds spent queued
+
+        Raises QuotaTimeout if no slot is free within timeout seconds.
+        """
+        priority = PRIORITY_CLASSES.get(kind, DEFAULT_PRIORITY)
+        with self._cond:
+            ticket = _Ticket(priority, debate, next(self._seq), tokens)
+            if not any(t.debate == debate for t in self._waiting):
+                self._served[debate] = max(self._served.get(debate, 0), self._virtual)
+            self._waiting.append(ticket)
+            give_up = None if timeout is None else ticket.enqueued + timeout
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait_s = None
+                    if self._head() is ticket:
+                        wait_s = self._wait_time(tokens, now)
+                        if wait_s <= 0:
+                            return self._grant(ticket, now)
+                    if give_up is not None:
+                        if now >= give_up:
+                            self.timeouts += 1
+                            raise QuotaTimeout(f"no {kind} slot within {timeout:.1f}s")
+                        wait_s = min(wait_s if wait_s is not None else give_up - now, give_up - now)
+                    self._cond.wait(wait_s)
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+
+    def try_acquire(self, kind, tokens, debate=None):
+        """Take a slot only if one is free right now and nothing is queued (used for hedges)"""
+        with self._cond:
+            now = time.monotonic()
+            if self._waiting or self._wait_time(tokens, now) > 0:
+                self.skipped += 1
+                return False
+            ticket = _Ticket(PRIORITY_CLASSES.get(kind, DEFAULT_PRIORITY), debate, next(self._seq), tokens)
+            self._grant(ticket, now)
+            return True
+
+    def settle(self, estimated, actual):
+        """Correct the token bucket once the response reports what it really cost"""
+        if not actual:
+            return
+        with self._cond:
+            self.tokens_actual += actual
+            if "tokens" in self.buckets:
+                self.buckets["tokens"].take(actual - estimated)
+            self._cond.notify_all()
+
+    def throttle(self):
+        """The provider answered 429: empty the buckets so queued requests wait for a refill"""
+        with self._cond:
+            self.throttled += 1
+            for bucket in self.buckets.values():
+                bucket.drain()
+        log_event("rate_limited", {"throttled": self.throttled})
+
+    def stats(self):
+        with self._cond:
+            classes = {}
+            for name, waits in self._waits.items():
+                count, total, longest = self._wait_totals[name]
+                recent = sorted(waits)
+                classes[name] = {
+                    "requests": count,
+                    "wait_mean_ms": round(total / count * 1000, 1) if count else 0.0,
+                    "wait_p90_ms": round(recent[int(0.9 * (len(recent) - 1))] * 1000, 1) if recent else 0.0,
+                    "wait_max_ms": round(longest * 1000, 1),
+                }
+            return {
+                "granted": self.granted,
+                "queued": len(self._waiting),
+                "timeouts": self.timeouts,
+                "throttled": self.throttled,
+                "hedges_skipped": self.skipped,
+                "tokens_estimated": self.tokens_estimated,
+                "tokens_actual": self.tokens_actual,
+                "classes": classes,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def configured_limits():
+    """(requests/min, tokens/min) from DEBATOR_GEMINI_RPM / DEBATOR_GEMINI_TPM; 0 means unlimited"""
+    return int(os.getenv("DEBATOR_GEMINI_RPM", "0") or 0), int(os.getenv("DEBATOR_GEMINI_TPM", "0") or 0)
+
+
+def get_scheduler():
+    """Process-wide scheduler shared by every debate; None when no quota is configured"""
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+    rpm, tpm = configured_limits()
+    if not rpm and not tpm:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RateScheduler(rpm, tpm)
+        return _scheduler
+
+
+def scheduler_stats():
+    """Queue-wait metrics; None when the scheduler has not been used"""
+    return _scheduler.stats() if _scheduler is not None else None
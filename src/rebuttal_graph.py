@@ -0,0 +1,145 @@
+# rebuttal_graph.py
+"""
+Which earlier arguments each turn responds to.
+
+Every turn becomes a TF-IDF vector (sublinear term frequency, smoothed IDF,
+L2-normalised) over its content words, leaving out stop words and the words of
+the topic itself, since every turn shares those. The matrix is kept sparse
+both ways: rows of {term: weight} and, per term, a postings list of
+(turn, weight). Cosine similarities between all pairs of turns are then one
+sparse product X·Xᵀ, accumulated term by term over the postings. That way only
+pairs that share a word are ever touched, which keeps debates with hundreds
+of rounds fast without numpy.
+
+A structured turn names the opponent claim it answers (rebuttal_target). When
+that resolves to an earlier opposing turn - one of whose claims it repeats, or
+whose text it matches at least as well as the threshold - the turn gets that
+single declared edge. Otherwise a turn rebuts the earlier turns by other
+speakers whose similarity is at least DEBATOR_REBUTTAL_THRESHOLD (0.1),
+keeping the DEBATOR_REBUTTAL_MAX_TARGETS (2) most similar. dag_gen draws these
+edges and the records store keeps them in its rebuttals table.
+"""
+import os
+import math
+import re
+from collections import Counter
+
+THRESHOLD = float(os.getenv("DEBATOR_REBUTTAL_THRESHOLD", "0.1"))
+MAX_TARGETS = int(os.getenv("DEBATOR_REBUTTAL_MAX_TARGETS", "2"))
+
+TERM_RE = re.compile(r"[a-z][a-z'-]{2,}")
+STOP_WORDS = frozenset("""
+about above after again against also although among because been before being below between both but
+can cannot could does doing down during each either even ever every few for from further had has have
+having here how however into its itself just like made make many may might more most much must not now
+only other our ours out over own rather same shall should since some such than that the their theirs them
+then there these they this those through too under until upon very was were what when where whether which
+while who whom whose why will with within without would yet you your and are any all one it's
+argue argument claim indeed perspective point position round thus therefore
+""".split())
+
+
+def terms(text, exclude=frozenset()):
+    """Content words of text, lower-cased with a plural -s removed"""
+    words = []
+    for word in TERM_RE.findall(text.lower()):
+        word = word.strip("'-")
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        if len(word) >= 3 and word not in STOP_WORDS and word not in exclude:
+            words.append(word)
+    return words
+
+
+def tfidf_matrix(texts, exclude=frozenset()):
+    """(rows, postings): L2-normalised TF-IDF rows as {term: weight} and per-term [(row, weight)]"""
+    counts = [Counter(terms(text, exclude)) for text in texts]
+    df = Counter()
+    for row in counts:
+        df.update(row.keys())
+    n = len(texts)
+    idf = {term: math.log((1 + n) / (1 + d)) + 1 for term, d in df.items()}
+    rows = []
+    postings = {}
+    for index, row in enumerate(counts):
+        weights = {term: (1 + math.log(tf)) * idf[term] for term, tf in row.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        weights = {term: w / norm for term, w in weights.items()}
+        rows.append(weights)
+        for term, w in weights.items():
+            postings.setdefault(term, []).append((index, w))
+    return rows, postings
+
+
+def earlier_similarities(postings):
+    """Sparse X·Xᵀ below the diagonal: {later_turn: {earlier_turn: cosine}}"""
+    products = {}
+    for entries in postings.values():
+        # Postings are in turn order, so each pair is visited once as (earlier, later)
+        for k, (later, w_later) in enumerate(entries):
+            if k == 0:
+                continue
+            row = products.setdefault(later, {})
+            for earlier, w_earlier in entries[:k]:
+                row[earlier] = row.get(earlier, 0.0) + w_earlier * w_later
+    return products
+
+
+def _normalise(text):
+    return " ".join(TERM_RE.findall(text.lower()))
+
+
+def resolve_target(target, turns, rows, later, exclude=frozenset(), threshold=THRESHOLD):
+    """(similarity, index) of the earlier opposing turn a declared rebuttal target names, or None
+
+    A target that repeats one of a turn's claims resolves to it with similarity
+    1.0; otherwise it is scored against each turn's TF-IDF row (the cosine with
+    the target's terms, weighted equally) and the best match at or above
+    threshold wins.
+    """
+    agent = turns[later].get("agent")
+    opposing = [earlier for earlier in range(later) if turns[earlier].get("agent") != agent]
+    wanted = _normalise(target)
+    for earlier in reversed(opposing):
+        if wanted and wanted in {_normalise(claim) for claim in turns[earlier].get("claims") or []}:
+            return 1.0, earlier
+    words = set(terms(target, exclude))
+    if not words:
+        return None
+    scale = 1 / math.sqrt(len(words))
+    best = max(((sum(rows[earlier].get(word, 0.0) for word in words) * scale, earlier) for earlier in opposing),
+               default=None)
+    return best if best and best[0] >= threshold else None
+
+
+def extract_rebuttals(transcript, topic="", threshold=None, max_targets=None):
+    """Edges from each turn to the earlier opposing turns it responds to
+
+    Returns dicts with round/agent of the responding turn, target_round/
+    target_agent of the argument it answers, their similarity and whether the
+    turn declared the target itself.
+    """
+    threshold = THRESHOLD if threshold is None else threshold
+    max_targets = MAX_TARGETS if max_targets is None else max_targets
+    turns = list(transcript or [])
+    if len(turns) < 2:
+        return []
+    exclude = frozenset(terms(topic))
+    rows, postings = tfidf_matrix([turn["text"] for turn in turns], exclude=exclude)
+    similarities = earlier_similarities(postings)
+    edges = []
+    for later in range(1, len(turns)):
+        agent = turns[later]["agent"]
+        target = turns[later].get("rebuttal_target")
+        declared = resolve_target(target, turns, rows, later, exclude, threshold) if target else None
+        if declared:
+            candidates = [declared]
+        else:
+            candidates = sorted(((similarity, earlier) for earlier, similarity in similarities.get(later, {}).items()
+                                 if turns[earlier]["agent"] != agent and similarity >= threshold),
+                                reverse=True)[:max_targets]
+        for similarity, earlier in candidates:
+            edges.append({"round": turns[later]["round"], "agent": agent,
+                          "target_round": turns[earlier]["round"], "target_agent": turns[earlier]["agent"],
+                          "similarity": round(similarity, 4), "declared": bool(declared)})
+    return edges
@@ -0,0 +1,542 @@
+# records_store.py
+"""
+Indexed SQLite store for debate results.
+
+Every finished debate is written as one row in `debates`, one row per argument
+in `turns`, the judge's decision in `verdicts` with every agent's score in
+`verdict_scores` (panels have more than two), the earlier arguments each turn
+responds to in `rebuttals` (see rebuttal_graph.py) and any numeric
+measurements in `metrics`. A debate forked from another (see forking.py) gets
+a row in `forks` and stores only the turns after its fork round; transcript()
+reads the shared prefix from the parent. A fork whose parent is not in the
+store under that id (a graph thread id such as job-<id>) stores its prefix too. Reruns of a topic add a new debate instead of replacing the old one.
+Each saved debate's turns are also added to the full-text search index (see
+search_index.py) under the debate's id.
+
+Command line:
+    python src/records_store.py migrate [records_dir]   import existing records/<topic>/ folders
+    python src/records_store.py export --out DIR        write one Parquet file per table (needs pyarrow)
+    python src/records_store.py query --winner Philosopher --since 7d
+"""
+import sys
+import os
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timezone
+
+try:
+    from .logger_util import log_event
+    from .rebuttal_graph import extract_rebuttals
+    from .search_index import SearchIndex, index_path_for
+except ImportError:
+    from logger_util import log_event
+    from rebuttal_graph import extract_rebuttals
+    from search_index import SearchIndex, index_path_for
+
+DEFAULT_DB_PATH = os.getenv("DEBATOR_RECORDS_DB", os.path.join("records", "debates.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS debates (
+    id          TEXT PRIMARY KEY,
+    topic       TEXT NOT NULL,
+    persona_a   TEXT,
+    persona_b   TEXT,
+    started_at  REAL,
+    finished_at REAL,
+    source      TEXT,
+    error       TEXT
+);
+CREATE TABLE IF NOT EXISTS turns (
+    debate_id   TEXT NOT NULL REFERENCES debates(id),
+    round       INTEGER NOT NULL,
+    agent       TEXT NOT NULL,
+    persona     TEXT,
+    text        TEXT NOT NULL,
+    created_at  REAL,
+    claims      TEXT,
+    rebuttal_target TEXT,
+    PRIMARY KEY (debate_id, round, agent)
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    debate_id      TEXT PRIMARY KEY REFERENCES debates(id),
+    winner         TEXT,
+    winner_agent   TEXT,
+    winner_persona TEXT,
+    rationale      TEXT,
+    score_a        REAL,
+    score_b        REAL,
+    decided_at     REAL
+);
+CREATE TABLE IF NOT EXISTS verdict_scores (
+    debate_id   TEXT NOT NULL REFERENCES debates(id),
+    agent       TEXT NOT NULL,
+    persona     TEXT,
+    score       REAL,
+    PRIMARY KEY (debate_id, agent)
+);
+CREATE TABLE IF NOT EXISTS rebuttals (
+    debate_id    TEXT NOT NULL REFERENCES debates(id),
+    round        INTEGER NOT NULL,
+    agent        TEXT NOT NULL,
+    target_round INTEGER NOT NULL,
+    target_agent TEXT NOT NULL,
+    similarity   REAL,
+    declared     INTEGER,
+    PRIMARY KEY (debate_id, round, agent, target_round, target_agent)
+);
+CREATE TABLE IF NOT EXISTS forks (
+    debate_id   TEXT PRIMARY KEY REFERENCES debates(id),
+    parent_id   TEXT NOT NULL REFERENCES debates(id),
+    fork_round  INTEGER NOT NULL,
+    overrides   TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    debate_id   TEXT NOT NULL REFERENCES debates(id),
+    name        TEXT NOT NULL,
+    value       REAL,
+    PRIMARY KEY (debate_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_debates_topic ON debates(topic);
+CREATE INDEX IF NOT EXISTS idx_debates_persona_a ON debates(persona_a);
+CREATE INDEX IF NOT EXISTS idx_debates_persona_b ON debates(persona_b);
+CREATE INDEX IF NOT EXISTS idx_debates_finished_at ON debates(finished_at);
+CREATE INDEX IF NOT EXISTS idx_turns_persona ON turns(persona);
+CREATE INDEX IF NOT EXISTS idx_verdicts_winner ON verdicts(winner_persona, decided_at);
+CREATE INDEX IF NOT EXISTS idx_verdicts_decided_at ON verdicts(decided_at);
+CREATE INDEX IF NOT EXISTS idx_verdict_scores_persona ON verdict_scores(persona);
+CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics(name);
+CREATE INDEX IF NOT EXISTS idx_forks_parent ON forks(parent_id);
+"""
+
+# Columns added after the first release, created on databases that predate them
+ADDED_COLUMNS = {
+    "turns": [("claims", "TEXT"), ("rebuttal_target", "TEXT")],
+    "rebuttals": [("declared", "INTEGER")],
+}
+
+# Verdicts saved before verdict_scores existed kept only score_a/score_b; copy those over once
+BACKFILL_VERDICT_SCORES = """
+INSERT OR IGNORE INTO verdict_scores (debate_id, agent, persona, score)
+SELECT v.debate_id, 'AgentA', d.persona_a, v.score_a FROM verdicts v JOIN debates d ON d.id = v.debate_id
+WHERE v.score_a IS NOT NULL
+UNION ALL
+SELECT v.debate_id, 'AgentB', d.persona_b, v.score_b FROM verdicts v JOIN debates d ON d.id = v.debate_id
+WHERE v.score_b IS NOT NULL
+"""
+
+TABLES = ["debates", "turns", "verdicts", "verdict_scores", "rebuttals", "forks", "metrics"]
+
+
+def to_epoch(value):
+    """Convert an ISO timestamp (with or without a trailing Z) or number to epoch seconds"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.timestamp()
+    return parsed.astimezone(timezone.utc).timestamp()
+
+
+def split_winner(winner):
+    """Split a judge winner string like 'Scientist (AgentA)' into (persona, agent)"""
+    if winner and '(' in winner and ')' in winner:
+        return winner.split('(')[0].strip(), winner.split('(')[1].split(')')[0]
+    if winner in ['AgentA', 'AgentB']:
+        return None, winner
+    return None, None
+
+
+class RecordsStore:
+    """Thin wrapper around the SQLite records database"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, search_index=None):
+        """search_index: path of the full-text index (default next to path), or False to skip indexing"""
+        self.path = path
+        self.search_index = index_path_for(path) if search_index is None else search_index
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._connect() as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            conn.executescript(SCHEMA)
+            if "verdicts" in tables and "verdict_scores" not in tables:
+                conn.execute(BACKFILL_VERDICT_SCORES)
+            for table, columns in ADDED_COLUMNS.items():
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for name, kind in columns:
+                    if name not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def save_debate(self, final_state, debate_id=None, started_at=None, finished_at=None,
+                    metrics=None, source="cli"):
+        """Store a finished debate state; returns the debate id"""
+        debate_id = debate_id or uuid.uuid4().hex
+        finished_at = finished_at or time.time()
+        transcript = final_state.get("transcript", []) or []
+        winner = final_state.get("winner")
+        winner_persona, winner_agent = split_winner(winner)
+        scores = (final_state.get("summary") or {}).get("scores") or {}
+        rebuttals = extract_rebuttals(transcript, final_state.get("topic", ""))
+        # A fork keeps only its own turns (and the edges they start); the prefix stays with the parent.
+        # If the parent is not stored under fork["parent"], the prefix would be lost, so it is kept here
+        fork = final_state.get("fork")
+        if fork and self.debate(fork["parent"]) is None:
+            log_event("fork_parent_not_stored", {"id": debate_id, "parent": fork["parent"]})
+        elif fork:
+            transcript = [t for t in transcript if t["round"] > fork["round"]]
+            rebuttals = [e for e in rebuttals if e["round"] > fork["round"]]
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO debates VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (debate_id, final_state.get("topic", ""), final_state.get("persona_a"),
+                     final_state.get("persona_b"), started_at, finished_at, source, final_state.get("error")),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO turns (debate_id, round, agent, persona, text, created_at, claims, "
+                    "rebuttal_target) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(debate_id, t["round"], t["agent"], t.get("persona"), t["text"], to_epoch(t.get("timestamp")),
+                      json.dumps(t.get("claims")) if t.get("claims") else None, t.get("rebuttal_target"))
+                     for t in transcript],
+                )
+                if fork:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO forks VALUES (?, ?, ?, ?)",
+                        (debate_id, fork["parent"], fork["round"], json.dumps(fork.get("overrides") or {})),
+                    )
+                conn.execute("DELETE FROM rebuttals WHERE debate_id = ?", (debate_id,))
+                conn.executemany(
+                    "INSERT INTO rebuttals (debate_id, round, agent, target_round, target_agent, similarity, declared) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(debate_id, e["round"], e["agent"], e["target_round"], e["target_agent"], e["similarity"],
+                      int(e.get("declared", False))) for e in rebuttals],
+                )
+                if winner or final_state.get("rationale"):
+                    conn.execute(
+                        "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (debate_id, winner, winner_agent, winner_persona, final_state.get("rationale"),
+                         scores.get("AgentA"), scores.get("AgentB"), finished_at),
+                    )
+                    personas = {"AgentA": final_state.get("persona_a"), "AgentB": final_state.get("persona_b")}
+                    personas.update({t["agent"]: t.get("persona") for t in final_state.get("transcript") or []})
+                    conn.execute("DELETE FROM verdict_scores WHERE debate_id = ?", (debate_id,))
+                    conn.executemany(
+                        "INSERT INTO verdict_scores VALUES (?, ?, ?, ?)",
+                        [(debate_id, agent, personas.get(agent), score) for agent, score in sorted(scores.items())],
+                    )
+                if metrics:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?)",
+                        [(debate_id, name, value) for name, value in metrics.items()],
+                    )
+        finally:
+            conn.close()
+        if self.search_index:
+            # The debate is stored either way; a failed index update is repaired by `search_index.py rebuild`
+            try:
+                added = SearchIndex(self.search_index).add_debate(
+                    debate_id, {"topic": final_state.get("topic", ""), "transcript": transcript})
+                log_event("search_index_updated", {"id": debate_id, "turns_added": added})
+            except (sqlite3.Error, OSError) as e:
+                log_event("search_index_error", {"id": debate_id, "error": str(e)})
+        return debate_id
+
+    def add_metrics(self, debate_id, metrics):
+        """Attach extra numeric metrics to an existing debate"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?)",
+                    [(debate_id, name, value) for name, value in metrics.items()],
+                )
+        finally:
+            conn.close()
+
+    def query_verdicts(self, winner_persona=None, topic=None, persona=None, since=None, limit=100):
+        """Verdicts joined with their debates, newest first"""
+        sql = ("SELECT d.id, d.topic, d.persona_a, d.persona_b, v.winner, v.winner_persona, v.rationale, v.decided_at "
+               "FROM verdicts v JOIN debates d ON d.id = v.debate_id WHERE 1=1")
+        params = []
+        if winner_persona:
+            sql += " AND v.winner_persona = ?"
+            params.append(winner_persona)
+        if topic:
+            sql += " AND d.topic = ?"
+            params.append(topic)
+        if persona:
+            sql += " AND (d.persona_a = ? OR d.persona_b = ?)"
+            params.extend([persona, persona])
+        if since:
+            sql += " AND v.decided_at >= ?"
+            params.append(since)
+        sql += " ORDER BY v.decided_at DESC LIMIT ?"
+        params.append(limit)
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def debate(self, debate_id):
+        """The debates row of debate_id, or None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM debates WHERE id = ?", (debate_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def verdict(self, debate_id):
+        """The verdicts row of debate_id with "scores" ({agent: score}, every agent), or None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM verdicts WHERE debate_id = ?", (debate_id,)).fetchone()
+            scores = conn.execute("SELECT agent, score FROM verdict_scores WHERE debate_id = ? ORDER BY agent",
+                                  (debate_id,)).fetchall()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return dict(row, scores={agent: score for agent, score in scores})
+
+    def turns(self, debate_id):
+        """Turns stored for debate_id itself (for a fork, those after its fork round)"""
+        conn = self._connect()
+        try:
+            rows = [dict(row) for row in conn.execute(
+                "SELECT * FROM turns WHERE debate_id = ? ORDER BY round", (debate_id,))]
+        finally:
+            conn.close()
+        for row in rows:
+            row["claims"] = json.loads(row["claims"]) if row["claims"] else None
+        return rows
+
+    def fork_of(self, debate_id):
+        """{"parent_id", "fork_round", "overrides"} if debate_id is a fork, else None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM forks WHERE debate_id = ?", (debate_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"parent_id": row["parent_id"], "fork_round": row["fork_round"],
+                "overrides": json.loads(row["overrides"] or "{}")}
+
+    def forks(self, parent_id):
+        """Debates forked from parent_id, with their verdicts, by fork round"""
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(
+                "SELECT f.debate_id, f.fork_round, f.overrides, v.winner, v.score_a, v.score_b "
+                "FROM forks f LEFT JOIN verdicts v ON v.debate_id = f.debate_id "
+                "WHERE f.parent_id = ? ORDER BY f.fork_round, f.debate_id", (parent_id,))]
+        finally:
+            conn.close()
+
+    def transcript(self, debate_id):
+        """Full transcript of debate_id: a fork's own turns after the prefix it shares with its parent"""
+        own = self.turns(debate_id)
+        fork = self.fork_of(debate_id)
+        if fork is None:
+            return own
+        # Empty when the fork stored its own prefix (its parent was not in the store)
+        prefix = [t for t in self.transcript(fork["parent_id"])
+                  if t["round"] <= fork["fork_round"] and (not own or t["round"] < own[0]["round"])]
+        return prefix + own
+
+    def rebuttals(self, debate_id):
+        """Rebuttal edges of a debate, in turn order"""
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(
+                "SELECT * FROM rebuttals WHERE debate_id = ? ORDER BY round, similarity DESC", (debate_id,))]
+        finally:
+            conn.close()
+
+    def export_parquet(self, out_dir):
+        """Write each table to <out_dir>/<table>.parquet; returns the written paths"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        if not os.path.exists(out_dir):
+            os.makedirs(out_dir)
+        paths = []
+        conn = self._connect()
+        try:
+            for table in TABLES:
+                rows = [dict(row) for row in conn.execute(f"SELECT * FROM {table}")]
+                if rows:
+                    arrow_table = pa.Table.from_pylist(rows)
+                else:
+                    columns = [c[1] for c in conn.execute(f"PRAGMA table_info({table})")]
+                    arrow_table = pa.table({c: [] for c in columns})
+                path = os.path.join(out_dir, f"{table}.parquet")
+                pq.write_table(arrow_table, path)
+                paths.append(path)
+        finally:
+            conn.close()
+        return paths
+
+    # --- migration of the legacy records/<topic>/ folders ---
+
+    def import_records_dir(self, records_dir="records"):
+        """Import every records/<topic>/ folder; already imported debates are skipped"""
+        imported = 0
+        for name in sorted(os.listdir(records_dir)):
+            folder = os.path.join(records_dir, name)
+            if not os.path.isdir(folder):
+                continue
+            for debate in parse_legacy_folder(folder):
+                debate_id = hashlib.sha1(
+                    f"{debate['state']['topic']}|{debate['started_at']}".encode("utf-8")
+                ).hexdigest()[:32]
+                conn = self._connect()
+                try:
+                    exists = conn.execute("SELECT 1 FROM debates WHERE id = ?", (debate_id,)).fetchone()
+                finally:
+                    conn.close()
+                if exists:
+                    continue
+                self.save_debate(debate["state"], debate_id=debate_id, started_at=debate["started_at"],
+                                 finished_at=debate["finished_at"], source=f"migrated:{name}")
+                imported += 1
+        log_event("records_store_migrated", {"records_dir": records_dir, "imported": imported})
+        return imported
+
+
+SPEAK_EVENT_RE = re.compile(r"^agent_([a-z])_speak$")
+DAG_TURN_RE = re.compile(r"^\[Round (\d+)\] -> (.*) \((Agent\w)\)$")
+
+
+def parse_legacy_folder(folder):
+    """Rebuild debate states from a legacy folder's debate_log.txt (or debate_dag_dag.txt)"""
+    debates = []
+    log_path = os.path.join(folder, "debate_log.txt")
+    if os.path.exists(log_path):
+        current = None
+        with open(log_path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                event = entry.get("type")
+                payload = entry.get("payload") or {}
+                timestamp = to_epoch(entry.get("timestamp"))
+                if event == "debate_started":
+                    current = {
+                        "state": {"topic": payload.get("topic", ""), "persona_a": payload.get("persona_a"),
+                                  "persona_b": payload.get("persona_b"), "transcript": []},
+                        "started_at": timestamp, "finished_at": timestamp,
+                    }
+                    debates.append(current)
+                elif current is None:
+                    continue
+                elif SPEAK_EVENT_RE.match(event or ""):
+                    current["state"]["transcript"].append({
+                        "round": payload.get("round"),
+                        "agent": "Agent" + SPEAK_EVENT_RE.match(event).group(1).upper(),
+                        "persona": payload.get("persona"),
+                        "text": payload.get("text", ""),
+                        "timestamp": timestamp,
+                    })
+                    current["finished_at"] = timestamp
+                elif event == "judge_review_end":
+                    current["state"]["winner"] = payload.get("winner")
+                    current["state"]["rationale"] = payload.get("rationale")
+                    if payload.get("scores"):
+                        current["state"]["summary"] = {"scores": payload["scores"]}
+                    current["finished_at"] = timestamp
+        debates = [d for d in debates if d["state"]["transcript"]]
+    if debates:
+        return debates
+
+    dag_path = os.path.join(folder, "debate_dag_dag.txt")
+    if not os.path.exists(dag_path):
+        return []
+    state = {"topic": os.path.basename(folder), "transcript": []}
+    with open(dag_path, encoding="utf-8", errors="replace") as f:
+        lines = f.read().splitlines()
+    for i, line in enumerate(lines):
+        if line.startswith("Debate Topic: "):
+            state["topic"] = line[len("Debate Topic: "):].strip().strip("'")
+        match = DAG_TURN_RE.match(line)
+        if match and i + 1 < len(lines):
+            round_num, persona, agent = int(match.group(1)), match.group(2), match.group(3)
+            state["persona_a" if agent == "AgentA" else "persona_b"] = persona
+            state["transcript"].append({"round": round_num, "agent": agent, "persona": persona,
+                                        "text": lines[i + 1].strip()[1:-1]})
+        elif line.startswith("Winner: "):
+            state["winner"] = line[len("Winner: "):]
+        elif line.startswith("Rationale: "):
+            state["rationale"] = line[len("Rationale: "):]
+    if not state["transcript"]:
+        return []
+    modified = os.path.getmtime(dag_path)
+    return [{"state": state, "started_at": modified, "finished_at": modified}]
+
+
+def parse_since(value):
+    """Turn '7d', '12h' or '30m' into an epoch cutoff"""
+    units = {"d": 86400, "h": 3600, "m": 60}
+    if value[-1] in units:
+        return time.time() - float(value[:-1]) * units[value[-1]]
+    return to_epoch(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Debate records store")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="path to the SQLite database")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="import legacy records/<topic>/ folders")
+    migrate.add_argument("records_dir", nargs="?", default="records")
+    export = sub.add_parser("export", help="export tables to Parquet")
+    export.add_argument("--out", required=True)
+    query = sub.add_parser("query", help="list verdicts")
+    query.add_argument("--winner", help="winning persona")
+    query.add_argument("--topic")
+    query.add_argument("--persona", help="persona on either side")
+    query.add_argument("--since", help="e.g. 7d, 12h or an ISO timestamp")
+    query.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    store = RecordsStore(args.db)
+    if args.command == "migrate":
+        print(f"Imported {store.import_records_dir(args.records_dir)} debates into {args.db}")
+    elif args.command == "export":
+        try:
+            for path in store.export_parquet(args.out):
+                print(path)
+        except RuntimeError as e:
+            print(f"[Error] {e}")
+            sys.exit(1)
+    else:
+        since = parse_since(args.since) if args.since else None
+        rows = store.query_verdicts(args.winner, args.topic, args.persona, since, args.limit)
+        for row in rows:
+            when = datetime.fromtimestamp(row["decided_at"]).isoformat(timespec="seconds") if row["decided_at"] else "?"
+            print(f"{when}  {row['winner'] or 'Tie':<28} {row['topic']}")
+
+
+if __name__ == "__main__":
+    main()
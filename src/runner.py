@@ -1,6 +1,8 @@
 # src/runner.py
 import sys
 import os
+import json
+import time
 # Ensure src is in path if run directly, though usually run via app.py
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -9,34 +11,105 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
 # Use relative imports since this is inside the src package
 try:
-    from .logger_util import log_event, set_log_file
-    from .dag_gen import generate_debate_artifacts
-    from .langgraph_debate import run_langgraph_debate, generate_langgraph_dag
-    from .state import DebateState
-    from .nodes import ValidationError
+    from .logger_util import log_event, set_log_file, debate_log
+    from .warmup import wait_for_warmup
+    from .records_store import RecordsStore
 except ImportError:
     # Fallback for direct execution
-    from logger_util import log_event, set_log_file
-    from dag_gen import generate_debate_artifacts
-    from langgraph_debate import run_langgraph_debate, generate_langgraph_dag
-    from state import DebateState
-    from nodes import ValidationError
+    from logger_util import log_event, set_log_file, debate_log
+    from warmup import wait_for_warmup
+    from records_store import RecordsStore
 
-from rich.rule import Rule
-from rich.panel import Panel
 from rich.console import Console
-from IPython.display import Image
 
-def run_debate(topic, persona_a="Scientist", persona_b="Philosopher", debate_dir="."):
+
+def _load_debate_modules():
+    """Import the graph and artifact modules on demand.
+
+    langgraph, mermaid_cli and the model backends are only needed once a debate
+    actually starts, so they are kept off the import path of app.py.
+    """
+    try:
+        from .dag_gen import generate_debate_artifacts
+        from .langgraph_debate import run_langgraph_debate, generate_langgraph_dag
+    except ImportError:
+        from dag_gen import generate_debate_artifacts
+        from langgraph_debate import run_langgraph_debate, generate_langgraph_dag
+    return generate_debate_artifacts, run_langgraph_debate, generate_langgraph_dag
+
+
+def _debate_metrics(final_state, started_at):
+    """Numeric metrics stored alongside each debate in the records store"""
+    metrics = {
+        "duration_s": round(time.time() - started_at, 3),
+        "rounds": len(final_state.get("transcript", []))
+    }
+    cache_stats = final_state.get("cache_stats")
+    if cache_stats:
+        metrics["cache_lookups"] = cache_stats["lookups"]
+        metrics["cache_reused"] = cache_stats["reuse"]
+        metrics["cache_seeded"] = cache_stats["seed"]
+        metrics["cache_hit_rate"] = cache_stats.get("hit_rate", 0.0)
+    savings = final_state.get("early_termination")
+    if savings:
+        metrics["rounds_saved"] = savings["rounds_saved"]
+        metrics["llm_calls_saved"] = savings["llm_calls_saved"]
+    return metrics
+
+
+def run_debate_ndjson(topic, persona_a="Scientist", persona_b="Philosopher", debate_dir=".", participants=None,
+                      judges=None, convergence=None, deadline_s=None, out=None):
+    """Stream a debate's events to out (stdout) as NDJSON, one line per event, and return the final state
+
+    The rich view and diagrams are skipped; the debate log and the records
+    store (which also indexes the debate for search) are written as usual.
+    """
+    out = out or sys.stdout
+    started_at = time.time()
+    wait_for_warmup()
+    try:
+        from .langgraph_debate import stream_debate
+    except ImportError:
+        from langgraph_debate import stream_debate
+    final_state = None
+    with debate_log(os.path.join(debate_dir, "debate_log.txt")):
+        for event in stream_debate(topic, persona_a, persona_b, participants=participants, judges=judges,
+                                   convergence=convergence, deadline_s=deadline_s):
+            out.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+            out.flush()
+            if event.type == "debate_finished":
+                final_state = event.final_state
+        try:
+            debate_id = RecordsStore().save_debate(final_state, started_at=started_at, source="ndjson",
+                                                   metrics=_debate_metrics(final_state, started_at))
+            log_event("records_store_saved", {"debate_id": debate_id})
+        except Exception as e:
+            log_event("records_store_error", {"error": str(e)})
+    return final_state
+
+
+def run_debate(topic, persona_a="Scientist", persona_b="Philosopher", debate_dir=".", participants=None, judges=None,
+               convergence=None, deadline_s=None):
+    started_at = time.time()
     set_log_file(os.path.join(debate_dir, "debate_log.txt"))
     console = Console()
-    console.print(f"Starting debate between [bold green]{persona_a}[/bold green] (AgentA) and [bold yellow]{persona_b}[/bold yellow] (AgentB)...")
+    if participants and len(participants) > 2:
+        console.print(f"Starting panel debate between [bold cyan]{', '.join(participants)}[/bold cyan]...")
+    else:
+        participants = None
+        console.print(f"Starting debate between [bold green]{persona_a}[/bold green] (AgentA) and [bold yellow]{persona_b}[/bold yellow] (AgentB)...")
     console.print("[dim]Initializing debate system...[/dim]")
-    log_event("debate_started", {"topic": topic, "persona_a": persona_a, "persona_b": persona_b})
+    # Join the background warm-up (if app.py started one) so round 1 doesn't pay cold-start costs
+    warmup_stats = wait_for_warmup()
+    if warmup_stats:
+        log_event("warmup_joined", warmup_stats)
+    generate_debate_artifacts, run_langgraph_debate, generate_langgraph_dag = _load_debate_modules()
+    log_event("debate_started", {"topic": topic, "persona_a": persona_a, "persona_b": persona_b, "participants": participants})
 
     # Run the complete LangGraph debate with progressive display
     console.print("[dim]Beginning debate rounds...[/dim]\n")
-    final_state = run_langgraph_debate(topic, persona_a, persona_b, console=console)
+    final_state = run_langgraph_debate(topic, persona_a, persona_b, console=console, participants=participants, judges=judges,
+                                       convergence=convergence, deadline_s=deadline_s)
     
     if final_state:
         # Check for errors
@@ -48,7 +121,9 @@ def run_debate(topic, persona_a="Scientist", persona_b="Philosopher", debate_dir
             "winner": final_state.get("winner"),
             "rationale": final_state.get("rationale"),
             "persona_a": final_state.get("persona_a"),
-            "persona_b": final_state.get("persona_b")
+            "persona_b": final_state.get("persona_b"),
+            "participants": final_state.get("participants"),
+            "judge_votes": (final_state.get("summary") or {}).get("votes")
         }
         
         # Generate LangGraph DAG diagram using built-in methods
@@ -99,5 +174,16 @@ def run_debate(topic, persona_a="Scientist", persona_b="Philosopher", debate_dir
         # Generate debate artifacts
         generate_debate_artifacts(final_state, os.path.join(debate_dir, "debate_dag"))
         
+        # Keep every run in the indexed records store (the topic folder is overwritten on reruns)
+        try:
+            summary["debate_id"] = RecordsStore().save_debate(
+                final_state,
+                started_at=started_at,
+                metrics=_debate_metrics(final_state, started_at)
+            )
+            log_event("records_store_saved", {"debate_id": summary["debate_id"]})
+        except Exception as e:
+            log_event("records_store_error", {"error": str(e)})
+        
         return summary
     return None
@@ -0,0 +1,199 @@
+# search_index.py
+"""
+BM25-ranked full-text index over every argument ever produced.
+
+The index is an SQLite FTS5 table (an incrementally maintained inverted index)
+next to the records database (records/search_index.db). RecordsStore.save_debate
+adds each debate's turns to it under the debate's id, so every debate that is
+stored - from the CLI, the server, the job queue, tournaments or forks - is
+searchable, results point back to the records store, and saving a debate again
+replaces its turns instead of adding a second copy. Lookups never have to scan
+the JSON logs.
+
+Command line:
+    python src/search_index.py search "clinical trials" [--persona Scientist] [--limit 10]
+    python src/search_index.py rebuild [--records-db records/debates.db]
+"""
+import os
+import argparse
+import re
+import sqlite3
+import time
+
+try:
+    from .logger_util import log_event
+except ImportError:
+    from logger_util import log_event
+
+DEFAULT_INDEX_PATH = os.getenv("DEBATOR_SEARCH_INDEX", os.path.join("records", "search_index.db"))
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+    text,
+    topic,
+    persona,
+    agent UNINDEXED,
+    round UNINDEXED,
+    debate_id UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS indexed_debates (
+    debate_id  TEXT PRIMARY KEY,
+    topic      TEXT,
+    indexed_at REAL
+);
+"""
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def index_path_for(records_db):
+    """DEBATOR_SEARCH_INDEX if set, else search_index.db next to a records database"""
+    if os.getenv("DEBATOR_SEARCH_INDEX"):
+        return os.getenv("DEBATOR_SEARCH_INDEX")
+    return os.path.join(os.path.dirname(os.path.abspath(records_db)), "search_index.db")
+
+
+def build_match_query(query, phrase=False):
+    """Turn free text into an FTS5 MATCH expression restricted to the argument text"""
+    tokens = TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return None
+    if phrase:
+        return 'text : "' + " ".join(tokens) + '"'
+    # OR semantics: BM25 ranks turns that match more (and rarer) terms first
+    return "text : (" + " OR ".join(f'"{t}"' for t in tokens) + ")"
+
+
+class SearchIndex:
+    """Inverted index of debate turns with BM25 ranking"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._connect() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(indexed_debates)")}
+            if "debate_key" in columns:
+                # Indexes keyed by content hash predate the records store ids; `rebuild` refills this one
+                conn.executescript("DROP TABLE IF EXISTS turns_fts; DROP TABLE indexed_debates;")
+                log_event("search_index_reset", {"path": path})
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add_debate(self, debate_id, final_state):
+        """Index the turns of a debate under its records store id, replacing any indexed before
+
+        Returns the number of turns indexed.
+        """
+        transcript = final_state.get("transcript", []) or []
+        topic = final_state.get("topic", "")
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM turns_fts WHERE debate_id = ?", (debate_id,))
+                conn.executemany(
+                    "INSERT INTO turns_fts (text, topic, persona, agent, round, debate_id) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(t["text"], topic, t.get("persona") or "", t.get("agent", ""), t.get("round"), debate_id)
+                     for t in transcript],
+                )
+                conn.execute("INSERT OR REPLACE INTO indexed_debates VALUES (?, ?, ?)", (debate_id, topic, time.time()))
+        finally:
+            conn.close()
+        return len(transcript)
+
+    def indexed(self, debate_id):
+        """True if debate_id has been added"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT 1 FROM indexed_debates WHERE debate_id = ?", (debate_id,)).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+
+    def search(self, query, limit=10, persona=None, topic=None, phrase=False):
+        """Return the best matching turns, best first, with their BM25 score"""
+        match = build_match_query(query, phrase)
+        if not match:
+            return []
+        sql = ("SELECT text, topic, persona, agent, round, debate_id, bm25(turns_fts) AS score "
+               "FROM turns_fts WHERE turns_fts MATCH ?")
+        params = [match]
+        if persona:
+            sql += " AND persona = ?"
+            params.append(persona)
+        if topic:
+            sql += " AND topic = ?"
+            params.append(topic)
+        # FTS5's bm25() is negated: lower means a better match
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        conn = self._connect()
+        try:
+            rows = [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+        for row in rows:
+            row["score"] = -row["score"]
+        return rows
+
+    def rebuild_from_store(self, records_db):
+        """Index every debate in a records store database (see records_store.py) that is not indexed yet"""
+        source = sqlite3.connect(records_db)
+        source.row_factory = sqlite3.Row
+        added = 0
+        try:
+            for debate in source.execute("SELECT id, topic FROM debates"):
+                if self.indexed(debate["id"]):
+                    continue
+                # A fork's stored turns are its own; the prefix is indexed with the parent
+                turns = [dict(t) for t in source.execute(
+                    "SELECT round, agent, persona, text FROM turns WHERE debate_id = ? ORDER BY round", (debate["id"],))]
+                added += self.add_debate(debate["id"], {"topic": debate["topic"], "transcript": turns})
+        finally:
+            source.close()
+        return added
+
+
+def search(query, limit=10, persona=None, topic=None, phrase=False, path=DEFAULT_INDEX_PATH):
+    """Search all archived arguments; see SearchIndex.search"""
+    return SearchIndex(path).search(query, limit=limit, persona=persona, topic=topic, phrase=phrase)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search every archived debate argument")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="path to the search index database")
+    sub = parser.add_subparsers(dest="command", required=True)
+    find = sub.add_parser("search", help="BM25-ranked search over all turns")
+    find.add_argument("query")
+    find.add_argument("--persona")
+    find.add_argument("--topic")
+    find.add_argument("--phrase", action="store_true", help="match the words as an exact phrase")
+    find.add_argument("--limit", type=int, default=10)
+    rebuild = sub.add_parser("rebuild", help="index every debate in the records store not indexed yet")
+    rebuild.add_argument("--records-db", default=os.path.join("records", "debates.db"))
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index)
+    if args.command == "rebuild":
+        print(f"Indexed {index.rebuild_from_store(args.records_db)} turns into {args.index}")
+        return
+
+    start = time.perf_counter()
+    results = index.search(args.query, limit=args.limit, persona=args.persona, topic=args.topic, phrase=args.phrase)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for row in results:
+        text = row["text"] if len(row["text"]) <= 160 else row["text"][:157] + "..."
+        print(f"{row['score']:6.2f}  [{row['topic']}] Round {row['round']} {row['persona']} ({row['agent']})")
+        print(f"        {text}")
+    print(f"{len(results)} results in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
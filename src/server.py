@@ -0,0 +1,347 @@
+# server.py
+"""
+Long-running HTTP server that runs debates concurrently and streams rounds over SSE.
+
+Endpoints:
+    POST /debates                {"topic", "persona_a", "persona_b"} -> 202 {"id", "events_url"}
+    GET  /debates/<id>           job status and, once finished, the judge's summary
+    GET  /debates/<id>/events    Server-Sent Events: "round", "standings", "verdict", then "end"
+    GET  /metrics                queue depth, running/completed/rejected counters, hedge counters,
+                                 rate-limit queue waits
+    GET  /healthz                liveness check
+
+The compiled graph and the generation backend are warmed once at startup and
+shared by every debate; each job gets its own checkpointer thread id.
+
+Finished jobs (and their event history) are kept in memory for
+DEBATOR_SERVER_JOB_TTL_S seconds, and at most DEBATOR_SERVER_MAX_FINISHED of
+them. After that their ids answer 410 Gone; the results stay in the records
+store under the same id.
+"""
+import sys
+import os
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from .logger_util import log_event
+    from .records_store import RecordsStore
+except ImportError:
+    from logger_util import log_event
+    from records_store import RecordsStore
+# Same module object that nodes.py (imported bare) records the hedges in
+from hedging import hedge_stats
+from rate_scheduler import scheduler_stats
+
+MAX_BODY_BYTES = 64 * 1024
+JOB_TTL_S = float(os.getenv("DEBATOR_SERVER_JOB_TTL_S", "600"))
+MAX_FINISHED_JOBS = int(os.getenv("DEBATOR_SERVER_MAX_FINISHED", "256"))
+
+
+class DebateJob:
+    """A queued or running debate and the events it has produced so far"""
+
+    def __init__(self, topic, persona_a, persona_b):
+        self.id = uuid.uuid4().hex[:12]
+        self.topic = topic
+        self.persona_a = persona_a
+        self.persona_b = persona_b
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.summary = None
+        self.events = []
+        self.subscribers = set()
+
+    def publish(self, event_type, payload):
+        """Record an event and hand it to every connected SSE client (loop thread only)"""
+        event = (len(self.events), event_type, payload)
+        self.events.append(event)
+        for queue in list(self.subscribers):
+            queue.put_nowait(event)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "persona_a": self.persona_a,
+            "persona_b": self.persona_b,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "summary": self.summary,
+        }
+
+
+class DebateServer:
+    """Admission-controlled debate runner behind a minimal asyncio HTTP/1.1 front end"""
+
+    def __init__(self, max_concurrent=4, max_queue=32, records_db=None, job_ttl_s=JOB_TTL_S,
+                 max_finished=MAX_FINISHED_JOBS):
+        self.store = RecordsStore(records_db) if records_db else RecordsStore()
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.jobs = {}
+        # Finished job ids, oldest first, until evict_finished() drops them from self.jobs
+        self.finished = OrderedDict()
+        self.job_ttl_s = job_ttl_s
+        self.max_finished = max(0, max_finished)
+        self.evicted = 0
+        self.workers = []
+        self.queue = None
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="debate")
+        self.loop = None
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    # --- debate execution ---
+
+    def _warm(self):
+        try:
+            from .langgraph_debate import create_debate_graph
+        except ImportError:
+            from langgraph_debate import create_debate_graph
+        from nodes import warm_backend
+        create_debate_graph()
+        return warm_backend()
+
+    def _run_job(self, job):
+        """Run one debate on an executor thread, forwarding stream events to the loop"""
+        try:
+            from .langgraph_debate import run_langgraph_debate
+        except ImportError:
+            from langgraph_debate import run_langgraph_debate
+
+        def on_event(event_type, payload):
+            self.loop.call_soon_threadsafe(job.publish, event_type, payload)
+
+        final_state = run_langgraph_debate(
+            job.topic, job.persona_a, job.persona_b,
+            thread_id=f"debate-{job.id}", on_event=on_event
+        )
+        try:
+            self.store.save_debate(final_state, debate_id=job.id, started_at=job.started_at, source="server",
+                                   metrics={"duration_s": round(time.time() - job.started_at, 3),
+                                            "queue_wait_s": round(job.started_at - job.created_at, 3)})
+        except Exception as e:
+            log_event("records_store_error", {"id": job.id, "error": str(e)})
+        return final_state
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            self.running += 1
+            try:
+                final_state = await self.loop.run_in_executor(self.executor, self._run_job, job)
+                job.summary = {
+                    "winner": final_state.get("winner"),
+                    "rationale": final_state.get("rationale"),
+                    "error": final_state.get("error"),
+                    "rounds": len(final_state.get("transcript", [])),
+                }
+                job.status = "failed" if final_state.get("error") else "done"
+            except Exception as e:
+                log_event("server_job_error", {"id": job.id, "error": str(e)})
+                job.summary = {"error": str(e)}
+                job.status = "failed"
+            finally:
+                self.running -= 1
+                job.finished_at = time.time()
+                if job.status == "done":
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                job.publish("end", {"status": job.status, "summary": job.summary})
+                self.finished[job.id] = job.finished_at
+                self.evict_finished()
+                self.queue.task_done()
+
+    def evict_finished(self, now=None):
+        """Forget finished jobs past the TTL or beyond the cap (loop thread only)"""
+        now = now or time.time()
+        while self.finished:
+            job_id, finished_at = next(iter(self.finished.items()))
+            if len(self.finished) <= self.max_finished and now - finished_at < self.job_ttl_s:
+                break
+            del self.finished[job_id]
+            self.jobs.pop(job_id, None)
+            self.evicted += 1
+
+    def submit(self, topic, persona_a, persona_b):
+        """Queue a debate; returns None when admission control rejects it"""
+        job = DebateJob(topic, persona_a, persona_b)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            log_event("server_job_rejected", {"queue_depth": self.queue.qsize()})
+            return None
+        self.jobs[job.id] = job
+        log_event("server_job_queued", {"id": job.id, "topic": topic, "queue_depth": self.queue.qsize()})
+        return job
+
+    def metrics(self):
+        self.evict_finished()
+        return {
+            "queue_depth": self.queue.qsize(),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "jobs_in_memory": len(self.jobs),
+            "evicted": self.evicted,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "hedging": hedge_stats(),
+            "rate_limits": scheduler_stats(),
+        }
+
+    # --- HTTP handling ---
+
+    async def _send(self, writer, status, body, content_type="application/json", extra_headers=None):
+        reasons = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                   405: "Method Not Allowed", 410: "Gone", 413: "Payload Too Large", 503: "Service Unavailable"}
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        headers.extend(extra_headers or [])
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _stream_events(self, writer, job):
+        """Replay past events, then stream new ones until the job ends"""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n"
+        )
+        queue = asyncio.Queue()
+        for event in job.events:
+            queue.put_nowait(event)
+        job.subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    event_id, event_type, payload = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    writer.write(b": keep-alive\n\n")
+                    await writer.drain()
+                    continue
+                data = json.dumps(payload, ensure_ascii=False)
+                writer.write(f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n".encode("utf-8"))
+                await writer.drain()
+                if event_type == "end":
+                    break
+        finally:
+            job.subscribers.discard(queue)
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0) or 0)
+            if length > MAX_BODY_BYTES:
+                await self._send(writer, 413, {"error": "request body too large"})
+                return
+            body = await reader.readexactly(length) if length else b""
+            await self._route(writer, method, path.split("?", 1)[0], body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            log_event("server_request_error", {"error": str(e)})
+            try:
+                await self._send(writer, 400, {"error": str(e)})
+            except Exception:
+                pass
+        finally:
+            writer.close()
+
+    async def _route(self, writer, method, path, body):
+        parts = [p for p in path.split("/") if p]
+        if path == "/healthz":
+            await self._send(writer, 200, {"status": "ok"})
+        elif path == "/metrics":
+            await self._send(writer, 200, self.metrics())
+        elif parts == ["debates"]:
+            if method != "POST":
+                await self._send(writer, 405, {"error": "use POST"})
+                return
+            request = json.loads(body or b"{}")
+            topic = (request.get("topic") or "").strip()
+            if not topic:
+                await self._send(writer, 400, {"error": "topic is required"})
+                return
+            job = self.submit(topic, request.get("persona_a") or "Scientist", request.get("persona_b") or "Philosopher")
+            if job is None:
+                await self._send(writer, 503, {"error": "debate queue is full", **self.metrics()},
+                                 extra_headers=["Retry-After: 5"])
+                return
+            await self._send(writer, 202, {"id": job.id, "events_url": f"/debates/{job.id}/events"})
+        elif len(parts) in (2, 3) and parts[0] == "debates" and parts[1] not in self.jobs:
+            self.evict_finished()
+            if self.store.debate(parts[1]) is not None:
+                # Evicted from memory; the result is in the records store
+                await self._send(writer, 410, {"error": "debate finished and was evicted from the server",
+                                               "id": parts[1]})
+            else:
+                await self._send(writer, 404, {"error": "not found"})
+        elif len(parts) in (2, 3) and parts[0] == "debates":
+            job = self.jobs[parts[1]]
+            if len(parts) == 2:
+                await self._send(writer, 200, job.to_dict())
+            elif parts[2] == "events":
+                await self._stream_events(writer, job)
+            else:
+                await self._send(writer, 404, {"error": "not found"})
+        else:
+            await self._send(writer, 404, {"error": "not found"})
+
+    async def start(self, host="127.0.0.1", port=8000):
+        """Warm up, start the workers and listen; returns the asyncio server (port 0 picks a free port)"""
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        backend = await self.loop.run_in_executor(self.executor, self._warm)
+        log_event("server_warm", {"backend": backend})
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrent)]
+        server = await asyncio.start_server(self.handle, host, port)
+        log_event("server_started", {"host": host, "port": server.sockets[0].getsockname()[1],
+                                     "max_concurrent": self.max_concurrent, "max_queue": self.max_queue})
+        return server
+
+    def stop(self):
+        for task in self.workers:
+            task.cancel()
+        self.executor.shutdown(wait=False)
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.stop()
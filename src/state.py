@@ -1,15 +1,128 @@
-from typing import TypedDict, List, Optional
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TypedDict, List, Dict, Optional, Annotated
+
+
+@dataclass(slots=True)
+class Turn:
+    """One argument in the transcript.
+
+    Slotted, with interned agent/persona strings and a float timestamp, since a
+    copy of every turn lives in each retained checkpoint. Read access mirrors
+    the dict entries used before (turn["text"], turn.get("persona")), so
+    consumers of the transcript need not care which one they get.
+    """
+    round: int
+    agent: str
+    persona: str
+    text: str
+    ts: float
+    cache: Optional[str] = None # argument cache outcome for openings run in a fan-out
+    claims: Optional[List[str]] = None # distinct claims, from a structured (JSON) turn
+    rebuttal_target: Optional[str] = None # the opposing claim this turn answers, as the model stated it
+
+    def __post_init__(self):
+        self.agent = sys.intern(self.agent)
+        self.persona = sys.intern(self.persona)
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.ts).isoformat()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __contains__(self, key):
+        return key in TURN_FIELDS
+
+    def to_dict(self) -> dict:
+        return {"round": self.round, "agent": self.agent, "persona": self.persona,
+                "text": self.text, "timestamp": self.timestamp,
+                "claims": self.claims, "rebuttal_target": self.rebuttal_target}
+
+
+TURN_FIELDS = ("round", "agent", "persona", "text", "timestamp", "claims", "rebuttal_target")
+
+
+def seen_texts(transcript: List[Turn]) -> List[str]:
+    """Texts spoken so far, derived from the transcript instead of stored twice"""
+    return [turn["text"] for turn in transcript]
+
+
+def merge_transcript(left: List[dict], right: List[dict]) -> List[dict]:
+    """Reducer for the transcript channel.
+
+    Entries are keyed by (round, agent), so nodes that return the full state and
+    parallel opening statements that each return a single entry both merge
+    cleanly. An empty update resets the transcript (used by user_input_node).
+    """
+    if not right:
+        return []
+    merged = {}
+    for entry in (left or []) + right:
+        merged[(entry["round"], entry["agent"])] = entry
+    return sorted(merged.values(), key=lambda e: e["round"])
+
+
+def merge_judge_results(left: List[dict], right: List[dict]) -> List[dict]:
+    """Reducer for the judge panel's results, keyed by judge name.
+
+    Parallel judge_worker nodes each return one result, or no update at all when
+    they fail; an empty update resets the list (a new run on the thread), as
+    with merge_transcript.
+    """
+    if not right:
+        return []
+    merged = {}
+    for result in (left or []) + right:
+        merged[result["judge"]] = result
+    return list(merged.values())
+
+
+def merge_judge_notes(left: List[dict], right: List[dict]) -> List[dict]:
+    """Reducer for the judge's running notes, keyed by (round, agent) like the transcript.
+
+    An empty update resets the list, as with merge_transcript.
+    """
+    if not right:
+        return []
+    merged = {}
+    for note in (left or []) + right:
+        merged[(note["round"], note["agent"])] = note
+    return sorted(merged.values(), key=lambda n: n["round"])
+
 
 class DebateState(TypedDict):
     topic: str
     persona_a: str
     persona_b: str
     round: int
-    transcript: List[dict]
-    seen_texts: List[str]
+    transcript: Annotated[List[dict], merge_transcript]
     current_agent: str # "AgentA" or "AgentB"
     winner: Optional[str]
     rationale: Optional[str]
     error: Optional[str]
     last_speaker: Optional[str]
     last_text: Optional[str]
+    cache_stats: Optional[dict] # argument cache counters; None when the cache is off
+    participants: Optional[List[str]] # panel personas in speaking order; None for the classic two-agent debate
+    max_rounds: Optional[int] # total rounds (default 8); set for panel debates and forks
+    summary: Optional[dict] # judge's full result, including per-agent scores
+    judge_panel: Optional[dict] # {"judges": [...], "aggregation": "majority" | "weighted"}; None for the single judge
+    judge_results: Annotated[List[dict], merge_judge_results] # one result per panel judge
+    convergence: Optional[dict] # {"threshold", "window", "min_rounds"}; None runs every round
+    converged_at: Optional[int] # rounds completed when the convergence policy stopped the debate
+    deadline: Optional[dict] # {"at", "budget_s", "judge_reserve_s"} from deadline.configured_deadline; None when unbounded
+    judge_notes: Annotated[List[dict], merge_judge_notes] # JudgeNode.note_turn() for every turn, added as it lands
+    openings: Optional[Dict[str, str]] # persona -> pre-generated opening argument, reused by whoever opens (tournaments)
+    memory_summary: Optional[str] # latest MemoryNode summary, set by memory_node
+    backend: Optional[str] # generation backend for turns and summaries ("gemini" or "local"); None for the default order
+    prompt_guidance: Optional[Dict[str, str]] # persona -> guidance replacing the built-in persona prompt
+    fork: Optional[dict] # {"parent", "round", "overrides"} when forked from another debate (see forking.py)
@@ -0,0 +1,139 @@
+# structured_output.py
+"""
+Structured (JSON) debate turns.
+
+Agent.speak asks the backend for one JSON object instead of free text:
+
+    {"argument": "...", "claims": ["...", ...], "rebuttal_target": "..."}
+
+Gemini is constrained by a response schema (response_mime_type
+application/json), so its replies parse as they are. flan-t5 has no
+constrained decoding, so parse_turn() parses and repairs what it gets: it
+strips code fences, cuts the object out of surrounding chatter, swaps curly
+quotes, drops trailing commas and closes a reply truncated at max_length. A
+reply with no JSON at all is accepted as prose, with a speaker label removed
+and the first paragraph kept.
+
+DEBATOR_AGENT_OUTPUT=text restores the free-text prompt and its
+cleanup-and-retry loop.
+"""
+import os
+import re
+import json
+
+OUTPUT_MODES = ("json", "text")
+MAX_CLAIMS = 3
+
+TURN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "argument": {"type": "string"},
+        "claims": {"type": "array", "items": {"type": "string"}},
+        "rebuttal_target": {"type": "string"},
+    },
+    "required": ["argument", "claims"],
+}
+
+TURN_FORMAT = ('Respond with ONLY a JSON object: {"argument": "<the argument, 3-6 sentences>", '
+               '"claims": ["<each distinct claim, one short sentence>"], '
+               '"rebuttal_target": "<the opponent\'s claim you answer, or empty in an opening>"}')
+
+FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+# "Argument:", "Round 3:", "[Scientist]:", "As Scientist:", "Scientist:" and the like
+LABEL_RE = re.compile(r"^\s*(?:\[[^\]\n]{1,40}\]|Argument|Response|Answer|Round\s*\d*|As [A-Z][\w-]*|[A-Z][a-z]+)\s*:\s*")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+CURLY_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def output_mode():
+    """"json" (default) or "text", from DEBATOR_AGENT_OUTPUT"""
+    mode = os.getenv("DEBATOR_AGENT_OUTPUT", "json").strip().lower()
+    return mode if mode in OUTPUT_MODES else "json"
+
+
+def gemini_turn_config(max_output_tokens=None):
+    """generation_config that makes Gemini answer with a TURN_SCHEMA object"""
+    config = {"response_mime_type": "application/json", "response_schema": TURN_SCHEMA}
+    if max_output_tokens:
+        config["max_output_tokens"] = max_output_tokens
+    return config
+
+
+def _close_truncated(text):
+    """Close a string, arrays and objects left open by a reply cut off mid-way"""
+    closers = []
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+        elif ch in "}]" and closers:
+            closers.pop()
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",:")
+    return text + "".join(reversed(closers))
+
+
+def _loads(text):
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _normalize(obj):
+    argument = obj.get("argument") or obj.get("text") or ""
+    if not isinstance(argument, str):
+        return None
+    claims = obj.get("claims") or []
+    if isinstance(claims, str):
+        claims = [claims]
+    claims = [c.strip() for c in claims if isinstance(c, str) and c.strip()][:MAX_CLAIMS]
+    target = obj.get("rebuttal_target") or ""
+    return {"argument": " ".join(argument.split()), "claims": claims,
+            "rebuttal_target": target.strip() if isinstance(target, str) else ""}
+
+
+def _from_prose(text):
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if not paragraphs:
+        return None
+    argument = LABEL_RE.sub("", paragraphs[0]).strip().strip("\"'` ")
+    if not argument:
+        return None
+    claims = [s for s in SENTENCE_RE.split(argument) if len(s.split()) >= 4][:MAX_CLAIMS]
+    return {"argument": " ".join(argument.split()), "claims": claims, "rebuttal_target": ""}
+
+
+def parse_turn(raw):
+    """(turn, how) for a backend reply; how is "json", "repaired" or "prose", turn is None if nothing usable"""
+    if not raw or not raw.strip():
+        return None, "empty"
+    text = FENCE_RE.sub("", raw.strip()).strip()
+    obj = _loads(text)
+    if obj is not None:
+        turn = _normalize(obj)
+        return (turn, "json") if turn else (None, "invalid")
+    start = text.find("{")
+    if start < 0:
+        return _from_prose(text), "prose"
+    candidate = text[start:text.rfind("}") + 1] if text.rfind("}") > start else text[start:]
+    candidate = TRAILING_COMMA_RE.sub(r"\1", candidate.translate(CURLY_QUOTES))
+    obj = _loads(candidate) or _loads(_close_truncated(candidate))
+    if obj is None:
+        # An object that will not parse: keep the prose in front of it, if any
+        before = text[:start].strip()
+        return (_from_prose(before), "prose") if before else (None, "invalid")
+    turn = _normalize(obj)
+    return (turn, "repaired") if turn else (None, "invalid")
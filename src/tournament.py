@@ -0,0 +1,282 @@
+# tournament.py
+"""
+Round-robin tournament between personas.
+
+Every pair of personas debates every topic (twice, with sides swapped, under
+--both-sides). Games run concurrently on one shared compiled graph. Without a
+rate limit the default concurrency is the server's 4. With DEBATOR_GEMINI_RPM
+or DEBATOR_GEMINI_TPM set, the shared rate scheduler paces the requests, so up
+to 16 games run at once.
+
+A persona's opening argument sees no transcript and so does not depend on its
+opponent. The OpeningBook generates it once per (topic, persona) and hands it
+to every game that persona opens on that topic.
+
+Ratings come from the judge's verdicts. Elo is replayed in schedule order so
+it does not depend on which game happened to finish first. Bradley-Terry
+strengths are fitted to all results with one virtual win and one virtual loss
+against a 1500-rated reference. Games are saved to the records store with
+source "tournament".
+
+Usage:
+    python src/tournament.py --personas Scientist,Philosopher,Engineer --topic "Should AI be regulated?"
+    python src/tournament.py --personas Scientist,Philosopher,Economist,Lawyer --topics-file topics.txt --both-sides --out standings.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from .logger_util import log_event
+    from .records_store import RecordsStore, split_winner
+except ImportError:
+    from logger_util import log_event
+    from records_store import RecordsStore, split_winner
+
+ELO_INITIAL = 1500.0
+ELO_K = 32.0
+BT_ITERATIONS = 500
+DEFAULT_CONCURRENCY = 4
+RATE_LIMITED_CONCURRENCY = 16
+
+
+def schedule_pairings(personas, topics, both_sides=False):
+    """Every pairing on every topic as (topic, persona_a, persona_b); persona_a opens
+
+    With a single leg, who opens alternates so that each persona opens about
+    half of its games.
+    """
+    games = []
+    for topic_index, topic in enumerate(topics):
+        for i, j in itertools.combinations(range(len(personas)), 2):
+            first, second = personas[i], personas[j]
+            if (i + j + topic_index) % 2:
+                first, second = second, first
+            games.append((topic, first, second))
+            if both_sides:
+                games.append((topic, second, first))
+    return games
+
+
+def default_concurrency(games):
+    """Games to run at once: the server's default, or more when the rate scheduler paces requests"""
+    from rate_scheduler import get_scheduler
+    limit = RATE_LIMITED_CONCURRENCY if get_scheduler() is not None else DEFAULT_CONCURRENCY
+    return max(1, min(len(games), limit))
+
+
+class OpeningBook:
+    """Generates each (topic, persona) opening once, however many games ask for it concurrently"""
+
+    def __init__(self, generate):
+        self._generate = generate
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.generated = 0
+        self.reused = 0
+
+    def get(self, topic, persona):
+        with self._lock:
+            future = self._entries.get((topic, persona))
+            owner = future is None
+            if owner:
+                future = self._entries[(topic, persona)] = Future()
+            else:
+                self.reused += 1
+        if owner:
+            try:
+                future.set_result(self._generate(topic, persona))
+                with self._lock:
+                    self.generated += 1
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+
+def winner_persona(final_state):
+    """Persona named by the verdict, or None for an error or no verdict"""
+    if final_state.get("error"):
+        return None
+    persona, agent = split_winner(final_state.get("winner"))
+    if persona:
+        return persona
+    return {"AgentA": final_state.get("persona_a"), "AgentB": final_state.get("persona_b")}.get(agent)
+
+
+def elo_ratings(results, personas, k=ELO_K, initial=ELO_INITIAL):
+    """Elo after replaying decided games in schedule order"""
+    ratings = {persona: initial for persona in personas}
+    for game in results:
+        if not game["winner"]:
+            continue
+        a, b = game["persona_a"], game["persona_b"]
+        expected_a = 1 / (1 + 10 ** ((ratings[b] - ratings[a]) / 400))
+        score_a = 1.0 if game["winner"] == a else 0.0
+        ratings[a] += k * (score_a - expected_a)
+        ratings[b] -= k * (score_a - expected_a)
+    return ratings
+
+
+def bradley_terry(results, personas, iterations=BT_ITERATIONS):
+    """Bradley-Terry strengths on the Elo scale (MM updates, Hunter 2004)
+
+    Every persona also gets one win and one loss against a fixed reference of
+    strength 1 (1500), which keeps unbeaten or winless personas finite.
+    """
+    wins = {p: 1.0 for p in personas}
+    games = {}
+    for game in results:
+        if not game["winner"]:
+            continue
+        a, b = game["persona_a"], game["persona_b"]
+        wins[game["winner"]] += 1
+        games[(a, b)] = games.get((a, b), 0) + 1
+        games[(b, a)] = games.get((b, a), 0) + 1
+    strength = {p: 1.0 for p in personas}
+    for _ in range(iterations):
+        updated = {}
+        for p in personas:
+            denominator = 2 / (strength[p] + 1.0)
+            denominator += sum(n / (strength[p] + strength[q]) for (x, q), n in games.items() if x == p)
+            updated[p] = wins[p] / denominator
+        converged = max(abs(updated[p] - strength[p]) for p in personas) < 1e-9
+        strength = updated
+        if converged:
+            break
+    return {p: ELO_INITIAL + 400 * math.log10(strength[p]) for p in personas}
+
+
+def standings(results, personas):
+    """One row per persona, best Bradley-Terry rating first"""
+    elo = elo_ratings(results, personas)
+    bt = bradley_terry(results, personas)
+    rows = []
+    for persona in personas:
+        played = [g for g in results if persona in (g["persona_a"], g["persona_b"])]
+        won = sum(1 for g in played if g["winner"] == persona)
+        lost = sum(1 for g in played if g["winner"] and g["winner"] != persona)
+        rows.append({"persona": persona, "games": len(played), "wins": won, "losses": lost,
+                     "no_result": len(played) - won - lost,
+                     "elo": round(elo[persona], 1), "bradley_terry": round(bt[persona], 1)})
+    return sorted(rows, key=lambda row: (-row["bradley_terry"], -row["elo"], row["persona"]))
+
+
+def run_tournament(personas, topics, both_sides=False, concurrency=None, reuse_openings=True,
+                   records_db=None, on_game=None):
+    """Play the full schedule and return {"games", "standings", "openings", ...}"""
+    from langgraph_debate import run_langgraph_debate, generate_opening
+
+    personas = list(dict.fromkeys(personas))
+    if len(personas) < 2:
+        raise ValueError("a tournament needs at least two distinct personas")
+    games = schedule_pairings(personas, topics, both_sides)
+    concurrency = concurrency or default_concurrency(games)
+    tournament_id = uuid.uuid4().hex[:12]
+    book = OpeningBook(generate_opening)
+    store = None if records_db is False else RecordsStore(records_db) if records_db else RecordsStore()
+    log_event("tournament_start", {"id": tournament_id, "personas": personas, "topics": topics,
+                                   "games": len(games), "concurrency": concurrency})
+    started = time.time()
+
+    def play(index, game):
+        topic, persona_a, persona_b = game
+        game_started = time.time()
+        openings = {persona_a: book.get(topic, persona_a)} if reuse_openings else None
+        final_state = run_langgraph_debate(topic, persona_a, persona_b, thread_id=f"tournament-{tournament_id}-{index}",
+                                           openings=openings)
+        result = {"index": index, "topic": topic, "persona_a": persona_a, "persona_b": persona_b,
+                  "winner": winner_persona(final_state), "verdict": final_state.get("winner"),
+                  "error": final_state.get("error"), "duration_s": round(time.time() - game_started, 2)}
+        if store is not None:
+            try:
+                store.save_debate(final_state, debate_id=f"{tournament_id}-{index}", started_at=game_started,
+                                  source="tournament", metrics={"duration_s": result["duration_s"]})
+            except Exception as e:
+                log_event("records_store_error", {"id": f"{tournament_id}-{index}", "error": str(e)})
+        log_event("tournament_game", result)
+        return result
+
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tournament") as executor:
+        futures = [executor.submit(play, index, game) for index, game in enumerate(games)]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if on_game:
+                on_game(results[-1], len(results), len(games))
+    results.sort(key=lambda game: game["index"])
+
+    summary = {
+        "id": tournament_id,
+        "personas": personas,
+        "topics": topics,
+        "games": results,
+        "standings": standings(results, personas),
+        "openings": {"generated": book.generated, "reused": book.reused, "llm_calls_saved": book.reused},
+        "concurrency": concurrency,
+        "duration_s": round(time.time() - started, 2),
+    }
+    log_event("tournament_end", {k: v for k, v in summary.items() if k != "games"})
+    return summary
+
+
+def print_standings(summary):
+    from rich.console import Console
+    from rich.table import Table
+    table = Table(title=f"Tournament {summary['id']}: {len(summary['games'])} games, "
+                        f"{len(summary['topics'])} topic(s)")
+    for column in ("Persona", "Games", "W", "L", "No result", "Elo", "Bradley-Terry"):
+        table.add_column(column, justify="left" if column == "Persona" else "right")
+    for row in summary["standings"]:
+        table.add_row(row["persona"], str(row["games"]), str(row["wins"]), str(row["losses"]),
+                      str(row["no_result"]), f"{row['elo']:.0f}", f"{row['bradley_terry']:.0f}")
+    console = Console()
+    console.print(table)
+    openings = summary["openings"]
+    console.print(f"[dim]Openings: {openings['generated']} generated, {openings['reused']} reused "
+                  f"({openings['llm_calls_saved']} LLM calls saved); {summary['duration_s']}s "
+                  f"at concurrency {summary['concurrency']}[/dim]")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round-robin persona tournament with Elo and Bradley-Terry ratings")
+    parser.add_argument("--personas", required=True, help="comma-separated personas, e.g. 'Scientist,Philosopher,Engineer'")
+    parser.add_argument("--topic", action="append", default=[], help="a debate topic (repeatable)")
+    parser.add_argument("--topics-file", help="file with one topic per line")
+    parser.add_argument("--both-sides", action="store_true", help="play every pairing twice with sides swapped")
+    parser.add_argument("--concurrency", type=int, help="games run at once (default: 4, or 16 under a rate limit)")
+    parser.add_argument("--no-opening-reuse", action="store_true", help="generate every opening afresh")
+    parser.add_argument("--no-records", action="store_true", help="don't save games to the records store")
+    parser.add_argument("--out", help="write the full results as JSON to this path")
+    args = parser.parse_args()
+
+    topics = list(args.topic)
+    if args.topics_file:
+        with open(args.topics_file, "r", encoding="utf-8") as f:
+            topics.extend(line.strip() for line in f if line.strip())
+    if not topics:
+        parser.error("give at least one --topic or a --topics-file")
+    personas = [p.strip() for p in args.personas.split(",") if p.strip()]
+
+    def progress(game, done, total):
+        print(f"[{done}/{total}] {game['persona_a']} vs {game['persona_b']} on '{game['topic']}': "
+              f"{game['winner'] or 'no result'}")
+
+    try:
+        summary = run_tournament(personas, topics, both_sides=args.both_sides, concurrency=args.concurrency,
+                                 reuse_openings=not args.no_opening_reuse,
+                                 records_db=False if args.no_records else None, on_game=progress)
+    except ValueError as e:
+        parser.error(str(e))
+    print_standings(summary)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Results written to {args.out}")
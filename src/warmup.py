@@ -0,0 +1,63 @@
+# warmup.py
+"""Background warm-up of the debate pipeline while the CLI waits for user input"""
+import sys
+import os
+import threading
+import time
+# Same path setup as runner.py so the graph modules resolve their bare imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from .logger_util import log_event
+except ImportError:
+    from logger_util import log_event
+
+_warmup_thread = None
+_warmup_result = {}
+
+
+def _warm():
+    """Compile the graph and prepare the generation backend"""
+    start = time.perf_counter()
+    try:
+        try:
+            from .langgraph_debate import create_debate_graph
+        except ImportError:
+            from langgraph_debate import create_debate_graph
+        from nodes import warm_backend
+
+        create_debate_graph()
+        _warmup_result["graph_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        _warmup_result["backend"] = warm_backend()
+    except Exception as e:
+        _warmup_result["error"] = str(e)
+        log_event("warmup_error", {"error": str(e)})
+    _warmup_result["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    log_event("warmup_complete", dict(_warmup_result))
+
+
+def start_local_workers():
+    """Start the DEBATOR_LOCAL_WORKERS pool, if configured; call it before any thread starts so the pool can fork"""
+    from local_workers import get_pool
+    return get_pool()
+
+
+def start_warmup():
+    """Start warming up in a daemon thread (no-op if already started)"""
+    global _warmup_thread
+    if _warmup_thread is None:
+        _warmup_thread = threading.Thread(target=_warm, name="debate-warmup", daemon=True)
+        _warmup_thread.start()
+    return _warmup_thread
+
+
+def wait_for_warmup(timeout=None):
+    """Join the warm-up thread if one was started; returns the warm-up stats, or None without a warm-up"""
+    if _warmup_thread is None:
+        return None
+    start = time.perf_counter()
+    _warmup_thread.join(timeout)
+    stats = dict(_warmup_result)
+    stats["waited_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    stats["finished"] = not _warmup_thread.is_alive()
+    return stats
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Argument cache: reuse, seed and miss thresholds, the round limit and the bounded store (hashed embeddings)
+"""
+import os
+import sys
+import sqlite3
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No Gemini: topics are embedded with the local hashed bag-of-words
+os.environ["GEMINI_API_KEY"] = ""
+
+from argument_cache import ArgumentCache
+
+TOPIC = "Should AI be regulated like medicine?"
+ARGUMENT = "Clinical trials show staged approval catches harmful failures before release."
+
+
+def rows(cache):
+    conn = sqlite3.connect(cache.path)
+    try:
+        return conn.execute("SELECT topic, persona, round, text FROM cached_arguments ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_hit_near_miss_and_miss(tmp_path):
+    cache = ArgumentCache(str(tmp_path / "cache.db"))
+    cache.store(TOPIC, "Scientist", 1, ARGUMENT)
+    assert cache.embed(TOPIC)[0] == "hashed"
+
+    hit = cache.lookup(TOPIC, "Scientist", 1)
+    assert (hit.kind, hit.text, hit.topic) == ("reuse", ARGUMENT, TOPIC) and hit.similarity > 0.99
+    # Close but not the same topic (similarity about 0.84): the past argument seeds a new one
+    seed = cache.lookup("Should AI be strictly regulated like medicine?", "Scientist", 1)
+    assert seed.kind == "seed" and seed.text == ARGUMENT and 0.80 <= seed.similarity < 0.95
+    # Unrelated topics, other personas and other rounds miss
+    for topic, persona, round_num in [("Should cities ban cars?", "Scientist", 1), (TOPIC, "Philosopher", 1),
+                                      (TOPIC, "Scientist", 2)]:
+        miss = cache.lookup(topic, persona, round_num)
+        assert miss.kind == "miss" and miss.text is None
+
+
+def test_only_opening_rounds_are_cached(tmp_path):
+    cache = ArgumentCache(str(tmp_path / "cache.db"))
+    cache.store(TOPIC, "Scientist", 2, ARGUMENT)
+    cache.store(TOPIC, "Scientist", 3, ARGUMENT)
+    assert [row[2] for row in rows(cache)] == [2]
+    assert cache.lookup(TOPIC, "Scientist", 2).kind == "reuse"
+    assert cache.lookup(TOPIC, "Scientist", 3).kind == "miss"
+
+
+def test_store_is_bounded(tmp_path):
+    cache = ArgumentCache(str(tmp_path / "cache.db"), max_rows=3)
+    # Storing a topic again replaces its argument
+    cache.store(TOPIC, "Scientist", 1, "An older argument about trials and audits.")
+    cache.store(TOPIC, "Scientist", 1, ARGUMENT)
+    assert rows(cache) == [(TOPIC, "Scientist", 1, ARGUMENT)]
+    topics = [f"Should cities ban {thing}?" for thing in ("cars", "scooters", "billboards", "fireworks")]
+    for topic in topics:
+        cache.store(topic, "Scientist", 1, f"An argument about {topic}")
+    cache.store(TOPIC, "Philosopher", 1, ARGUMENT)
+    # Each persona and round keeps its newest max_rows topics
+    assert [row[0] for row in rows(cache) if row[1] == "Scientist"] == topics[1:]
+    assert cache.lookup(TOPIC, "Scientist", 1).kind != "reuse"
+    assert cache.lookup(TOPIC, "Philosopher", 1).kind == "reuse"
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Checkpoint retention: BoundedMemorySaver keeps keep_last checkpoints per thread and evicts old finished threads
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: turns and rationales use the fallbacks, so the debates run offline
+os.environ["GEMINI_API_KEY"] = ""
+
+import langgraph_debate
+from langgraph_debate import create_debate_graph, run_langgraph_debate
+from checkpointing import BoundedMemorySaver
+from forking import stream_fork
+
+
+def test_retention_limits(monkeypatch):
+    # A graph of its own, so threads left by other tests don't count
+    monkeypatch.setattr(langgraph_debate, "_graph_cache", None)
+    monkeypatch.setattr(langgraph_debate, "BoundedMemorySaver",
+                        lambda: BoundedMemorySaver(keep_last=3, max_finished_threads=2))
+    threads = [f"retention-{i}" for i in range(4)]
+    for thread_id in threads:
+        run_langgraph_debate("retention topic", "Scientist", "Philosopher", thread_id=thread_id)
+    app = create_debate_graph()
+    saver = app.checkpointer
+
+    assert sorted(saver.storage) == threads[2:]
+    assert all(len(checkpoints) <= 3 for namespaces in saver.storage.values() for checkpoints in namespaces.values())
+    assert saver.retained()["threads"] == 2 and saver.retained()["checkpoints"] <= 6
+    # Only blobs the retained checkpoints reference survive pruning
+    live = {(thread_id, ns, channel, version) for (thread_id, ns), history in saver._history.items()
+            for versions in history.values() for channel, version in versions.items()}
+    assert set(saver.blobs) <= live
+    assert not app.get_state({"configurable": {"thread_id": threads[0]}}).values
+
+    # A retained thread is still readable and can be resumed from
+    values = app.get_state({"configurable": {"thread_id": threads[-1]}}).values
+    assert len(values["transcript"]) == 8 and values["winner"]
+    events = list(stream_fork(threads[-1], 6, thread_id="retention-fork"))
+    assert [e.round for e in events if e.type == "turn_accepted"] == [7, 8]
+    # The fork finished too, evicting the older of the two retained debates
+    assert sorted(saver.storage) == [threads[-1], "retention-fork"]
+
+    saver.delete_thread(threads[-1])
+    assert threads[-1] not in saver.storage and not any(key[0] == threads[-1] for key in saver._history)
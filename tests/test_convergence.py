@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Early termination: repetitive debates converge after min_rounds, novel ones run in full, panels stop on a cycle boundary
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: memory and the judge use the fallbacks, so the debate runs offline
+os.environ["GEMINI_API_KEY"] = ""
+
+import pytest
+
+import langgraph_debate
+from langgraph_debate import check_convergence, early_termination_savings, run_langgraph_debate
+from nodes import Agent
+
+
+def spell(n):
+    """n in letters, so generated words count as content words"""
+    return "".join("abcdefghij"[int(d)] for d in str(n))
+
+
+class RepetitiveAgent(Agent):
+    def speak(self, topic, context="", seen_texts=[], round_num=1):
+        return f"Audits protect savings and audits build public trust, point {round_num}."
+
+
+class NovelAgent(Agent):
+    def speak(self, topic, context="", seen_texts=[], round_num=1):
+        return " ".join(f"term{spell(round_num)}{spell(i)}" for i in range(8)) + "."
+
+
+@pytest.fixture(autouse=True)
+def policy(monkeypatch):
+    monkeypatch.setenv("DEBATOR_CONVERGENCE_THRESHOLD", "0.3")
+    monkeypatch.setenv("DEBATOR_CONVERGENCE_WINDOW", "2")
+    monkeypatch.setenv("DEBATOR_MIN_ROUNDS", "4")
+
+
+def test_check_convergence_waits_for_min_rounds():
+    state = {"convergence": {"threshold": 0.3, "window": 2, "min_rounds": 4},
+             "transcript": [{"text": "audits protect savings"}] * 3}
+    assert not check_convergence(state) and "converged_at" not in state
+    state["transcript"] = state["transcript"] + [{"text": "audits protect savings"}]
+    assert check_convergence(state) and state["converged_at"] == 4
+
+
+def test_repetitive_debate_stops_after_min_rounds(monkeypatch):
+    monkeypatch.setattr(langgraph_debate, "Agent", RepetitiveAgent)
+    final_state = run_langgraph_debate("convergence topic", "Scientist", "Philosopher", thread_id="converge-repetitive",
+                                       convergence=True)
+    assert final_state["converged_at"] == 4 and len(final_state["transcript"]) == 4
+    assert final_state["winner"]
+    # Four agent turns and two memory summaries were never run
+    assert final_state["early_termination"] == {"rounds_run": 4, "rounds_planned": 8, "rounds_saved": 4,
+                                                "llm_calls_saved": 6}
+
+
+def test_novel_debate_never_converges(monkeypatch):
+    monkeypatch.setattr(langgraph_debate, "Agent", NovelAgent)
+    final_state = run_langgraph_debate("convergence topic", "Scientist", "Philosopher", thread_id="converge-novel",
+                                       convergence=True)
+    assert not final_state.get("converged_at") and len(final_state["transcript"]) == 8
+    assert final_state["early_termination"]["rounds_saved"] == 0 and final_state["winner"]
+
+
+def test_panel_stops_only_on_a_cycle_boundary(monkeypatch):
+    monkeypatch.setattr(langgraph_debate, "Agent", RepetitiveAgent)
+    final_state = run_langgraph_debate("convergence topic", "", "", thread_id="converge-panel", convergence=True,
+                                       participants=["Scientist", "Philosopher", "Economist"])
+    # Converged after turn 4, but the cycle runs on until every panelist has spoken twice
+    assert final_state["converged_at"] == 4 and len(final_state["transcript"]) == 6
+    # 8 rounds round up to 9 for three panelists; each skipped panel turn also skips a summary
+    assert final_state["early_termination"] == early_termination_savings(final_state, 9, panel=True)
+    assert final_state["early_termination"]["llm_calls_saved"] == 6
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Deadline budget: every backend request made by a node carries the node's remaining time
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import nodes
+from deadline import configured_deadline
+from langgraph_debate import memory_node
+from state import Turn
+
+
+class RecordingModel:
+    """Stands in for the Gemini client and remembers the kwargs of every request"""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls.append(kwargs)
+        return type("Response", (), {"text": "Both sides weigh oversight against autonomy."})()
+
+
+def test_memory_summary_runs_within_node_budget(monkeypatch):
+    model = RecordingModel()
+    monkeypatch.setattr(nodes, "get_gemini_model", lambda: model)
+    state = {
+        "topic": "deadline topic", "round": 3, "max_rounds": 8, "deadline": configured_deadline(20),
+        "transcript": [Turn(1, "AgentA", "Scientist", "Audits catch failures early.", 0.0),
+                       Turn(2, "AgentB", "Philosopher", "Consent matters more than speed.", 0.0)],
+    }
+    memory_node(state)
+    assert state["memory_summary"] == "Both sides weigh oversight against autonomy."
+    assert len(model.calls) == 1
+    # One round's slice of the 17s left after the judge's reserve, spread over 6 remaining rounds
+    timeout = model.calls[0]["request_options"]["timeout"]
+    assert 0 < timeout <= 17 / 6
+
+
+def test_expired_debate_is_cancelled(monkeypatch, tmp_path):
+    import time
+    import deadline
+    from logger_util import debate_log
+    from langgraph_debate import stream_debate
+
+    class SlowModel(RecordingModel):
+        def generate_content(self, prompt, **kwargs):
+            time.sleep(1.0)
+            return super().generate_content(prompt, **kwargs)
+
+    model = SlowModel()
+    monkeypatch.setattr(nodes, "get_gemini_model", lambda: model)
+    # Never degrade early, so the graph is still calling the model when the deadline passes
+    monkeypatch.setattr(deadline, "MIN_TURN_S", 0.0)
+    log_path = tmp_path / "debate_log.txt"
+    with debate_log(str(log_path)):
+        events = list(stream_debate("cancel topic", "Scientist", "Philosopher", thread_id="deadline-cancel",
+                                    deadline_s=1.5))
+        assert events[-1].final_state["winner"]
+        # The request in flight at expiry finishes; nothing is started after it
+        time.sleep(1.5)
+        calls = len(model.calls)
+        time.sleep(1.0)
+    assert len(model.calls) == calls
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    expired = next(i for i, line in enumerate(lines) if '"type": "deadline_exceeded"' in line)
+    assert not [line for line in lines[expired:] if '"type": "node_start"' in line]
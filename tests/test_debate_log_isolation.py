@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Per-debate logs: 50 debates running at once each write only to their own debate_log.txt
+"""
+import os
+import re
+import sys
+import tempfile
+import threading
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: turns and rationales use the fallbacks, so the debates run offline
+os.environ["GEMINI_API_KEY"] = ""
+
+import logger_util
+from logger_util import debate_log
+from langgraph_debate import run_langgraph_debate
+
+DEBATES = 50
+TOPIC_RE = re.compile(r"isolation-topic-\d+")
+
+
+def test_concurrent_debates_log_in_isolation():
+    directory = tempfile.mkdtemp(prefix="logs-")
+    logger_util.set_global_log_file(os.path.join(directory, "global.txt"))
+    start = threading.Barrier(DEBATES)
+    errors = []
+
+    def debate(i):
+        try:
+            start.wait(timeout=30)
+            with debate_log(os.path.join(directory, f"debate_{i}.txt")):
+                final_state = run_langgraph_debate(f"isolation-topic-{i:03d}", "Scientist", "Philosopher",
+                                                   thread_id=f"isolation-{i}")
+            assert final_state.get("winner"), final_state.get("error")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=debate, args=(i,)) for i in range(DEBATES)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=120)
+    assert not errors, errors[0]
+
+    for i in range(DEBATES):
+        with open(os.path.join(directory, f"debate_{i}.txt"), encoding="utf-8") as f:
+            content = f.read()
+        # Only this debate's topic appears, and events from the node threads (agent turns) arrived too
+        assert set(TOPIC_RE.findall(content)) == {f"isolation-topic-{i:03d}"}
+        assert content.count('"type": "langgraph_debate_start"') == 1
+        assert content.count('"type": "langgraph_debate_end"') == 1
+        assert '"type": "agent_speak_raw"' in content
+        assert all(line.startswith("{") and line.endswith("}") for line in content.splitlines())
+
+    # The global log still receives every debate
+    with open(os.path.join(directory, "global.txt"), encoding="utf-8") as f:
+        assert len(set(TOPIC_RE.findall(f.read()))) == DEBATES
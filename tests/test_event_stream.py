@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Event stream: typed events arrive in debate order, from the generator and the async generator alike
+"""
+import os
+import sys
+import asyncio
+import json
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: turns and rationales use the fallbacks, so the debates run offline
+os.environ["GEMINI_API_KEY"] = ""
+
+from langgraph_debate import stream_debate, astream_debate
+
+
+def test_sync_and_async_streams():
+    events = list(stream_debate("event-stream topic", "Scientist", "Philosopher", thread_id="events-sync"))
+    types = [event.type for event in events]
+    assert types[0] == "debate_started"
+    assert types[-2:] == ["verdict", "debate_finished"]
+    # Every round is announced before its argument, and standings follow each argument
+    turns = [i for i, t in enumerate(types) if t == "turn_accepted"]
+    assert len(turns) == 8
+    for i in turns:
+        assert types[i - 1] == "round_started" and types[i + 1] == "standings"
+        assert events[i - 1].round == events[i].round
+    assert events[-1].final_state["winner"] == events[-2].winner
+    # Every event has a JSON form for --ndjson
+    assert json.loads(json.dumps(events[-1].to_dict()))["rounds"] == 8
+
+    async def collect():
+        return [event.type async for event in astream_debate("event-stream topic", "Scientist", "Philosopher",
+                                                             thread_id="events-async")]
+
+    assert asyncio.run(collect()) == types
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Forking: a fork keeps the parent's first k turns, generates only the rest and stores only its own turns
+"""
+import os
+import sys
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: turns and rationales use the fallbacks, so the debates run offline
+os.environ["GEMINI_API_KEY"] = ""
+
+from langgraph_debate import run_langgraph_debate
+from forking import stream_fork, fork_debate, load_debate
+from records_store import RecordsStore
+
+
+def test_fork_continues_from_round():
+    db = os.path.join(tempfile.mkdtemp(prefix="fork-"), "debates.db")
+    store = RecordsStore(db)
+    parent = run_langgraph_debate("fork topic", "Scientist", "Philosopher", thread_id="fork-parent")
+    store.save_debate(parent, debate_id="fork-parent")
+    texts = [turn["text"] for turn in parent["transcript"]]
+
+    # Odd and even fork rounds resume at different nodes; only the new rounds are generated
+    for k in (3, 4):
+        events = list(stream_fork("fork-parent", k, {"persona_b": "Lawyer"}, thread_id=f"fork-child-{k}"))
+        assert [e.round for e in events if e.type == "turn_accepted"] == list(range(k + 1, 9))
+        final_state = events[-1].final_state
+        assert final_state["winner"], final_state.get("error")
+        transcript = final_state["transcript"]
+        assert [turn["text"] for turn in transcript[:k]] == texts[:k]
+        assert {turn["persona"] for turn in transcript if turn["agent"] == "AgentB" and turn["round"] > k} == {"Lawyer"}
+
+    # A saved fork keeps only its own turns; the prefix is read from the parent
+    child = fork_debate("fork-parent", 6, {"rounds": 10}, records_db=db)
+    assert len(child["transcript"]) == 10
+    assert [turn["round"] for turn in store.turns(child["thread_id"])] == [7, 8, 9, 10]
+    assert [turn["text"] for turn in store.transcript(child["thread_id"])][:6] == texts[:6]
+    assert [row["debate_id"] for row in store.forks("fork-parent")] == [child["thread_id"]]
+    # ...and can itself be forked from the store alone
+    assert len(load_debate(child["thread_id"], store)["transcript"]) == 10
+
+
+def test_fork_of_a_parent_stored_under_another_id():
+    db = os.path.join(tempfile.mkdtemp(prefix="fork-"), "debates.db")
+    store = RecordsStore(db)
+    # Like a job worker: graph thread job-<id>, records store id <id>
+    parent = run_langgraph_debate("fork id topic", "Scientist", "Philosopher", thread_id="job-abc123")
+    store.save_debate(parent, debate_id="abc123")
+    texts = [turn["text"] for turn in parent["transcript"]]
+
+    child = fork_debate("job-abc123", 4, {"persona_b": "Lawyer"}, records_db=db)
+    assert store.fork_of(child["thread_id"])["parent_id"] == "job-abc123"
+    # The prefix could not be read from a parent under that id, so the fork kept it
+    transcript = store.transcript(child["thread_id"])
+    assert [turn["round"] for turn in transcript] == list(range(1, 9))
+    assert [turn["text"] for turn in transcript][:4] == texts[:4]
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Hedged requests: a slow primary is overtaken by the duplicate, and the hedge rate cap holds
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hedging import Hedger
+
+
+def test_slow_primary_is_hedged_and_rate_is_capped():
+    hedger = Hedger(max_rate=0.1, threads=4)
+    for _ in range(10):
+        hedger.latency.record("agent_turn", 0.01)
+
+    calls = []
+
+    def primary():
+        calls.append("primary")
+        time.sleep(0.5 if len(calls) == 1 else 0.0)
+        return "slow" if len(calls) == 1 else "fast"
+
+    assert hedger.call("agent_turn", primary) == "fast"
+    assert hedger.stats()["hedges_issued"] == 1
+    assert hedger.stats()["hedges_won"] == 1
+
+    # A second straggler right away would exceed the 10% cap, so it is waited out
+    assert hedger.call("agent_turn", lambda: time.sleep(0.05) or "late") == "late"
+    stats = hedger.stats()
+    assert stats["hedges_issued"] == 1
+    assert stats["hedges_capped"] == 1
+
+
+def test_local_hedge_keeps_the_request_kind(monkeypatch):
+    import nodes
+
+    class Model:
+        def generate_content(self, prompt, **kwargs):
+            return type("Response", (), {"text": "primary"})()
+
+    kinds = []
+    monkeypatch.setenv("DEBATOR_HEDGING", "1")
+    monkeypatch.setenv("DEBATOR_HEDGE_BACKEND", "local")
+    monkeypatch.setattr(nodes, "get_gemini_model", lambda: Model())
+    monkeypatch.setattr(nodes, "hf_generate", lambda prompt, kind=None, **kwargs: kinds.append(kind) or "local")
+    # Take the hedge straight away, as if the primary had overrun its threshold
+    monkeypatch.setattr(nodes, "hedged_call", lambda kind, primary, alternate, is_valid: alternate())
+    assert nodes.gemini_generate("Summarize the debate.", kind="memory_summary") == "local"
+    assert kinds == ["memory_summary"]
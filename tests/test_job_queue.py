@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Job queue: a dead worker's job is requeued after its lease and finished by another worker
+"""
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from job_queue import SQLiteBroker, Worker, debate_payload
+
+
+def test_expired_lease_is_requeued_and_completed_elsewhere():
+    broker = SQLiteBroker(os.path.join(tempfile.mkdtemp(prefix="jobs-"), "jobs.db"))
+    first = broker.enqueue(debate_payload("Topic one"))
+    second = broker.enqueue(debate_payload("Topic two"))
+
+    # A worker claims the first job and dies without heartbeating
+    claimed = broker.claim("dead-worker", lease_s=0.05)
+    assert claimed["id"] == first
+    time.sleep(0.1)
+    assert broker.requeue_expired() == 1
+
+    ran = []
+
+    def fake_debate(payload):
+        ran.append(payload["topic"])
+        return {"topic": payload["topic"], "winner": "Scientist (AgentA)", "transcript": []}
+
+    worker = Worker(broker, concurrency=2, lease_s=5, records_db=False, run=fake_debate)
+    assert worker.serve(exit_when_empty=True) == 2
+    assert sorted(ran) == ["Topic one", "Topic two"]
+    assert broker.get(first)["attempts"] == 2
+    assert broker.get(second)["result"]["winner"] == "Scientist (AgentA)"
+    # The dead worker cannot overwrite the result once it has lost the lease
+    assert not broker.complete(first, "dead-worker", {"winner": "stale"})
+    assert broker.stats()["jobs"] == {"done": 2}
+
+
+def test_only_the_lease_holder_records_a_result():
+    from records_store import RecordsStore
+    directory = tempfile.mkdtemp(prefix="jobs-")
+    broker = SQLiteBroker(os.path.join(directory, "jobs.db"))
+    db = os.path.join(directory, "debates.db")
+    job_id = broker.enqueue(debate_payload("Lease topic"))
+    job = broker.claim("new-owner", lease_s=5)
+
+    def fake_debate(payload):
+        return {"topic": payload["topic"], "winner": "Philosopher (AgentB)", "transcript": []}
+
+    # A worker that lost the lease finishes anyway: neither the broker nor the records store take its result
+    stale = Worker(broker, records_db=db, run=fake_debate, worker_id="stale-worker")
+    stale._process(job)
+    assert broker.get(job_id)["status"] == "running"
+    assert RecordsStore(db).debate(job_id) is None
+    assert (stale.done, stale.failed) == (0, 0)
+
+    # A storage error is logged; the debate is not run again
+    blocker = os.path.join(directory, "not-a-directory")
+    open(blocker, "w").close()
+    owner = Worker(broker, records_db=os.path.join(blocker, "debates.db"), run=fake_debate, worker_id="new-owner")
+    owner._process(job)
+    assert broker.get(job_id)["status"] == "done" and broker.get(job_id)["attempts"] == 1
+    assert owner.done == 1
@@ -4,10 +4,10 @@ Test script to verify the judge rationale fix
 """
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
 
-from src.langgraph_debate import judge_node
-from src.state import DebateState
+from langgraph_debate import judge_node
+from state import DebateState
 
 # Create a mock debate state
 mock_state = {
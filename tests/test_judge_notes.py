@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Judge notes: scores totalled from note_turn() match a full rescoring, and the rationale prompt is built from the notes
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from nodes import JudgeNode
+from state import Turn
+
+SPEAKERS = [("AgentA", "Scientist"), ("AgentB", "Philosopher"), ("AgentC", "Engineer")]
+# First sentence (the note's claim), then detail only the raw transcript carries
+TURNS = [
+    "Regulation lowers risk through testing protocol and safety evidence. Detail{n}: clinical data shows testing catches bias.",
+    "Autonomy and human dignity outweigh a regulation regime. Detail{n}: freedom and moral agency drive innovation and progress.",
+    "Verification keeps the policy impact measurable for everyone. Detail{n}: technical data settles ethics disputes about rights.",
+]
+
+
+def transcript(panelists):
+    return [Turn(n, agent, persona, TURNS[(n - 1) % panelists].format(n=n), float(n))
+            for n, (agent, persona) in ((n, SPEAKERS[(n - 1) % panelists]) for n in range(1, 7))]
+
+
+def recording_judge(prompts, panel=False, weighted_keywords=None):
+    def generate(prompt, kind=None, **kwargs):
+        prompts.append(prompt)
+        return "The winning side tied its claims to concrete evidence and answered the other side directly."
+    return JudgeNode(weighted_keywords=weighted_keywords, generate=generate, panel=panel)
+
+
+def test_notes_match_full_rescoring():
+    for panelists, panel in ((2, False), (3, True)):
+        turns = transcript(panelists)
+        judge = recording_judge([], panel=panel)
+        notes = [judge.note_turn(turn) for turn in turns]
+        with_notes = judge.review(turns, "Scientist", "Philosopher", "regulation", notes=notes)
+        rescored = judge.review(turns, "Scientist", "Philosopher", "regulation")
+        assert with_notes["scores"] == judge._calculate_scores(turns) == rescored["scores"]
+        assert with_notes["winner"] == rescored["winner"]
+
+    # A judge with its own lexicon ignores the notes' scores and rescores the transcript
+    turns = transcript(2)
+    notes = [JudgeNode().note_turn(turn) for turn in turns]
+    custom = recording_judge([], weighted_keywords={"AgentA": {"testing": 1}, "AgentB": {"dignity": 2}})
+    assert custom.review(turns, "Scientist", "Philosopher", notes=notes)["scores"] == {"AgentA": 6, "AgentB": 6}
+
+
+def test_rationale_prompt_uses_the_notes():
+    turns = transcript(2)
+    prompts = []
+    judge = recording_judge(prompts)
+    notes = [judge.note_turn(turn) for turn in turns]
+    judge.review(turns, "Scientist", "Philosopher", "regulation", notes=notes)
+    judge.review(turns, "Scientist", "Philosopher", "regulation")
+    from_notes, from_turns = prompts
+    assert "DEBATE NOTES" in from_notes and "DEBATE TRANSCRIPT" not in from_notes
+    for note, turn in zip(notes, turns):
+        assert f"[{note['persona']} Round {note['round']}]: {note['claim']}" in from_notes
+        assert f"Detail{turn.round}:" not in from_notes and f"Detail{turn.round}:" in from_turns
+
+    # Notes that miss a turn are not trusted: the prompt falls back to the full transcript
+    judge.review(turns, "Scientist", "Philosopher", "regulation", notes=notes[:-1])
+    assert "DEBATE TRANSCRIPT" in prompts[-1] and "Detail6:" in prompts[-1]
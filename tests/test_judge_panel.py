@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Judge panel: one failing judge does not drop the others' verdicts, and the aggregation rules hold
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: turns and rationales use the fallbacks, so the debate runs offline
+os.environ["GEMINI_API_KEY"] = ""
+
+import langgraph_debate
+from langgraph_debate import run_langgraph_debate
+from nodes import aggregate_verdicts, make_judge
+
+PERSONAS = {"AgentA": "Scientist", "AgentB": "Philosopher"}
+
+
+def result(judge, winner, a, b):
+    return {"judge": judge, "winner_agent": winner, "scores": {"AgentA": a, "AgentB": b},
+            "rationale": f"{judge} picks {winner}"}
+
+
+def test_failing_judge_keeps_the_other_verdicts(monkeypatch):
+    class FailingJudge:
+        def review(self, *args, **kwargs):
+            return None
+
+    monkeypatch.setattr(langgraph_debate, "make_judge",
+                        lambda name, panel=False: FailingJudge() if name == "evidence" else make_judge(name, panel))
+    final_state = run_langgraph_debate("judge panel topic", "Scientist", "Philosopher", thread_id="judge-panel-fail",
+                                       judges=["keyword", "evidence", "rebuttal"])
+    assert not final_state.get("error"), final_state.get("error")
+    assert sorted(final_state["summary"]["judges"]) == ["keyword", "rebuttal"]
+    assert final_state["winner"]
+
+
+def test_aggregation():
+    # Majority: two judges for AgentB outvote one with a larger margin for AgentA
+    results = [result("keyword", "AgentA", 9, 1), result("evidence", "AgentB", 4, 6), result("rebuttal", "AgentB", 4, 5)]
+    verdict = aggregate_verdicts(results, PERSONAS)
+    assert verdict["winner"] == "Philosopher (AgentB)" and verdict["votes"] == {"AgentA": 1.0, "AgentB": 2.0}
+    assert verdict["rationale"] == "evidence picks AgentB"
+    # Weighted: per-judge score shares, where the AgentA landslide wins
+    weighted = aggregate_verdicts(results, PERSONAS, "weighted")
+    assert weighted["winner"] == "Scientist (AgentA)"
+    assert abs(sum(weighted["scores"].values()) - 3.0) < 1e-3
+    # A tied vote falls back to the score shares; the local judge's half weight counts
+    tied = aggregate_verdicts([result("keyword", "AgentA", 6, 4), result("evidence", "AgentB", 5, 5)], PERSONAS)
+    assert tied["winner"] == "Scientist (AgentA)"
+    half = aggregate_verdicts([result("keyword", "AgentA", 6, 4), result("local", "AgentB", 1, 9),
+                               result("evidence", "AgentA", 5, 5)], PERSONAS)
+    assert half["votes"] == {"AgentA": 2.0, "AgentB": 0.5}
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Local model daemon: requests round-trip over the socket and the daemon exits when idle
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from local_daemon import DaemonUnavailable, daemon_generate, ping, serve
+
+
+def echo_generator(prompt, **kwargs):
+    return [{"generated_text": f" {prompt.upper()} max_length={kwargs.get('max_length')} "}]
+
+
+def test_generate_round_trip_and_idle_shutdown():
+    path = os.path.join(tempfile.mkdtemp(prefix="dd-"), "d.sock")
+    served = threading.Thread(target=serve, args=(path, 0.5, echo_generator), daemon=True)
+    served.start()
+    for _ in range(100):
+        if ping(path):
+            break
+        time.sleep(0.02)
+
+    assert daemon_generate("why now?", path=path, max_length=64) == "WHY NOW? max_length=64"
+    assert ping(path)["requests"] == 1
+
+    # No requests for longer than the idle timeout: the daemon stops and removes its socket
+    served.join(timeout=5)
+    assert not served.is_alive()
+    assert not os.path.exists(path)
+    try:
+        daemon_generate("anyone there?", path=path)
+        assert False, "expected DaemonUnavailable"
+    except DaemonUnavailable:
+        pass
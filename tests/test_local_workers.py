@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Local inference workers: requests run in the worker processes, even when the pool starts after other threads
+"""
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import local_workers
+from local_workers import start_pool, pooled_generate, shutdown_pool
+
+
+def stub_generator(prompt, **kwargs):
+    time.sleep(0.3)
+    return [{"generated_text": f" {os.getpid()}:{prompt}:{kwargs['max_new_tokens']} "}]
+
+
+def load_stub():
+    return stub_generator
+
+
+def test_pooled_generate_on_two_workers():
+    # A running thread (like the warm-up or a debate) rules out fork
+    stop = threading.Event()
+    busy = threading.Thread(target=stop.wait, daemon=True)
+    busy.start()
+    try:
+        start_pool(2, loader=load_stub)
+        assert local_workers._pool_method in ("forkserver", "spawn")
+        with ThreadPoolExecutor(max_workers=4) as callers:
+            texts = list(callers.map(lambda i: pooled_generate(f"p{i}", timeout=30, max_new_tokens=8), range(4)))
+    finally:
+        stop.set()
+        shutdown_pool()
+    pids = {text.split(":")[0] for text in texts}
+    assert [text.split(":", 1)[1] for text in texts] == [f"p{i}:8" for i in range(4)]
+    assert len(pids) == 2 and str(os.getpid()) not in pids
+    assert local_workers._pool is None
+
+
+def test_pool_fallback_does_not_load_the_model_here(monkeypatch):
+    import nodes
+
+    class FailingModel:
+        def generate_content(self, prompt, **kwargs):
+            raise RuntimeError("gemini unavailable")
+
+    loaded, pooled, started = [], [], []
+    monkeypatch.setenv("DEBATOR_LOCAL_WORKERS", "2")
+    monkeypatch.setenv("DEBATOR_PRELOAD_LOCAL_MODEL", "1")
+    monkeypatch.setattr(nodes, "daemon_running", lambda: False)
+    monkeypatch.setattr(nodes, "get_text_generator", lambda: loaded.append(True))
+    monkeypatch.setattr(nodes, "get_pool", lambda: started.append(True))
+    monkeypatch.setattr(nodes, "pooled_generate", lambda prompt, timeout=None, **kwargs: pooled.append(prompt) or "local")
+    monkeypatch.setattr(nodes, "get_gemini_model", lambda: FailingModel())
+
+    assert nodes.local_backend_ready()
+    # Gemini fails: the request falls back to the pool
+    assert nodes.gemini_generate("Argue for audits.", kind="agent_turn") == "local"
+    nodes.warm_backend()
+    assert pooled == ["Argue for audits."] and started == [True] and loaded == []
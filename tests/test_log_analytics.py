@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Log analytics: node spans and turns are paired per debate when debates interleave in one log
+"""
+import os
+import sys
+import json
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: turns and rationales use the fallbacks, so the debate runs offline
+os.environ["GEMINI_API_KEY"] = ""
+
+from log_analytics import LogAnalyzer
+
+
+def line(second, event_type, payload):
+    return json.dumps({"timestamp": f"2026-01-01T00:00:{second:06.3f}Z", "type": event_type, "payload": payload}) + "\n"
+
+
+def test_interleaved_debates_in_one_log():
+    # Two debates writing to the same global log; x's agent_a turn spans y's
+    lines = [
+        line(0.0, "langgraph_debate_start", {"debate_id": "x", "topic": "t", "thread_id": "x"}),
+        line(0.0, "node_start", {"node": "agent_a", "debate_id": "x", "state_before": {}}),
+        line(0.1, "langgraph_debate_start", {"debate_id": "y", "topic": "t", "thread_id": "y"}),
+        line(0.1, "node_start", {"node": "agent_a", "debate_id": "y", "state_before": {}}),
+        line(0.2, "llm_call", {"debate_id": "y", "backend": "gemini", "kind": "agent_turn", "ok": True,
+                               "latency_ms": 100.0}),
+        line(0.3, "agent_a_speak", {"debate_id": "y", "round": 1, "persona": "Lawyer", "text": "y"}),
+        line(0.3, "node_end", {"node": "agent_a", "debate_id": "y", "state_after": {}}),
+        line(0.9, "agent_a_speak", {"debate_id": "x", "round": 1, "persona": "Scientist", "text": "x"}),
+        line(1.0, "node_end", {"node": "agent_a", "debate_id": "x", "state_after": {}}),
+        line(1.0, "langgraph_debate_end", {"debate_id": "y", "final_state": {}}),
+        line(2.0, "langgraph_debate_end", {"debate_id": "x", "final_state": {}}),
+    ]
+    analyzer = LogAnalyzer()
+    for text in lines:
+        analyzer.feed(text, "/logs/global_debate_log.txt")
+    report = analyzer.report()
+    assert report["nodes"]["agent_a"]["count"] == 2
+    assert abs(report["personas"]["Scientist"]["max"] - 1.0) < 0.03
+    assert abs(report["personas"]["Lawyer"]["max"] - 0.2) < 0.01
+    assert report["backends"]["gemini"]["count"] == 1
+    assert [(d["thread_id"], d["duration_s"]) for d in report["slowest_debates"]] == [("x", 2.0), ("y", 0.9)]
+
+
+def test_debate_events_carry_the_thread_id(tmp_path):
+    from logger_util import debate_log
+    from langgraph_debate import run_langgraph_debate
+
+    path = tmp_path / "debate_log.txt"
+    with debate_log(str(path)):
+        run_langgraph_debate("analytics topic", "Scientist", "Philosopher", thread_id="analytics-thread")
+    events = [json.loads(text) for text in path.read_text(encoding="utf-8").splitlines()]
+    tagged = [e for e in events if e["type"] in ("node_start", "node_end", "agent_a_speak", "agent_b_speak",
+                                                   "langgraph_debate_start", "langgraph_debate_end")]
+    assert tagged and {e["payload"]["debate_id"] for e in tagged} == {"analytics-thread"}
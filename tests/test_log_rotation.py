@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Log rotation: size and age rotation, compression and retention of the global log, and moving it under load
+"""
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import log_rotation
+import logger_util
+from log_rotation import RotatingLog, log_segments, open_segment
+
+LINE = '{"timestamp": "2026-01-01T00:00:00Z", "type": "rotation_test", "payload": %d}\n'
+
+
+def finish_compression():
+    for thread in threading.enumerate():
+        if thread.name == "log-compress":
+            thread.join(10)
+
+
+def read_all(path):
+    lines = []
+    for segment in log_segments(path):
+        with open_segment(segment) as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def test_size_rotation_and_retention(monkeypatch, tmp_path):
+    monkeypatch.setattr(log_rotation, "COMPRESS_DELAY_S", 0.0)
+    path = str(tmp_path / "global.txt")
+    log = RotatingLog(path, max_bytes=4 * len(LINE % 0), rotate_seconds=0, retention=2, compression="gzip")
+    for i in range(20):
+        log.write(LINE % i)
+        # One compression pass per rotation, so retention is applied in order
+        finish_compression()
+    log.close()
+    rotated = [segment for segment in log_segments(path) if segment != path]
+    # 20 lines of which every fourth fills a segment: 5 rotations, the 2 newest kept,
+    # all compressed
+    assert len(rotated) == 2 and all(segment.endswith(".txt.gz") for segment in rotated)
+    assert [int(line.rsplit(" ", 1)[1][:-1]) for line in read_all(path)] == list(range(12, 20))
+
+
+def test_age_rotation(monkeypatch, tmp_path):
+    monkeypatch.setattr(log_rotation, "COMPRESS_DELAY_S", 0.0)
+    path = str(tmp_path / "global.txt")
+    # The reopened file is as old as its first line (2026-01-01), well over a second
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(LINE % 0)
+    log = RotatingLog(path, max_bytes=1 << 20, rotate_seconds=1, retention=5, compression="none")
+    log.write(LINE % 1)
+    log.close()
+    finish_compression()
+    segments = log_segments(path)
+    assert len(segments) == 1 and segments[0] != path
+    assert len(read_all(path)) == 2
+
+
+def test_moving_the_global_log_closes_the_old_one(tmp_path):
+    first, second = str(tmp_path / "first.txt"), str(tmp_path / "second.txt")
+    original = logger_util.GLOBAL_LOG_FILE
+    try:
+        logger_util.set_global_log_file(first)
+        stop = threading.Event()
+        written = []
+
+        def writer():
+            count = 0
+            while not stop.is_set():
+                logger_util.log_event("rotation_test", {})
+                count += 1
+            written.append(count)
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        replaced = []
+        for path in (second, first, second):
+            old = logger_util._global_log
+            logger_util.set_global_log_file(path)
+            logger_util.log_event("rotation_test", {})
+            replaced.append(old)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        # Every replaced instance is closed, and nothing reopened it afterwards
+        assert all(log is not None and log._file is None for log in replaced)
+        assert logger_util._global_log.path == second
+        # ...and no line was lost to a writer that still held a replaced log
+        lines = sum(len(read_all(path)) for path in (first, second))
+        assert lines == sum(written) + 3
+    finally:
+        logger_util.set_global_log_file(original)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Panel judging: speaking position does not change a panelist's score or number of turns
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: the rationale uses the fallback, so the debate runs offline
+os.environ["GEMINI_API_KEY"] = ""
+
+import langgraph_debate
+from langgraph_debate import run_langgraph_debate
+
+# Words from both of the judge's default lexicons
+TEXT = "Safety data and human autonomy both matter when we weigh regulation of these systems."
+
+
+class EchoAgent:
+    """Every panelist makes the same argument"""
+
+    def __init__(self, persona, cache=None, guidance=None):
+        self.persona = persona
+        self.last_source = None
+        self.cache_outcome = None
+        self.last_turn = None
+
+    def speak(self, topic, context="", seen_texts=[], round_num=1):
+        return TEXT
+
+
+def test_identical_panelists_tie(monkeypatch):
+    monkeypatch.setattr(langgraph_debate, "Agent", EchoAgent)
+    final_state = run_langgraph_debate("panel judging topic", "", "", thread_id="panel-judging",
+                                       participants=["Scientist", "Philosopher", "Engineer"])
+    turns = {}
+    for entry in final_state["transcript"]:
+        turns[entry["agent"]] = turns.get(entry["agent"], 0) + 1
+    # 8 rounds are rounded up to whole cycles of three
+    assert turns == {"AgentA": 3, "AgentB": 3, "AgentC": 3}
+    scores = final_state["summary"]["scores"]
+    assert set(scores) == {"AgentA", "AgentB", "AgentC"}
+    assert len(set(scores.values())) == 1 and scores["AgentA"] > 0
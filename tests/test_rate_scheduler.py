@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Rate scheduler: queued requests go out by priority class, then fairly between debates
+"""
+import os
+import sys
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from rate_scheduler import RateScheduler
+
+
+def test_priority_then_fair_queuing():
+    scheduler = RateScheduler(rpm=600)
+    scheduler.throttle()
+    order = []
+
+    def request(kind, debate):
+        scheduler.acquire(kind, 100, debate)
+        order.append((kind, debate))
+
+    # Debate "a" queues three turns before "b" and "c" queue one each
+    queued = [("agent_turn", "a"), ("agent_turn", "a"), ("agent_turn", "a"), ("memory_summary", "b"),
+              ("agent_turn", "b"), ("agent_turn", "c"), ("judge_rationale", "c")]
+    threads = []
+    for kind, debate in queued:
+        threads.append(threading.Thread(target=request, args=(kind, debate)))
+        threads[-1].start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join(timeout=10)
+
+    # The judge overtakes everything, the summary waits for every turn, and the turns
+    # alternate between debates by tokens granted (c's judge rationale counts against c)
+    assert order == [("judge_rationale", "c"), ("agent_turn", "a"), ("agent_turn", "b"), ("agent_turn", "a"),
+                     ("agent_turn", "c"), ("agent_turn", "a"), ("memory_summary", "b")]
+    assert scheduler.stats()["classes"]["agent_turn"]["requests"] == 5
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Rebuttal graph: a turn links to the opposing argument it answers, not to whatever came just before
+"""
+import os
+import sys
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from rebuttal_graph import extract_rebuttals
+from records_store import RecordsStore
+
+TOPIC = "Should AI be regulated?"
+TRANSCRIPT = [
+    {"round": 1, "agent": "AgentA", "persona": "Scientist",
+     "text": "Clinical trials show that staged approval catches harmful failures before deployment, so AI needs audits."},
+    {"round": 2, "agent": "AgentB", "persona": "Philosopher",
+     "text": "Human autonomy matters more than efficiency; people deserve consent over automated decisions about them."},
+    {"round": 3, "agent": "AgentA", "persona": "Scientist",
+     "text": "Measured error rates in hiring models are the data that should drive oversight of deployed systems."},
+    {"round": 4, "agent": "AgentB", "persona": "Philosopher",
+     "text": "Staged approval and clinical trials are a poor analogy: audits cannot catch every harmful failure after deployment."},
+]
+
+
+def test_rebuttal_edges_and_records():
+    edges = extract_rebuttals(TRANSCRIPT, TOPIC)
+    # Round 4 answers the opening, not round 3 which came just before it; rounds 2 and 3 share
+    # no content words with an opposing turn, so they get no edge
+    assert [(e["round"], e["agent"], e["target_round"], e["target_agent"]) for e in edges] == [(4, "AgentB", 1, "AgentA")]
+    assert edges[0]["similarity"] > 0.5
+
+    store = RecordsStore(os.path.join(tempfile.mkdtemp(prefix="rb-"), "debates.db"))
+    debate_id = store.save_debate({"topic": TOPIC, "persona_a": "Scientist", "persona_b": "Philosopher",
+                                   "transcript": TRANSCRIPT, "winner": "Scientist (AgentA)"})
+    saved = store.rebuttals(debate_id)
+    assert [(r["round"], r["agent"], r["target_round"], r["target_agent"]) for r in saved] == [(4, "AgentB", 1, "AgentA")]
+
+
+def test_declared_target_wins_over_similarity():
+    transcript = [dict(turn) for turn in TRANSCRIPT]
+    transcript[2]["claims"] = ["Measured error rates should drive oversight."]
+    # Round 4 declares it answers round 3's claim, though its text matches the opening best
+    transcript[3]["rebuttal_target"] = "measured error rates should drive oversight"
+    # Round 3 names a claim in its own words; it resolves to the opposing turn it overlaps
+    transcript[2]["rebuttal_target"] = "people deserve autonomy and consent"
+    # A target that matches no opposing turn adds no edge
+    transcript[1]["rebuttal_target"] = "quantum weather forecasting"
+    edges = extract_rebuttals(transcript, TOPIC)
+    assert [(e["round"], e["target_round"], e["declared"]) for e in edges] == [(3, 2, True), (4, 3, True)]
+    assert edges[1]["similarity"] == 1.0
+
+    store = RecordsStore(os.path.join(tempfile.mkdtemp(prefix="rb-"), "debates.db"))
+    debate_id = store.save_debate({"topic": TOPIC, "persona_a": "Scientist", "persona_b": "Philosopher",
+                                   "transcript": transcript, "winner": "Scientist (AgentA)"})
+    assert [(r["round"], r["target_round"], r["declared"]) for r in store.rebuttals(debate_id)] == [(3, 2, 1), (4, 3, 1)]
+
+    # A target that only matches the speaker's own side falls back to the similarity edges
+    transcript[3]["rebuttal_target"] = "human autonomy matters more than efficiency"
+    edges = extract_rebuttals(transcript, TOPIC)
+    assert [(e["round"], e["target_round"], e["declared"]) for e in edges] == [(3, 2, True), (4, 1, False)]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Records store: every panelist's score survives save, transcript() and the migration of older databases
+"""
+import os
+import sys
+import json
+import sqlite3
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from records_store import RecordsStore
+
+PANEL = {
+    "topic": "Should cities ban cars?", "persona_a": "Scientist", "persona_b": "Engineer",
+    "participants": ["Scientist", "Engineer", "Economist"],
+    "transcript": [
+        {"round": 1, "agent": "AgentA", "persona": "Scientist", "text": "Emissions data favour fewer cars downtown."},
+        {"round": 2, "agent": "AgentB", "persona": "Engineer", "text": "Transit capacity must come before any ban."},
+        {"round": 3, "agent": "AgentC", "persona": "Economist", "text": "Congestion pricing prices the externality.",
+         "claims": ["Pricing beats bans."], "rebuttal_target": "Transit capacity must come first"},
+    ],
+    "winner": "Economist (AgentC)", "rationale": "Priced the trade-off.",
+    "summary": {"scores": {"AgentA": 2.0, "AgentB": 1.5, "AgentC": 3.5}},
+}
+
+
+def test_panel_scores_round_trip(tmp_path):
+    store = RecordsStore(str(tmp_path / "debates.db"))
+    debate_id = store.save_debate(PANEL)
+    verdict = store.verdict(debate_id)
+    assert verdict["winner_agent"] == "AgentC"
+    assert verdict["scores"] == {"AgentA": 2.0, "AgentB": 1.5, "AgentC": 3.5}
+    # Two-agent columns stay filled for older readers
+    assert (verdict["score_a"], verdict["score_b"]) == (2.0, 1.5)
+    transcript = store.transcript(debate_id)
+    assert [(t["agent"], t["persona"], t["text"]) for t in transcript] == \
+        [(t["agent"], t["persona"], t["text"]) for t in PANEL["transcript"]]
+    assert transcript[2]["claims"] == ["Pricing beats bans."]
+    # Saving again replaces the scores rather than adding to them
+    store.save_debate(dict(PANEL, summary={"scores": {"AgentA": 1.0, "AgentB": 1.0}}), debate_id=debate_id)
+    assert store.verdict(debate_id)["scores"] == {"AgentA": 1.0, "AgentB": 1.0}
+
+
+def test_migrates_two_agent_scores(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    # A database written before verdict_scores and the structured turn columns existed
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE debates (id TEXT PRIMARY KEY, topic TEXT NOT NULL, persona_a TEXT, persona_b TEXT,
+                              started_at REAL, finished_at REAL, source TEXT, error TEXT);
+        CREATE TABLE turns (debate_id TEXT NOT NULL, round INTEGER NOT NULL, agent TEXT NOT NULL, persona TEXT,
+                            text TEXT NOT NULL, created_at REAL, PRIMARY KEY (debate_id, round, agent));
+        CREATE TABLE verdicts (debate_id TEXT PRIMARY KEY, winner TEXT, winner_agent TEXT, winner_persona TEXT,
+                               rationale TEXT, score_a REAL, score_b REAL, decided_at REAL);
+        INSERT INTO debates VALUES ('old', 'Old topic', 'Scientist', 'Philosopher', 1.0, 2.0, 'cli', NULL);
+        INSERT INTO turns VALUES ('old', 1, 'AgentA', 'Scientist', 'Data first.', 1.0);
+        INSERT INTO verdicts VALUES ('old', 'Scientist (AgentA)', 'AgentA', 'Scientist', 'r', 4.0, 2.5, 2.0);
+    """)
+    conn.commit()
+    conn.close()
+
+    store = RecordsStore(path)
+    assert store.verdict("old")["scores"] == {"AgentA": 4.0, "AgentB": 2.5}
+    assert store.transcript("old")[0]["claims"] is None
+    # The copy is made once; reopening does not bring back scores that were replaced since
+    store.save_debate(dict(PANEL, topic="Old topic"), debate_id="old")
+    assert RecordsStore(path).verdict("old")["scores"] == {"AgentA": 2.0, "AgentB": 1.5, "AgentC": 3.5}
+
+
+def test_legacy_folder_keeps_scores(tmp_path):
+    folder = tmp_path / "records" / "Old topic"
+    folder.mkdir(parents=True)
+    events = [("debate_started", {"topic": "Old topic", "persona_a": "Scientist", "persona_b": "Philosopher"}),
+              ("agent_a_speak", {"round": 1, "persona": "Scientist", "text": "Data first."}),
+              ("judge_review_end", {"winner": "Scientist (AgentA)", "rationale": "r",
+                                    "scores": {"AgentA": 3.0, "AgentB": 1.0}})]
+    with open(folder / "debate_log.txt", "w", encoding="utf-8") as f:
+        for event_type, payload in events:
+            f.write(json.dumps({"timestamp": "2026-01-01T00:00:00Z", "type": event_type, "payload": payload}) + "\n")
+    store = RecordsStore(str(tmp_path / "debates.db"))
+    assert store.import_records_dir(str(tmp_path / "records")) == 1
+    (row,) = store.query_verdicts()
+    assert store.verdict(row["id"])["scores"] == {"AgentA": 3.0, "AgentB": 1.0}
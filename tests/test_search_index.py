@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Search index: the records store indexes each saved debate by id, incrementally, and results are BM25-ranked
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from records_store import RecordsStore
+from search_index import SearchIndex, index_path_for
+
+
+def debate(topic, *texts):
+    return {"topic": topic, "persona_a": "Scientist", "persona_b": "Philosopher", "winner": "Scientist (AgentA)",
+            "transcript": [{"round": i + 1, "agent": "AgentA" if i % 2 == 0 else "AgentB",
+                            "persona": "Scientist" if i % 2 == 0 else "Philosopher", "text": text}
+                           for i, text in enumerate(texts)]}
+
+
+def test_saved_debates_are_indexed_by_id(tmp_path):
+    db = str(tmp_path / "debates.db")
+    store = RecordsStore(db)
+    index = SearchIndex(index_path_for(db))
+    first = store.save_debate(debate("Regulate AI?", "Clinical trials catch failures before release.",
+                                     "Autonomy and consent come first."), debate_id="first")
+    assert [(r["debate_id"], r["round"]) for r in index.search("clinical trials")] == [(first, 1)]
+
+    # Incremental: a later debate is searchable as soon as it is saved
+    store.save_debate(debate("Ban cars?", "Trials of car-free streets cut traffic emissions in every city.",
+                             "Clinical trials, clinical audits."), debate_id="second")
+    results = index.search("clinical trials")
+    # The turn matching both terms, twice, ranks above those matching fewer
+    assert [(r["debate_id"], r["round"]) for r in results] == [("second", 2), ("first", 1), ("second", 1)]
+    assert results[0]["score"] > results[1]["score"] > results[2]["score"] > 0
+
+    # Saving a debate again replaces its turns instead of indexing them twice
+    store.save_debate(debate("Regulate AI?", "Staged approval catches failures before release.",
+                             "Autonomy and consent come first."), debate_id="first")
+    assert [r["debate_id"] for r in index.search("clinical trials")] == ["second", "second"]
+    assert [r["round"] for r in index.search("staged approval")] == [1]
+
+    # A fork indexes only its own turns; the prefix stays with the parent
+    fork = dict(debate("Regulate AI?", "Staged approval catches failures before release.",
+                       "Autonomy and consent come first.", "Consent forms do not scale to audits."),
+                fork={"parent": "first", "round": 2, "overrides": {}})
+    store.save_debate(fork, debate_id="first-fork")
+    assert sorted((r["debate_id"], r["round"]) for r in index.search("consent")) == [("first", 2), ("first-fork", 3)]
+    assert [r["debate_id"] for r in index.search("staged approval")] == ["first"]
+
+
+def test_rebuild_adds_only_missing_debates(tmp_path):
+    db = str(tmp_path / "debates.db")
+    RecordsStore(db, search_index=False).save_debate(debate("Regulate AI?", "Clinical trials first."), debate_id="a")
+    index = SearchIndex(str(tmp_path / "rebuilt.db"))
+    assert index.rebuild_from_store(db) == 1
+    assert index.rebuild_from_store(db) == 0
+    assert [r["debate_id"] for r in index.search("trials")] == ["a"]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Debate server: admission control, SSE event order, /metrics and eviction of finished jobs
+"""
+import os
+import sys
+import json
+import asyncio
+import tempfile
+import threading
+# First on the path: the repository root has a server.py launcher of its own
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# No backend: turns and rationales use the fallbacks, so the debates run offline
+os.environ["GEMINI_API_KEY"] = ""
+
+from server import DebateServer
+
+
+async def request(port, method, path, body=None):
+    """One HTTP request; returns (status, body bytes)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), payload
+
+
+def sse_events(payload):
+    """[(id, event type, data)] from a text/event-stream body"""
+    events = []
+    for block in payload.decode("utf-8").split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def new_server(**options):
+    return DebateServer(records_db=os.path.join(tempfile.mkdtemp(prefix="server-"), "debates.db"), **options)
+
+
+def test_admission_and_metrics():
+    server = new_server(max_concurrent=1, max_queue=1)
+    gate = threading.Event()
+    server._run_job = lambda job: gate.wait(30) and {"winner": "Scientist (AgentA)", "transcript": []}
+
+    async def scenario():
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            statuses = []
+            for i in range(3):
+                status, _ = await request(port, "POST", "/debates", {"topic": f"admission {i}"})
+                statuses.append(status)
+                # Let the worker pick up the first job before the next one arrives
+                await asyncio.sleep(0.1)
+            _, body = await request(port, "GET", "/metrics")
+            gate.set()
+            return statuses, json.loads(body)
+        finally:
+            listener.close()
+            server.stop()
+
+    statuses, metrics = asyncio.run(scenario())
+    # One running, one queued, the third rejected
+    assert statuses == [202, 202, 503]
+    assert (metrics["running"], metrics["queue_depth"], metrics["rejected"]) == (1, 1, 1)
+
+
+def test_event_order_and_eviction():
+    server = new_server(max_concurrent=2, job_ttl_s=0)
+
+    async def scenario():
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            status, body = await request(port, "POST", "/debates", {"topic": "server event order"})
+            assert status == 202
+            job_id = json.loads(body)["id"]
+            _, stream = await request(port, "GET", f"/debates/{job_id}/events")
+            after = [(await request(port, "GET", path))[0] for path in (f"/debates/{job_id}", "/debates/unknown")]
+            _, metrics = await request(port, "GET", "/metrics")
+            return sse_events(stream), after, json.loads(metrics)
+        finally:
+            listener.close()
+            server.stop()
+
+    events, after, metrics = asyncio.run(scenario())
+    types = [event_type for _, event_type, _ in events]
+    assert [event_id for event_id, _, _ in events] == list(range(len(events)))
+    assert types.count("round") == 8 and types[-2:] == ["verdict", "end"]
+    # Standings follow every round, in round order
+    rounds = [data["round"] for _, event_type, data in events if event_type == "round"]
+    assert rounds == list(range(1, 9))
+    assert all(types[i + 1] == "standings" for i, t in enumerate(types) if t == "round")
+    assert events[-1][2]["status"] == "done"
+    # The finished job is evicted (TTL 0); its result is in the records store
+    assert after == [410, 404]
+    assert metrics["evicted"] == 1 and metrics["jobs_in_memory"] == 0
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Startup check: importing the CLI must not pull in the heavy backends
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from bench_startup import measure_import, heavy_imports
+
+
+def test_app_import_skips_heavy_modules():
+    _, modules = measure_import()
+    assert "app" in modules
+    assert heavy_imports(modules) == []
+
+
+def test_a_debate_loads_each_module_once(tmp_path):
+    import subprocess
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # Run one offline debate through the CLI entry point, then list modules loaded as src.*
+    code = ("import runpy, sys\n"
+            f"sys.argv = ['app.py', '--ndjson', '--topic', 'import path topic']\n"
+            "try:\n"
+            f"    runpy.run_path({os.path.join(root, 'app.py')!r}, run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(sorted(name for name in sys.modules if name.startswith('src.')))\n"
+            "print('logger_util' in sys.modules)\n")
+    env = dict(os.environ, GEMINI_API_KEY="", DEBATOR_LOG_FILE=str(tmp_path / "global.txt"),
+               DEBATOR_RECORDS_DB=str(tmp_path / "debates.db"))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=str(tmp_path), env=env, capture_output=True, text=True,
+                          timeout=120)
+    assert proc.stdout.splitlines()[-2:] == ["[]", "True"], proc.stderr[-2000:]
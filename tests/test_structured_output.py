@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Structured turns: schema-shaped, damaged and plain-prose replies all parse to the same turn
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from structured_output import parse_turn
+
+ARGUMENT = "Regulation should follow evidence of harm. Clinical trials show staged approval protects patients without halting progress."
+
+
+def test_parse_and_repair():
+    turn, how = parse_turn('{"argument": "%s", "claims": ["Regulation should follow evidence of harm."], '
+                           '"rebuttal_target": "Rules stifle innovation"}' % ARGUMENT)
+    assert how == "json"
+    assert turn["argument"] == ARGUMENT
+    assert turn["rebuttal_target"] == "Rules stifle innovation"
+
+    # Fenced, with chatter, curly quotes and a trailing comma
+    turn, how = parse_turn('Sure! ```json\n{“argument”: "%s", "claims": ["a", "b",],}\n```' % ARGUMENT)
+    assert how == "repaired"
+    assert turn["argument"] == ARGUMENT and turn["claims"] == ["a", "b"]
+
+    # Cut off at max_length in the middle of the claims
+    turn, how = parse_turn('{"argument": "%s", "claims": ["Staged approval protects pat' % ARGUMENT)
+    assert how == "repaired"
+    assert turn["claims"] == ["Staged approval protects pat"]
+
+    # flan-t5 ignoring the format: a labelled paragraph is taken as the argument
+    turn, how = parse_turn("Scientist: %s\n\nSecond paragraph." % ARGUMENT)
+    assert how == "prose"
+    assert turn["argument"] == ARGUMENT
+    assert turn["claims"][0] == "Regulation should follow evidence of harm."
+
+    assert parse_turn("   ") == (None, "empty")
+
+
+def test_claims_reach_transcript_and_records(monkeypatch, tmp_path):
+    import json
+    import itertools
+    import nodes
+    from langgraph_debate import run_langgraph_debate
+    from records_store import RecordsStore
+
+    counter = itertools.count(1)
+
+    class JsonModel:
+        def generate_content(self, prompt, **kwargs):
+            n = next(counter)
+            if "generation_config" in kwargs:
+                text = json.dumps({"argument": f"Point {n}: {ARGUMENT}", "claims": [f"Claim {n} holds."],
+                                   "rebuttal_target": f"Claim {n - 1} holds." if n > 1 else ""})
+            else:
+                text = "A short summary of the exchange so far."
+            return type("Response", (), {"text": text})()
+
+    monkeypatch.setattr(nodes, "get_gemini_model", lambda: JsonModel())
+    final_state = run_langgraph_debate("claims topic", "Scientist", "Philosopher", thread_id="structured-claims")
+    transcript = final_state["transcript"]
+    assert all(turn["claims"] and turn["claims"][0].startswith("Claim ") for turn in transcript)
+    assert transcript[0]["rebuttal_target"] is None and transcript[1]["rebuttal_target"].startswith("Claim ")
+
+    store = RecordsStore(str(tmp_path / "debates.db"))
+    debate_id = store.save_debate(final_state)
+    saved = store.turns(debate_id)
+    assert [row["claims"] for row in saved] == [turn["claims"] for turn in transcript]
+    assert [row["rebuttal_target"] for row in saved] == [turn["rebuttal_target"] for turn in transcript]
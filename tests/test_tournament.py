@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Tournament: full round-robin schedule, shared openings and rating order
+"""
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from tournament import OpeningBook, schedule_pairings, standings
+
+
+def test_schedule_openings_and_ratings():
+    personas = ["Scientist", "Philosopher", "Engineer"]
+    games = schedule_pairings(personas, ["t1", "t2"], both_sides=True)
+    assert len(games) == 12
+    assert len(set(games)) == 12
+
+    calls = []
+    book = OpeningBook(lambda topic, persona: calls.append((topic, persona)) or f"{persona} on {topic}")
+    threads = [threading.Thread(target=book.get, args=(topic, a)) for topic, a, _ in games]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(calls) == sorted({(topic, a) for topic, a, _ in games})
+    assert book.reused == len(games) - len(calls)
+
+    # Engineer beats everyone, Scientist beats Philosopher
+    results = [{"persona_a": a, "persona_b": b,
+                "winner": "Engineer" if "Engineer" in (a, b) else "Scientist"} for _, a, b in games]
+    table = standings(results, personas)
+    assert [row["persona"] for row in table] == ["Engineer", "Scientist", "Philosopher"]
+    assert table[0]["wins"] == 8 and table[-1]["losses"] == 8
+    assert table[0]["elo"] > 1500 > table[-1]["elo"]
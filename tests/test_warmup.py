@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Warm-up: start_warmup compiles the graph and warms the backend in the background; wait_for_warmup joins it
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import pytest
+
+import langgraph_debate
+import nodes
+import warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_warmup(monkeypatch):
+    monkeypatch.setattr(warmup, "_warmup_thread", None)
+    monkeypatch.setattr(warmup, "_warmup_result", {})
+    monkeypatch.setattr(langgraph_debate, "_graph_cache", None)
+
+
+def test_wait_without_warmup():
+    assert warmup.wait_for_warmup() is None
+    assert warmup.wait_for_warmup(timeout=0.1) is None
+
+
+def test_warmup_compiles_graph_and_warms_backend(monkeypatch):
+    calls = []
+    monkeypatch.setattr(nodes, "warm_backend", lambda: calls.append(True) or "stub")
+    thread = warmup.start_warmup()
+    assert warmup.start_warmup() is thread
+    stats = warmup.wait_for_warmup(timeout=30)
+    assert stats["finished"] and stats["backend"] == "stub" and "error" not in stats
+    assert stats["graph_ms"] <= stats["total_ms"] and "waited_ms" in stats
+    assert calls == [True]
+    assert langgraph_debate._graph_cache is not None
+
+
+def test_warmup_error_is_reported(monkeypatch):
+    def failing():
+        raise RuntimeError("backend down")
+
+    monkeypatch.setattr(nodes, "warm_backend", failing)
+    warmup.start_warmup()
+    stats = warmup.wait_for_warmup(timeout=30)
+    assert stats["finished"] and stats["error"] == "backend down" and "backend" not in stats
+    # The graph was compiled before the backend failed
+    assert langgraph_debate._graph_cache is not None